@@ -0,0 +1,57 @@
+"""Add case_arbitrage_monthly rollup table
+
+Revision ID: add_case_arbitrage_monthly
+Revises: add_cases_keyset_indexes
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_case_arbitrage_monthly'
+down_revision = 'add_cases_keyset_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Применяет изменения к базе данных при миграции вперед."""
+    op.create_table(
+        'case_arbitrage_monthly',
+        sa.Column('fund_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('currency', sa.String(length=10), nullable=False),
+        sa.Column('arbitrage_type', sa.String(length=255), nullable=False),
+        sa.Column('cases_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('amount_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('total_amount', sa.Float(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['fund_id'], ['funds.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('fund_id', 'month', 'currency', 'arbitrage_type')
+    )
+
+    # Начальное заполнение одним агрегатом по всем кейсам
+    op.execute("""
+        INSERT INTO case_arbitrage_monthly (
+            fund_id, month, currency, arbitrage_type,
+            cases_count, amount_count, total_amount, updated_at
+        )
+        SELECT created_by_fund_id,
+               date_trunc('month', timezone('UTC', created_at))::date,
+               coalesce(arbitrage_currency, ''),
+               coalesce(arbitrage_type, ''),
+               count(id),
+               count(arbitrage_amount),
+               coalesce(sum(arbitrage_amount), 0),
+               now()
+        FROM cases
+        GROUP BY 1, 2, 3, 4
+    """)
+
+
+def downgrade() -> None:
+    """Откатывает изменения в базе данных при миграции назад."""
+    op.drop_table('case_arbitrage_monthly')
@@ -0,0 +1,34 @@
+"""Add content-addressed blob fields to case_evidences
+
+Revision ID: add_case_evidence_blob_fields
+Revises: add_case_arbitrage_monthly
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_case_evidence_blob_fields'
+down_revision = 'add_case_arbitrage_monthly'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Применяет изменения к базе данных при миграции вперед."""
+    op.add_column('case_evidences', sa.Column('file_name', sa.String(length=255), nullable=True))
+    op.add_column('case_evidences', sa.Column('sha256', sa.String(length=64), nullable=True))
+    op.add_column('case_evidences', sa.Column('size', sa.BigInteger(), nullable=True))
+    op.add_column('case_evidences', sa.Column('mime_type', sa.String(length=255), nullable=True))
+    op.create_index('ix_case_evidences_sha256', 'case_evidences', ['sha256'])
+
+
+def downgrade() -> None:
+    """Откатывает изменения в базе данных при миграции назад."""
+    op.drop_index('ix_case_evidences_sha256', table_name='case_evidences')
+    op.drop_column('case_evidences', 'mime_type')
+    op.drop_column('case_evidences', 'size')
+    op.drop_column('case_evidences', 'sha256')
+    op.drop_column('case_evidences', 'file_name')
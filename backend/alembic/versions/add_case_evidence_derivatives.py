@@ -0,0 +1,26 @@
+"""Add derivatives_generated_at to case_evidences
+
+Revision ID: add_case_evidence_derivatives
+Revises: add_case_evidence_blob_fields
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_case_evidence_derivatives'
+down_revision = 'add_case_evidence_blob_fields'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Применяет изменения к базе данных при миграции вперед."""
+    op.add_column('case_evidences', sa.Column('derivatives_generated_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Откатывает изменения в базе данных при миграции назад."""
+    op.drop_column('case_evidences', 'derivatives_generated_at')
@@ -0,0 +1,26 @@
+"""Add index on case_evidences.case_id
+
+Revision ID: add_case_evidences_case_id_index
+Revises: add_case_evidence_derivatives
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_case_evidences_case_id_index'
+down_revision = 'add_case_evidence_derivatives'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Применяет изменения к базе данных при миграции вперед."""
+    # Доказательства кейса читаются в карточке кейса и в ее ETag
+    op.create_index('ix_case_evidences_case_id', 'case_evidences', ['case_id'])
+
+
+def downgrade() -> None:
+    """Откатывает изменения в базе данных при миграции назад."""
+    op.drop_index('ix_case_evidences_case_id', table_name='case_evidences')
@@ -0,0 +1,44 @@
+"""Add keyset pagination indexes on cases
+
+Revision ID: add_cases_keyset_indexes
+Revises: add_cases_search_vector
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_cases_keyset_indexes'
+down_revision = 'add_cases_search_vector'
+branch_labels = None
+depends_on = None
+
+# Индексы под поддерживаемые сочетания фильтров списка кейсов
+CASE_KEYSET_INDEXES = {
+    'ix_cases_created_at_id': ['created_at', 'id'],
+    'ix_cases_fund_created_at_id': ['created_by_fund_id', 'created_at', 'id'],
+    'ix_cases_status_created_at_id': ['status', 'created_at', 'id'],
+    'ix_cases_fund_status_created_at_id': ['created_by_fund_id', 'status', 'created_at', 'id'],
+    'ix_cases_player_created_at_id': ['player_id', 'created_at', 'id'],
+}
+
+
+def upgrade() -> None:
+    """Применяет изменения к базе данных при миграции вперед."""
+    # Keyset-пагинация сравнивает (created_at, id), поэтому NULL недопустим
+    op.execute("UPDATE cases SET created_at = now() WHERE created_at IS NULL")
+    op.alter_column('cases', 'created_at', nullable=False, server_default=sa.text('now()'))
+    for name, columns in CASE_KEYSET_INDEXES.items():
+        op.create_index(name, 'cases', columns)
+    # Покрывается префиксом ix_cases_player_created_at_id
+    op.drop_index('ix_cases_player_id', table_name='cases')
+
+
+def downgrade() -> None:
+    """Откатывает изменения в базе данных при миграции назад."""
+    op.create_index('ix_cases_player_id', 'cases', ['player_id'])
+    for name in CASE_KEYSET_INDEXES:
+        op.drop_index(name, table_name='cases')
+    op.alter_column('cases', 'created_at', nullable=True, server_default=sa.text('now()'))
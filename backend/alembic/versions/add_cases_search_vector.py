@@ -0,0 +1,49 @@
+"""Add full-text search vector to cases
+
+Revision ID: add_cases_search_vector
+Revises: add_players_cluster_id
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_cases_search_vector'
+down_revision = 'add_players_cluster_id'
+branch_labels = None
+depends_on = None
+
+# Совпадает с app.models.case.CASE_SEARCH_VECTOR_SQL на момент миграции
+CASE_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('russian'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian'::regconfig, coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('russian'::regconfig, coalesce(arbitrage_type, '')), 'C') || "
+    "to_tsvector('simple'::regconfig, coalesce(title, '') || ' ' || coalesce(description, '') "
+    "|| ' ' || coalesce(arbitrage_type, ''))"
+)
+
+
+def upgrade() -> None:
+    """Применяет изменения к базе данных при миграции вперед."""
+    # STORED-колонка вычисляется для всех существующих строк при добавлении
+    op.add_column(
+        'cases',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(CASE_SEARCH_VECTOR_SQL, persisted=True),
+            nullable=True,
+        )
+    )
+    op.create_index(
+        'ix_cases_search_vector', 'cases', ['search_vector'], postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    """Откатывает изменения в базе данных при миграции назад."""
+    op.drop_index('ix_cases_search_vector', table_name='cases')
+    op.drop_column('cases', 'search_vector')
@@ -0,0 +1,57 @@
+"""Add normalized_value to player contacts and payment methods
+
+Revision ID: add_normalized_identifiers
+Revises: add_nicknames_room_nick_index
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.backfill import backfill_identifiers
+from app.utils.normalize import normalize_contact, normalize_payment_method
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_normalized_identifiers'
+down_revision = 'add_nicknames_room_nick_index'
+branch_labels = None
+depends_on = None
+
+
+NORMALIZED_TABLES = {
+    'player_contacts': normalize_contact,
+    'player_payment_methods': normalize_payment_method,
+}
+
+CHILD_TABLES = [
+    'player_contacts',
+    'player_locations',
+    'player_nicknames',
+    'player_payment_methods',
+    'player_social_media',
+]
+
+def upgrade() -> None:
+    """Применяет изменения к базе данных при миграции вперед."""
+    for table, normalize in NORMALIZED_TABLES.items():
+        op.add_column(table, sa.Column('normalized_value', sa.String(length=255), nullable=True))
+        backfill_identifiers(
+            op.get_bind(), table,
+            lambda type_, value: {"normalized_value": normalize(type_, value)},
+        )
+        op.create_index(f'ix_{table}_type_normalized_value', table, ['type', 'normalized_value'])
+
+    # Индексы внешнего ключа для пакетной загрузки коллекций (player_id IN (...))
+    for table in CHILD_TABLES:
+        op.create_index(f'ix_{table}_player_id', table, ['player_id'])
+
+
+def downgrade() -> None:
+    """Откатывает изменения в базе данных при миграции назад."""
+    for table in CHILD_TABLES:
+        op.drop_index(f'ix_{table}_player_id', table_name=table)
+
+    for table in NORMALIZED_TABLES:
+        op.drop_index(f'ix_{table}_type_normalized_value', table_name=table)
+        op.drop_column(table, 'normalized_value')
@@ -0,0 +1,44 @@
+"""Add player_duplicate_candidates table for the dedupe job
+
+Revision ID: add_player_duplicate_candidates
+Revises: add_player_summary
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_player_duplicate_candidates'
+down_revision = 'add_player_summary'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Применяет изменения к базе данных при миграции вперед."""
+    op.create_table(
+        'player_duplicate_candidates',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('player_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('duplicate_player_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('name_similarity', sa.Float(), nullable=False),
+        sa.Column('reasons', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['player_id'], ['players.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['duplicate_player_id'], ['players.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('player_id', 'duplicate_player_id', name='uq_player_duplicate_candidates_pair')
+    )
+    op.create_index('ix_player_duplicate_candidates_duplicate_player_id', 'player_duplicate_candidates', ['duplicate_player_id'])
+    op.create_index('ix_player_duplicate_candidates_score', 'player_duplicate_candidates', ['score'])
+
+
+def downgrade() -> None:
+    """Откатывает изменения в базе данных при миграции назад."""
+    op.drop_index('ix_player_duplicate_candidates_score', table_name='player_duplicate_candidates')
+    op.drop_index('ix_player_duplicate_candidates_duplicate_player_id', table_name='player_duplicate_candidates')
+    op.drop_table('player_duplicate_candidates')
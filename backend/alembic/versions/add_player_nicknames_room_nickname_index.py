@@ -0,0 +1,30 @@
+"""Add (room, lower(nickname)) index on player_nicknames
+
+Revision ID: add_nicknames_room_nick_index
+Revises: add_players_name_trgm_indexes
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_nicknames_room_nick_index'
+down_revision = 'add_players_name_trgm_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Применяет изменения к базе данных при миграции вперед."""
+    op.create_index(
+        'ix_player_nicknames_room_lower_nickname',
+        'player_nicknames',
+        ['room', sa.text('lower(nickname)')],
+    )
+
+
+def downgrade() -> None:
+    """Откатывает изменения в базе данных при миграции назад."""
+    op.drop_index('ix_player_nicknames_room_lower_nickname', table_name='player_nicknames')
@@ -0,0 +1,74 @@
+"""Add player_summary table with per-player case aggregates
+
+Revision ID: add_player_summary
+Revises: add_normalized_identifiers
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_player_summary'
+down_revision = 'add_normalized_identifiers'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Применяет изменения к базе данных при миграции вперед."""
+    # Пересчет сводки идет по кейсам одного игрока
+    op.create_index('ix_cases_player_id', 'cases', ['player_id'])
+
+    op.create_table(
+        'player_summary',
+        sa.Column('player_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('fund_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('fund_name', sa.String(length=255), nullable=True),
+        sa.Column('cases_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('open_cases_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('latest_case_date', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('total_arbitrage_amount', sa.Float(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['player_id'], ['players.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['fund_id'], ['funds.id']),
+        sa.PrimaryKeyConstraint('player_id')
+    )
+
+    # Начальное заполнение одним агрегатом по всем игрокам
+    op.execute("""
+        INSERT INTO player_summary (
+            player_id, fund_id, fund_name, cases_count, open_cases_count,
+            latest_case_date, total_arbitrage_amount, updated_at
+        )
+        SELECT p.id, p.created_by_fund_id, f.name,
+               count(c.id),
+               count(c.id) FILTER (WHERE c.status = 'open'),
+               max(c.created_at),
+               coalesce(sum(c.arbitrage_amount), 0),
+               now()
+        FROM players p
+        LEFT JOIN funds f ON f.id = p.created_by_fund_id
+        LEFT JOIN cases c ON c.player_id = p.id
+        GROUP BY p.id, f.id
+    """)
+
+    # Индексы сортировок создаем после заполнения
+    op.create_index('ix_player_summary_cases_count', 'player_summary', ['cases_count', 'player_id'])
+    op.create_index('ix_player_summary_open_cases_count', 'player_summary', ['open_cases_count', 'player_id'])
+    op.create_index('ix_player_summary_latest_case_date', 'player_summary', ['latest_case_date', 'player_id'])
+    op.create_index('ix_player_summary_total_arbitrage_amount', 'player_summary', ['total_arbitrage_amount', 'player_id'])
+    op.create_index('ix_player_summary_fund_id', 'player_summary', ['fund_id'])
+
+
+def downgrade() -> None:
+    """Откатывает изменения в базе данных при миграции назад."""
+    op.drop_index('ix_player_summary_fund_id', table_name='player_summary')
+    op.drop_index('ix_player_summary_total_arbitrage_amount', table_name='player_summary')
+    op.drop_index('ix_player_summary_latest_case_date', table_name='player_summary')
+    op.drop_index('ix_player_summary_open_cases_count', table_name='player_summary')
+    op.drop_index('ix_player_summary_cases_count', table_name='player_summary')
+    op.drop_table('player_summary')
+    op.drop_index('ix_cases_player_id', table_name='cases')
@@ -0,0 +1,32 @@
+"""Add cluster_id to players
+
+Revision ID: add_players_cluster_id
+Revises: add_social_media_normalized
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_players_cluster_id'
+down_revision = 'add_social_media_normalized'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Применяет изменения к базе данных при миграции вперед."""
+    op.add_column('players', sa.Column('cluster_id', postgresql.UUID(as_uuid=True), nullable=True))
+    # Каждый игрок начинает в собственном кластере; связи проставляет
+    # scripts/rebuild_player_clusters.py после миграции
+    op.execute("UPDATE players SET cluster_id = id")
+    op.create_index('ix_players_cluster_id', 'players', ['cluster_id'])
+
+
+def downgrade() -> None:
+    """Откатывает изменения в базе данных при миграции назад."""
+    op.drop_index('ix_players_cluster_id', table_name='players')
+    op.drop_column('players', 'cluster_id')
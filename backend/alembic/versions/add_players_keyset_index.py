@@ -0,0 +1,30 @@
+"""Add keyset pagination index on players
+
+Revision ID: add_players_keyset_index
+Revises: 5fb8c55d0b06
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_players_keyset_index'
+down_revision = '5fb8c55d0b06'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Применяет изменения к базе данных при миграции вперед."""
+    # Keyset-пагинация сравнивает (created_at, id), поэтому NULL недопустим
+    op.execute("UPDATE players SET created_at = now() WHERE created_at IS NULL")
+    op.alter_column('players', 'created_at', nullable=False, server_default=sa.text('now()'))
+    op.create_index('ix_players_created_at_id', 'players', ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    """Откатывает изменения в базе данных при миграции назад."""
+    op.drop_index('ix_players_created_at_id', table_name='players')
+    op.alter_column('players', 'created_at', nullable=True, server_default=sa.text('now()'))
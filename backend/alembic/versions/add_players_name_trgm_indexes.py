@@ -0,0 +1,37 @@
+"""Add pg_trgm indexes for player name search
+
+Revision ID: add_players_name_trgm_indexes
+Revises: add_players_keyset_index
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_players_name_trgm_indexes'
+down_revision = 'add_players_keyset_index'
+branch_labels = None
+depends_on = None
+
+
+TRGM_COLUMNS = ['full_name', 'first_name', 'last_name']
+
+
+def upgrade() -> None:
+    """Применяет изменения к базе данных при миграции вперед."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in TRGM_COLUMNS:
+        op.create_index(
+            f'ix_players_{column}_trgm',
+            'players',
+            [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    """Откатывает изменения в базе данных при миграции назад."""
+    for column in TRGM_COLUMNS:
+        op.drop_index(f'ix_players_{column}_trgm', table_name='players')
@@ -0,0 +1,38 @@
+"""Add normalized_value to player social media
+
+Revision ID: add_social_media_normalized
+Revises: add_player_duplicate_candidates
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.backfill import backfill_identifiers
+from app.utils.normalize import normalize_social_media
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_social_media_normalized'
+down_revision = 'add_player_duplicate_candidates'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Применяет изменения к базе данных при миграции вперед."""
+    op.add_column('player_social_media', sa.Column('normalized_value', sa.String(length=255), nullable=True))
+
+    # Заполняем normalized_value существующих строк пачками
+    backfill_identifiers(
+        op.get_bind(), 'player_social_media',
+        lambda type_, value: {"normalized_value": normalize_social_media(type_, value)},
+    )
+
+    op.create_index('ix_player_social_media_type_normalized_value', 'player_social_media', ['type', 'normalized_value'])
+
+
+def downgrade() -> None:
+    """Откатывает изменения в базе данных при миграции назад."""
+    op.drop_index('ix_player_social_media_type_normalized_value', table_name='player_social_media')
+    op.drop_column('player_social_media', 'normalized_value')
@@ -0,0 +1,39 @@
+"""Normalize type of player contacts, payment methods and social media
+
+Revision ID: normalize_identifier_types
+Revises: add_case_evidences_case_id_index
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+
+from app.db.backfill import backfill_identifiers
+from app.utils.normalize import normalize_type
+
+
+# revision identifiers, used by Alembic.
+revision = 'normalize_identifier_types'
+down_revision = 'add_case_evidences_case_id_index'
+branch_labels = None
+depends_on = None
+
+
+IDENTIFIER_TABLES = [
+    'player_contacts',
+    'player_payment_methods',
+    'player_social_media',
+]
+
+
+def upgrade() -> None:
+    """Применяет изменения к базе данных при миграции вперед."""
+    # Поиск и связывание идут по (type, normalized_value), поэтому тип хранится
+    # в том же виде, что и в запросах (Phone -> phone)
+    for table in IDENTIFIER_TABLES:
+        backfill_identifiers(op.get_bind(), table, lambda type_, value: {"type": normalize_type(type_)})
+
+
+def downgrade() -> None:
+    """Откатывает изменения в базе данных при миграции назад."""
+    # Исходное написание типа не сохранялось, откатывать нечего
+    pass
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import users, cases, funds, players, stats, login, audit, rooms, search
+from app.api.v1.endpoints import users, cases, funds, players, stats, login, audit, rooms, search, export
 
 api_router = APIRouter()
 
@@ -17,4 +17,5 @@ api_router.include_router(players.router, prefix="/players", tags=["players"])
 api_router.include_router(stats.router, prefix="/stats", tags=["stats"])
 api_router.include_router(audit.router, prefix="/audit", tags=["audit"])
 api_router.include_router(rooms.router, prefix="/rooms", tags=["rooms"])
-api_router.include_router(search.router, prefix="/search", tags=["search"]) 
\ No newline at end of file
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(export.router, prefix="/export", tags=["export"]) 
\ No newline at end of file
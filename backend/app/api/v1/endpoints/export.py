@@ -0,0 +1,98 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app import models
+from app.api import deps
+from app.db.session import SessionLocal
+from app.services import export as export_service
+
+router = APIRouter()
+
+EXPORT_FORMAT_PATTERN = "^(ndjson|csv)$"
+
+
+def _stream_rows(
+    rows_factory: Callable[[Session], Iterator[Dict[str, Any]]],
+    format: str,
+    columns: Sequence[str],
+    compress: bool,
+    flatten: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+) -> Iterator[bytes]:
+    """
+    Генератор тела ответа.
+
+    Сессия открывается внутри генератора и живет ровно столько, сколько идет
+    передача: серверный курсор закрывается при завершении или обрыве соединения.
+    """
+    db = SessionLocal()
+    try:
+        rows = rows_factory(db)
+        if format == "csv":
+            if flatten is not None:
+                rows = (flatten(row) for row in rows)
+            lines = export_service.csv_lines(rows, columns)
+        else:
+            lines = export_service.ndjson_lines(rows)
+        yield from export_service.encode_chunks(lines, compress=compress)
+    finally:
+        db.close()
+
+
+def _export_response(name: str, format: str, compress: bool, body: Iterator[bytes]) -> StreamingResponse:
+    filename = f"{name}-{datetime.utcnow():%Y%m%d-%H%M%S}.{format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        body, media_type=export_service.EXPORT_FORMATS[format], headers=headers
+    )
+
+
+@router.get("/players")
+def export_players(
+    format: str = Query("ndjson", regex=EXPORT_FORMAT_PATTERN),
+    gzip: bool = False,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Export all players as a single stream.
+    
+    Rows are read with a server-side cursor and written out as they arrive,
+    so the dump is never built in memory.
+    
+    - **format**: ndjson (one player with its collections per line) or csv (collections folded into cells)
+    - **gzip**: compress the stream (response carries Content-Encoding: gzip)
+    """
+    body = _stream_rows(
+        export_service.iter_players,
+        format,
+        export_service.PLAYER_CSV_FIELDS,
+        gzip,
+        flatten=export_service.flatten_player,
+    )
+    return _export_response("players", format, gzip, body)
+
+
+@router.get("/cases")
+def export_cases(
+    format: str = Query("ndjson", regex=EXPORT_FORMAT_PATTERN),
+    gzip: bool = False,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Export all cases as a single stream, with player name and fund name.
+    
+    - **format**: ndjson or csv
+    - **gzip**: compress the stream (response carries Content-Encoding: gzip)
+    """
+    body = _stream_rows(
+        export_service.iter_cases,
+        format,
+        export_service.CASE_EXPORT_FIELDS,
+        gzip,
+    )
+    return _export_response("cases", format, gzip, body)
@@ -2,12 +2,13 @@ from typing import Any, List, Dict
 from uuid import UUID
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
 from app import crud, models, schemas
 from app.api import deps
+from app.services.search import reindex_cases_in_background
 
 router = APIRouter()
 
@@ -102,6 +103,7 @@ def read_fund(
 def update_fund(
     *,
     db: Session = Depends(deps.get_db),
+    background_tasks: BackgroundTasks,
     fund_id: UUID,
     fund_in: schemas.FundUpdate,
     current_user: models.User = Depends(deps.get_current_active_superuser),
@@ -114,7 +116,11 @@ def update_fund(
         fund = crud.fund.get(db=db, id=fund_id_uuid)
         if not fund:
             raise HTTPException(status_code=404, detail="Fund not found")
+        previous_name = fund.name
         fund = crud.fund.update(db=db, db_obj=fund, obj_in=fund_in)
+        if fund.name != previous_name:
+            # Название фонда денормализовано в документах кейсов
+            background_tasks.add_task(reindex_cases_in_background, fund_id=fund.id)
         return fund
     except ValueError:
         raise HTTPException(status_code=404, detail="Invalid fund ID format")
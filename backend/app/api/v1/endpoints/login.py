@@ -9,7 +9,6 @@ from app import crud, models, schemas
 from app.api import deps
 from app.core import security
 from app.core.config import settings
-from app.core.security import get_password_hash
 from app.utils import (
     generate_password_reset_token,
     send_reset_password_email,
@@ -91,8 +90,6 @@ def reset_password(
         )
     elif not crud.user.is_active(user):
         raise HTTPException(status_code=400, detail="Inactive user")
-    hashed_password = get_password_hash(new_password)
-    user.hashed_password = hashed_password
-    db.add(user)
-    db.commit()
+    # Через CRUD, чтобы сбросить кэш пользователя со старым хэшем пароля
+    crud.user.update(db, db_obj=user, obj_in={"password": new_password})
     return {"msg": "Password updated successfully"} 
\ No newline at end of file
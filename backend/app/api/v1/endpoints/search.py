@@ -3,11 +3,13 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from sqlalchemy.orm import Session, joinedload
+from starlette.concurrency import iterate_in_threadpool
 
 from app.api import deps
 from app.models import User
 from app.models.player import Player
 from app.services.search import search_service
+from app.schemas.case import CaseSearchResult
 from app.schemas.player import PlayerSearchResult
 from app import crud
 from app.utils.logger import logger
@@ -17,7 +19,7 @@ router = APIRouter()
 
 class UnifiedSearchResult(BaseModel):
     players: List[PlayerSearchResult] = []
-    cases: List[Any] = []
+    cases: List[CaseSearchResult] = []
     total_players: int = 0
     total_cases: int = 0
 
@@ -28,12 +30,16 @@ async def unified_search(
     query: str = Query(..., description="Поисковый запрос"),
     room: Optional[str] = Query(None, description="Фильтр по покерной комнате"),
     discipline: Optional[str] = Query(None, description="Фильтр по дисциплине"),
+    cluster_id: Optional[UUID] = Query(None, description="Фильтр по кластеру связанных записей игрока (только для игроков)"),
     skip: int = Query(0, description="Количество результатов для пропуска"),
     limit: int = Query(10, description="Максимальное количество результатов"),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    Унифицированный поиск по игрокам, кейсам и другим сущностям.
+    Унифицированный поиск по игрокам и кейсам.
+    
+    Оба индекса опрашиваются одним запросом msearch; total_players и total_cases -
+    полное число совпадений по данным Elasticsearch, а не размер страницы.
     """
     try:
         # Проверяем длину запроса
@@ -47,26 +53,22 @@ async def unified_search(
                 total_cases=0
             )
             
-        # Поиск игроков
+        # Игроки и кейсы ищутся одним запросом msearch
         logger.info(f"Выполняется поиск для запроса: '{query}'")
-        players = await search_service.search_players(
+        found = await search_service.search_all(
             query=query,
             room=room,
             discipline=discipline,
             skip=skip,
-            limit=limit
+            limit=limit,
+            cluster_id=cluster_id
         )
         
-        logger.info(f"Найдено {len(players)} игроков по запросу '{query}'")
-        
-        # В будущем здесь можно добавить поиск по другим сущностям
-        
-        return UnifiedSearchResult(
-            players=players,
-            total_players=len(players),  # В будущем можно получать общее количество из ES
-            cases=[],  # Пока заглушка для кейсов
-            total_cases=0
+        logger.info(
+            f"Найдено {found['total_players']} игроков и {found['total_cases']} кейсов по запросу '{query}'"
         )
+        
+        return UnifiedSearchResult(**found)
     except Exception as e:
         error_msg = str(e)
         logger.error(f"Ошибка при поиске: {error_msg}")
@@ -246,6 +248,47 @@ async def index_all_players_batched(
         raise HTTPException(status_code=500, detail=f"Ошибка индексации игроков: {str(e)}")
 
 
+@router.post("/index-all-cases", status_code=200)
+async def index_all_cases(
+    *,
+    db: Session = Depends(deps.get_db),
+    batch_size: int = Query(500, ge=1, le=5000, description="Количество кейсов в одном запросе _bulk"),
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Индексирует все кейсы в Elasticsearch запросами _bulk. Требуются права администратора.
+    
+    Кейсы читаются серверным курсором вместе с именем игрока и названием фонда,
+    по batch_size документов на запрос. Курсор читается в пуле потоков, чтобы
+    переиндексация не блокировала цикл событий.
+    """
+    try:
+        await search_service.create_index()
+        batches = crud.case.iter_denormalized_batches(db, batch_size=batch_size)
+        
+        total_indexed = 0
+        failed_count = 0
+        async for batch in iterate_in_threadpool(batches):
+            indexed, failed = await search_service.bulk_index_cases(batch)
+            total_indexed += indexed
+            failed_count += failed
+        
+        message = f"Всего проиндексировано {total_indexed} кейсов"
+        if failed_count > 0:
+            message += f" (не удалось проиндексировать {failed_count} кейсов)"
+        logger.info(message)
+        
+        return {
+            "status": "success",
+            "message": message,
+            "indexed_count": total_indexed,
+            "failed_count": failed_count
+        }
+    except Exception as e:
+        logger.error(f"Ошибка индексации кейсов: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Ошибка индексации кейсов: {str(e)}")
+
+
 @router.post("/index-player/{player_id}", status_code=200)
 async def index_player(
     *,
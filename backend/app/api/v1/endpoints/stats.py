@@ -1,5 +1,7 @@
 from typing import Any, List, Optional
+from datetime import date
 import logging
+import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
@@ -7,6 +9,7 @@ from sqlalchemy import func
 
 from app import crud, models, schemas
 from app.api import deps
+from app.crud.crud_case import ARBITRAGE_PERIODS, parse_arbitrage_group_by
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -173,4 +176,62 @@ def get_debug_dashboard_stats(
             "total": 8,
             "active": 8
         }
-    } 
\ No newline at end of file
+    } 
+
+@router.get("/arbitrage")
+def get_arbitrage_stats(
+    group_by: Optional[str] = Query(None, description="Измерения через запятую: fund, type, period (по умолчанию все)"),
+    period: str = Query("month", description="Гранулярность period: month, quarter, year"),
+    fund_id: Optional[uuid.UUID] = None,
+    currency: Optional[str] = None,
+    arbitrage_type: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Суммы, количество и средние арбитража по фонду, валюте, типу и периоду.
+    
+    Считается в базе по помесячной сводке case_arbitrage_monthly:
+    GROUP BY currency, ROLLUP(group_by). Суммы разных валют не складываются;
+    промежуточные итоги отмечены полем rolled_up.
+    
+    Менеджер фонда видит только свой фонд.
+    """
+    if period not in ARBITRAGE_PERIODS:
+        raise HTTPException(status_code=422, detail=f"Unknown period: {period}")
+    try:
+        dimensions = parse_arbitrage_group_by(group_by)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    if current_user.role != "admin":
+        if fund_id and fund_id != current_user.fund_id:
+            raise HTTPException(status_code=403, detail="Not enough permissions")
+        fund_id = current_user.fund_id
+    
+    results = crud.case.get_arbitrage_stats(
+        db,
+        group_by=dimensions,
+        period=period,
+        fund_id=fund_id,
+        currency=currency,
+        arbitrage_type=arbitrage_type,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    return {"group_by": dimensions, "period": period, "results": results}
+
+@router.get("/cache")
+def get_cache_stats(
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Счетчики кэша чтения игроков, фондов и пользователей в текущем процессе.
+    Требуются права администратора.
+    """
+    return {
+        crud_obj.cache.name: crud_obj.cache.stats()
+        for crud_obj in (crud.player, crud.fund, crud.user)
+    }
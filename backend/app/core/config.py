@@ -56,6 +56,28 @@ class Settings(BaseSettings):
             return v
         return f"http://{values.get('ELASTICSEARCH_HOST')}:{values.get('ELASTICSEARCH_PORT')}"
 
+    # Порог pg_trgm word_similarity для поиска игроков по имени (0..1)
+    PLAYER_SEARCH_SIMILARITY_THRESHOLD: float = 0.5
+
+    # Поиск дублей игроков: блоки крупнее лимита (частые фамилии, общие ники) пропускаются
+    DEDUPE_MAX_BLOCK_SIZE: int = 200
+    DEDUPE_MIN_SCORE: float = 0.5
+
+    # Кэш чтения по ID для игроков, фондов и пользователей (в пределах процесса)
+    ENTITY_CACHE_MAX_SIZE: int = 10000
+    ENTITY_CACHE_TTL_SECONDS: float = 60
+
+    # Хранилище файлов доказательств (content-addressed по SHA-256)
+    EVIDENCE_STORAGE_ROOT: str = "storage/evidences"
+    EVIDENCE_MAX_UPLOAD_SIZE: int = 200 * 1024 * 1024
+    EVIDENCE_UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    # internal-location nginx с корнем хранилища (например "/protected-evidences/"):
+    # если задан, файлы отдает nginx по X-Accel-Redirect, а не воркер приложения
+    EVIDENCE_ACCEL_REDIRECT_PREFIX: Optional[str] = None
+    # Миниатюры изображений-доказательств: процессов в пуле и заданий в очереди
+    THUMBNAIL_WORKERS: int = 2
+    THUMBNAIL_MAX_PENDING: int = 100
+
     SMTP_TLS: bool = True
     SMTP_PORT: Optional[int] = None
     SMTP_HOST: Optional[str] = None
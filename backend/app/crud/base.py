@@ -1,9 +1,14 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Dict, Generic, Iterable, List, Optional, Type, TypeVar, Union
+from uuid import UUID
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import func, inspect, select
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 
+from app.crud.cache import EntityCache
 from app.db.base_class import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -11,18 +16,87 @@ CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+def lock_aggregate_keys(db: Session, namespace: str, keys: Iterable[Any]) -> None:
+    """
+    Транзакционные advisory-блокировки Postgres на ключи денормализованных агрегатов.
+
+    Пересчет агрегата под блокировкой видит все кейсы, закоммиченные
+    параллельными транзакциями, и не затирает их результат своим снимком.
+    Блокировки берутся в отсортированном порядке, чтобы транзакции с
+    несколькими ключами не блокировали друг друга взаимно, и снимаются на commit.
+    """
+    for key in sorted({f"{namespace}:{key}" for key in keys}):
+        db.execute(select(func.pg_advisory_xact_lock(func.hashtext(key))))
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
-    def __init__(self, model: Type[ModelType]):
+    def __init__(self, model: Type[ModelType], cache: Optional[EntityCache] = None):
         """
         CRUD object with default methods to Create, Read, Update, Delete (CRUD).
         **Parameters**
         * `model`: A SQLAlchemy model class
         * `schema`: A Pydantic model (schema) class
+        * `cache`: optional read-through cache for `get` (UUID primary keys only)
         """
         self.model = model
+        self.cache = cache
 
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
-        return db.query(self.model).filter(self.model.id == id).first()
+        key = self._cache_key(id)
+        if key is None:
+            return db.query(self.model).filter(self.model.id == id).first()
+
+        # Объект уже в сессии - отдаем его, как сделал бы запрос
+        obj = db.identity_map.get(identity_key(self.model, key))
+        if obj is not None:
+            return obj
+
+        values = self.cache.get(key)
+        if values is not None:
+            return self._from_cache(db, values)
+
+        generation = self.cache.generation
+        obj = db.query(self.model).filter(self.model.id == key).first()
+        if obj is not None:
+            self.cache.put(
+                key,
+                {attr.key: getattr(obj, attr.key) for attr in inspect(self.model).column_attrs},
+                generation,
+            )
+        return obj
+
+    def invalidate(self, id: Any = None) -> None:
+        """
+        Сбрасывает кэш чтения для одного ID или, без аргумента, целиком.
+        """
+        if self.cache is None:
+            return
+        if id is None:
+            self.cache.invalidate()
+            return
+        key = self._cache_key(id)
+        if key is not None:
+            self.cache.invalidate(key)
+
+    def _cache_key(self, id: Any) -> Optional[UUID]:
+        if self.cache is None or id is None:
+            return None
+        if isinstance(id, UUID):
+            return id
+        try:
+            return UUID(str(id))
+        except ValueError:
+            return None
+
+    def _from_cache(self, db: Session, values: Dict[str, Any]) -> ModelType:
+        """
+        Собирает объект из снимка колонок и присоединяет к сессии без запроса.
+        """
+        obj = self.model.__mapper__.class_manager.new_instance()
+        for key, value in values.items():
+            set_committed_value(obj, key, value)
+        make_transient_to_detached(obj)
+        return db.merge(obj, load=False)
 
     def get_multi(
         self, db: Session, *, skip: int = 0, limit: int = 100
@@ -54,6 +128,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 setattr(db_obj, field, update_data[field])
         db.add(db_obj)
         db.commit()
+        self.invalidate(db_obj.id)
         db.refresh(db_obj)
         return db_obj
 
@@ -61,4 +136,5 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj = db.query(self.model).get(id)
         db.delete(obj)
         db.commit()
+        self.invalidate(id)
         return obj 
\ No newline at end of file
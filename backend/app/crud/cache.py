@@ -0,0 +1,92 @@
+"""
+Кэш чтения по ID для часто запрашиваемых сущностей (игроки, фонды, пользователи).
+
+Кэш живет в процессе: LRU ограниченного размера с TTL. Хранятся не ORM-объекты,
+а снимки значений колонок - на попадании из снимка собирается объект и
+присоединяется к сессии запроса без обращения к базе (Session.merge(load=False)),
+поэтому связи подгружаются как обычно, а объект можно менять и сохранять.
+
+Записи через CRUD-методы сбрасывают ключ явно. Записи из других процессов
+(другие воркеры uvicorn, скрипты) становятся видны не позже чем через TTL.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class EntityCache:
+    """
+    Потокобезопасный LRU-кэш с TTL и счетчиками попаданий.
+
+    Синхронные эндпоинты выполняются в пуле потоков, поэтому все операции
+    со словарем идут под одной блокировкой. Поколение (generation) растет при
+    каждом сбросе: значение, прочитанное из базы до сброса, не попадет в кэш
+    после него.
+    """
+
+    def __init__(self, name: str, max_size: int, ttl: float) -> None:
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items: "OrderedDict[Hashable, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or item[0] <= now:
+                if item is not None:
+                    del self._items[key]
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(item[1])
+
+    def put(self, key: Hashable, values: Dict[str, Any], generation: int) -> None:
+        """
+        Сохраняет снимок, если с момента чтения (generation) не было сброса.
+        """
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        values = copy.deepcopy(values)
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._items[key] = (time.monotonic() + self.ttl, values)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        Сбрасывает один ключ или, без аргумента, весь кэш.
+        """
+        with self._lock:
+            self.generation += 1
+            self.invalidations += 1
+            if key is None:
+                self._items.clear()
+            else:
+                self._items.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._items),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -1,12 +1,158 @@
-from typing import List, Optional, Dict, Any, Union
-from datetime import datetime
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Tuple, Union
+from datetime import date, datetime, timezone
 from uuid import UUID
 
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import Date, DateTime, and_, cast, delete, func, literal_column, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import REGCONFIG, insert
 from sqlalchemy.orm import Session
 
-from app.crud.base import CRUDBase
-from app.models.case import Case, CaseEvidence, CaseComment
-from app.schemas.case import CaseCreate, CaseUpdate
+from app.crud.base import CRUDBase, lock_aggregate_keys
+from app.crud.crud_player import child_version_columns, player as crud_player
+from app.models.case import Case, CaseArbitrageMonthly, CaseEvidence, CaseComment
+from app.models.fund import Fund
+from app.models.player import Player
+from app.models.user import User
+from app.schemas.case import Case as CaseSchema, CaseCreate, CaseEvidence as CaseEvidenceSchema, CaseExtended, CaseUpdate
+from app.schemas.fund import Fund as FundSchema
+from app.schemas.player import Player as PlayerSchema
+from app.utils.pagination import decode_cursor, next_cursor_for
+
+# Колонки кейса в компактном списке (schemas.CaseListItem)
+CASE_LIST_FIELDS = (
+    "id", "title", "status",
+    "arbitrage_type", "arbitrage_amount", "arbitrage_currency",
+    "player_id", "created_by_fund_id",
+    "closed_at", "created_at", "updated_at",
+)
+
+# Измерения /stats/arbitrage (ROLLUP идет в указанном порядке) и допустимые периоды
+ARBITRAGE_DIMENSIONS = ("fund", "type", "period")
+ARBITRAGE_PERIODS = ("month", "quarter", "year")
+
+
+def parse_arbitrage_group_by(group_by: Optional[str]) -> List[str]:
+    """
+    Разбирает параметр group_by= статистики арбитража: "fund,type,period".
+
+    Returns:
+        list: измерения в порядке ROLLUP (по умолчанию все)
+
+    Raises:
+        ValueError: если измерение неизвестно или повторяется
+    """
+    if group_by is None:
+        return list(ARBITRAGE_DIMENSIONS)
+    dimensions = [item.strip() for item in group_by.split(",") if item.strip()]
+    for dimension in dimensions:
+        if dimension not in ARBITRAGE_DIMENSIONS:
+            raise ValueError(f"Unknown group_by dimension: {dimension}")
+    if len(set(dimensions)) != len(dimensions):
+        raise ValueError("Duplicate group_by dimension")
+    return dimensions
+
+
+def month_start(value: Union[date, datetime]) -> date:
+    """
+    Первое число месяца; время без часового пояса считается UTC.
+    """
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return date(value.year, value.month, 1)
+
+
+def _case_month_bucket():
+    """
+    Месяц кейса в SQL: date_trunc по created_at в UTC, как month_start.
+    """
+    return cast(
+        func.date_trunc(literal_column("'month'"), func.timezone("UTC", Case.created_at)), Date
+    )
+
+
+def _bucket_condition(fund_id: UUID, month: date):
+    """
+    Кейсы фонда за месяц; диапазон по created_at использует ix_cases_fund_created_at_id.
+    """
+    next_month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+    return and_(
+        Case.created_by_fund_id == fund_id,
+        Case.created_at >= datetime(month.year, month.month, 1, tzinfo=timezone.utc),
+        Case.created_at < datetime(next_month.year, next_month.month, 1, tzinfo=timezone.utc),
+    )
+
+
+def case_search_query(search: str):
+    """
+    tsquery из пользовательской строки (синтаксис websearch: "фраза", -слово, or)
+    в обеих конфигурациях, из которых собран Case.search_vector.
+    """
+    return func.websearch_to_tsquery(cast("russian", REGCONFIG), search).op("||")(
+        func.websearch_to_tsquery(cast("simple", REGCONFIG), search)
+    )
+
+
+def evidence_version_columns(case_id_column) -> list:
+    """
+    Коррелированные подзапросы по доказательствам кейса для ETag карточки.
+
+    Доказательства не редактируются: их набор меняют загрузка и удаление
+    (count, max(created_at)), а ссылки на миниатюры появляются вместе с
+    derivatives_generated_at.
+    """
+    columns = [
+        select(func.count()).select_from(CaseEvidence),
+        select(func.max(CaseEvidence.created_at)),
+        select(func.max(CaseEvidence.derivatives_generated_at)),
+    ]
+    return [
+        column.where(CaseEvidence.case_id == case_id_column).scalar_subquery()
+        for column in columns
+    ]
+
+
+def case_order_by(search: Optional[str] = None) -> list:
+    """
+    Порядок списка кейсов: при поиске - по релевантности ts_rank, иначе по дате.
+
+    Последним ключом идет id: без него строки с равными рангом и датой
+    меняют порядок между запросами, и страницы со skip пропускают или
+    повторяют кейсы.
+    """
+    if not search:
+        return [Case.created_at.desc(), Case.id.desc()]
+    return [
+        func.ts_rank(Case.search_vector, case_search_query(search)).desc(),
+        Case.created_at.desc(),
+        Case.id.desc(),
+    ]
+
+
+def paginate_cases(
+    query, *, cursor: Optional[str] = None, skip: int = 0, limit: int = 100,
+    search: Optional[str] = None
+) -> Tuple[list, Optional[str]]:
+    """
+    Страница кейсов: keyset по (created_at, id) или, при поиске, по релевантности со skip.
+
+    Запрашивается limit + 1 строка, чтобы понять, есть ли следующая страница.
+
+    Raises:
+        ValueError: если курсор имеет неверный формат
+    """
+    if search:
+        rows = query.order_by(*case_order_by(search)).offset(skip).limit(limit).all()
+        return rows, None
+
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.filter(
+            tuple_(Case.created_at, Case.id) < tuple_(cursor_created_at, cursor_id)
+        )
+    elif skip:
+        query = query.offset(skip)
+    rows = query.order_by(Case.created_at.desc(), Case.id.desc()).limit(limit + 1).all()
+    return rows, next_cursor_for(rows, limit)
 
 
 class CRUDCase(CRUDBase[Case, CaseCreate, CaseUpdate]):
@@ -36,10 +182,260 @@ class CRUDCase(CRUDBase[Case, CaseCreate, CaseUpdate]):
         
         db_obj = Case(**obj_in_data)
         db.add(db_obj)
+        crud_player.refresh_summaries(db, player_ids=[player_id])
+        self.refresh_arbitrage_rollup(db, buckets=[(fund_id, db_obj.created_at)])
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: Case,
+        obj_in: Union[CaseUpdate, Dict[str, Any]]
+    ) -> Case:
+        """
+        Обновление кейса (в том числе закрытие) с пересчетом player_summary
+        и помесячных сумм арбитража.
+
+        Если кейс перенесен к другому игроку, пересчитываются оба игрока.
+        """
+        previous_player_id = db_obj.player_id
+        previous_bucket = (db_obj.created_by_fund_id, db_obj.created_at)
+        obj_data = jsonable_encoder(db_obj)
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+        for field in obj_data:
+            if field in update_data:
+                setattr(db_obj, field, update_data[field])
+        db.add(db_obj)
+        crud_player.refresh_summaries(db, player_ids=[previous_player_id, db_obj.player_id])
+        self.refresh_arbitrage_rollup(
+            db, buckets=[previous_bucket, (db_obj.created_by_fund_id, db_obj.created_at)]
+        )
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
+    def remove(self, db: Session, *, id: UUID) -> Optional[Case]:
+        obj = db.query(Case).get(id)
+        if obj is None:
+            return None
+        player_id = obj.player_id
+        bucket = (obj.created_by_fund_id, obj.created_at)
+        db.delete(obj)
+        crud_player.refresh_summaries(db, player_ids=[player_id])
+        self.refresh_arbitrage_rollup(db, buckets=[bucket])
+        db.commit()
+        return obj
+
+    def refresh_arbitrage_rollup(
+        self, db: Session, *, buckets: Iterable[Tuple[UUID, Union[date, datetime]]]
+    ) -> None:
+        """
+        Пересчитывает case_arbitrage_monthly для корзин (фонд, месяц).
+
+        Агрегат считается только по кейсам этих фондов за эти месяцы, поэтому
+        стоимость не зависит от размера таблицы cases. Строки корзины
+        удаляются и вставляются заново: так исчезают валюты и типы, кейсов
+        с которыми в корзине не осталось. Корзины пересчитываются под
+        advisory-блокировкой до конца транзакции, так что параллельные записи
+        в ту же корзину выполняются по очереди. Не делает commit.
+
+        Args:
+            db: сессия базы данных
+            buckets: пары (ID фонда, дата или created_at кейса)
+        """
+        buckets = {
+            (fund_id, month_start(created_at))
+            for fund_id, created_at in buckets
+            if fund_id is not None and created_at is not None
+        }
+        if not buckets:
+            return
+        # Сессия работает без autoflush, а агрегат должен видеть несохраненные изменения
+        db.flush()
+        lock_aggregate_keys(
+            db, CaseArbitrageMonthly.__tablename__,
+            (f"{fund_id}:{month.isoformat()}" for fund_id, month in buckets),
+        )
+
+        rollup = CaseArbitrageMonthly
+        db.execute(
+            delete(rollup).where(
+                or_(*(and_(rollup.fund_id == fund_id, rollup.month == month) for fund_id, month in buckets))
+            )
+        )
+        month = _case_month_bucket()
+        currency = func.coalesce(Case.arbitrage_currency, "")
+        arbitrage_type = func.coalesce(Case.arbitrage_type, "")
+        aggregate = (
+            select(
+                Case.created_by_fund_id,
+                month,
+                currency,
+                arbitrage_type,
+                func.count(Case.id),
+                func.count(Case.arbitrage_amount),
+                func.coalesce(func.sum(Case.arbitrage_amount), 0),
+                func.now(),
+            )
+            .where(or_(*(_bucket_condition(fund_id, month) for fund_id, month in buckets)))
+            .group_by(Case.created_by_fund_id, month, currency, arbitrage_type)
+        )
+        columns = [
+            "fund_id", "month", "currency", "arbitrage_type",
+            "cases_count", "amount_count", "total_amount", "updated_at",
+        ]
+        db.execute(insert(rollup).from_select(columns, aggregate))
+
+    def get_arbitrage_stats(
+        self,
+        db: Session,
+        *,
+        group_by: List[str],
+        period: str = "month",
+        fund_id: Optional[UUID] = None,
+        currency: Optional[str] = None,
+        arbitrage_type: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Суммы, количество и средние арбитража из case_arbitrage_monthly.
+
+        Группировка GROUP BY currency, ROLLUP(измерения): суммы разных валют
+        никогда не складываются, а для каждой валюты возвращаются и детальные
+        строки, и промежуточные итоги по префиксам group_by, и итог по валюте.
+        Измерение period - date_trunc месяца до month, quarter или year.
+
+        Args:
+            db: сессия базы данных
+            group_by: измерения из ARBITRAGE_DIMENSIONS (см. parse_arbitrage_group_by)
+            period: гранулярность измерения period
+            fund_id: только этот фонд
+            currency: только эта валюта
+            arbitrage_type: только этот тип арбитража
+            date_from: с месяца, в который попадает дата
+            date_to: по месяц, в который попадает дата, включительно
+
+        Returns:
+            list: строки с измерениями, cases_count, total_amount, average_amount
+            и rolled_up - списком измерений, по которым строка является итогом
+
+        Raises:
+            ValueError: если period не входит в ARBITRAGE_PERIODS
+        """
+        if period not in ARBITRAGE_PERIODS:
+            raise ValueError(f"Unknown period: {period}")
+        rollup = CaseArbitrageMonthly
+        dimension_columns = {
+            "fund": rollup.fund_id,
+            "type": rollup.arbitrage_type,
+            # Литерал, а не параметр: выражение в SELECT и GROUP BY должно совпадать
+            "period": cast(
+                func.date_trunc(literal_column(f"'{period}'"), cast(rollup.month, DateTime)), Date
+            ),
+        }
+        dimensions = [dimension_columns[name] for name in group_by]
+        columns = [rollup.currency] + dimensions
+        if dimensions:
+            columns.append(func.grouping(*dimensions))
+        total_amount = func.sum(rollup.total_amount)
+        query = db.query(
+            *columns,
+            func.sum(rollup.cases_count),
+            total_amount,
+            total_amount / func.nullif(func.sum(rollup.amount_count), 0),
+        )
+
+        if fund_id:
+            query = query.filter(rollup.fund_id == fund_id)
+        if currency is not None:
+            query = query.filter(rollup.currency == currency)
+        if arbitrage_type is not None:
+            query = query.filter(rollup.arbitrage_type == arbitrage_type)
+        if date_from:
+            query = query.filter(rollup.month >= month_start(date_from))
+        if date_to:
+            query = query.filter(rollup.month <= month_start(date_to))
+
+        if dimensions:
+            query = query.group_by(rollup.currency, func.rollup(*dimensions))
+        else:
+            query = query.group_by(rollup.currency)
+        # Итоговые строки ROLLUP (NULL в измерении) идут после детальных
+        query = query.order_by(rollup.currency, *(column.asc().nulls_last() for column in dimensions))
+        rows = query.all()
+
+        fund_names = {}
+        if "fund" in group_by:
+            position = 1 + group_by.index("fund")
+            fund_ids = {row[position] for row in rows if row[position] is not None}
+            if fund_ids:
+                fund_names = dict(db.query(Fund.id, Fund.name).filter(Fund.id.in_(fund_ids)))
+
+        results = []
+        for row in rows:
+            values = dict(zip(group_by, row[1:1 + len(group_by)]))
+            grouping = row[1 + len(group_by)] if dimensions else 0
+            rolled_up = [
+                name for index, name in enumerate(group_by)
+                if grouping >> (len(group_by) - 1 - index) & 1
+            ]
+            cases_count, total, average = row[-3:]
+            item: Dict[str, Any] = {"currency": row[0] or None}
+            if "fund" in values:
+                item["fund_id"] = values["fund"]
+                item["fund_name"] = fund_names.get(values["fund"])
+            if "type" in values:
+                item["arbitrage_type"] = values["type"] or None
+            if "period" in values:
+                item["period"] = values["period"]
+            item.update({
+                "cases_count": int(cases_count or 0),
+                "total_amount": float(total or 0),
+                "average_amount": float(average) if average is not None else None,
+                "rolled_up": rolled_up,
+            })
+            results.append(item)
+        return results
+
+    def get_version(self, db: Session, *, id: UUID) -> Optional[Tuple[str, tuple]]:
+        """
+        Версия кейса вместе с игроком, его коллекциями, фондом, закрывшим
+        пользователем (его имя попадает в ответ) и доказательствами одним запросом.
+
+        Вместе с версией возвращается заголовок кейса, чтобы проверить доступ
+        до ответа 304 Not Modified.
+
+        Returns:
+            tuple: (title, части версии для ETag) или None, если кейс не найден
+        """
+        row = (
+            db.query(
+                Case.title,
+                Case.updated_at,
+                Player.updated_at,
+                Fund.updated_at,
+                User.updated_at,
+                *evidence_version_columns(Case.id),
+                *child_version_columns(Case.player_id)
+            )
+            .outerjoin(Player, Player.id == Case.player_id)
+            .outerjoin(Fund, Fund.id == Case.created_by_fund_id)
+            .outerjoin(User, User.id == Case.closed_by_user_id)
+            .filter(Case.id == id)
+            .first()
+        )
+        if row is None:
+            return None
+        title, *version = row
+        return title, tuple(version)
+
     def add_comment(
         self, db: Session, *, case_id: UUID, comment_text: str, user_id: UUID
     ) -> CaseComment:
@@ -71,6 +467,113 @@ class CRUDCase(CRUDBase[Case, CaseCreate, CaseUpdate]):
         db.refresh(db_obj)
         return db_obj
 
+    def hydrate(
+        self, db: Session, *, cases: List[Case], with_evidences: bool = False
+    ) -> List[CaseExtended]:
+        """
+        Собирает CaseExtended для страницы кейсов пакетно.
+
+        Уникальные внешние ключи страницы собираются заранее, и каждая связанная
+        таблица читается один раз через IN (...): игроки с коллекциями (1 + 5
+        запросов), фонды и пользователи, закрывшие кейсы. Число запросов не
+        зависит от размера страницы, а каждый игрок и фонд сериализуется один раз.
+
+        Args:
+            db: сессия базы данных
+            cases: кейсы страницы
+            with_evidences: добавить доказательства со ссылками на миниатюры
+                и превью (еще один запрос)
+
+        Returns:
+            list: CaseExtended в порядке cases
+        """
+        player_ids = {case.player_id for case in cases if case.player_id}
+        fund_ids = {case.created_by_fund_id for case in cases if case.created_by_fund_id}
+        user_ids = {case.closed_by_user_id for case in cases if case.closed_by_user_id}
+
+        players = {
+            player_id: PlayerSchema.from_orm(player)
+            for player_id, player in (
+                crud_player.get_multi_by_ids(db, ids=list(player_ids)).items() if player_ids else ()
+            )
+        }
+        funds = {
+            fund.id: FundSchema.from_orm(fund)
+            for fund in (db.query(Fund).filter(Fund.id.in_(fund_ids)) if fund_ids else ())
+        }
+        user_names = dict(
+            db.query(User.id, User.full_name).filter(User.id.in_(user_ids)) if user_ids else ()
+        )
+
+        evidences: Dict[UUID, List[CaseEvidenceSchema]] = {}
+        if with_evidences and cases:
+            for evidence in (
+                db.query(CaseEvidence)
+                .filter(CaseEvidence.case_id.in_([case.id for case in cases]))
+                .order_by(CaseEvidence.created_at.desc())
+            ):
+                evidences.setdefault(evidence.case_id, []).append(CaseEvidenceSchema.from_orm(evidence))
+
+        result = []
+        for case in cases:
+            case_dict = CaseSchema.from_orm(case).dict()
+            case_dict["player"] = players.get(case.player_id)
+            case_dict["fund"] = funds.get(case.created_by_fund_id)
+            case_dict["closed_by_user_name"] = user_names.get(case.closed_by_user_id)
+            if with_evidences:
+                case_dict["evidences"] = evidences.get(case.id, [])
+            result.append(CaseExtended(**case_dict))
+        return result
+
+    def denormalized_query(self, db: Session):
+        """
+        Запрос по колонкам кейсов с именем игрока и названием фонда, без ORM-объектов.
+
+        Общая основа выгрузки (services.export) и индексации в Elasticsearch.
+        """
+        return (
+            db.query(
+                Case.id, Case.title, Case.description, Case.status,
+                Case.arbitrage_type, Case.arbitrage_amount, Case.arbitrage_currency,
+                Case.player_id, Player.full_name.label("player_full_name"),
+                Case.created_by_fund_id, Fund.name.label("fund_name"),
+                Case.created_by_user_id, Case.closed_by_user_id, Case.closed_at,
+                Case.created_at, Case.updated_at,
+            )
+            .outerjoin(Player, Player.id == Case.player_id)
+            .outerjoin(Fund, Fund.id == Case.created_by_fund_id)
+        )
+
+    def iter_denormalized_batches(
+        self, db: Session, *, batch_size: int,
+        player_id: Optional[UUID] = None, fund_id: Optional[UUID] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Строки denormalized_query пачками через серверный курсор, в порядке (created_at, id).
+
+        Синхронный генератор: из async-кода его обходят через iterate_in_threadpool,
+        чтобы чтение курсора не блокировало цикл событий.
+
+        Args:
+            db: сессия базы данных
+            batch_size: строк в пачке
+            player_id: только кейсы этого игрока
+            fund_id: только кейсы этого фонда
+        """
+        query = self.denormalized_query(db)
+        if player_id is not None:
+            query = query.filter(Case.player_id == player_id)
+        if fund_id is not None:
+            query = query.filter(Case.created_by_fund_id == fund_id)
+        batch = []
+        for row in query.order_by(Case.created_at, Case.id).execution_options(yield_per=batch_size):
+            batch.append(row._asdict())
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
     def get_multi_by_player(
         self, db: Session, *, player_id: UUID, skip: int = 0, limit: int = 100
     ) -> List[Case]:
@@ -83,15 +586,15 @@ class CRUDCase(CRUDBase[Case, CaseCreate, CaseUpdate]):
         )
 
     def get_by_status(
-        self, db: Session, *, status: str, skip: int = 0, limit: int = 100
-    ) -> List[Case]:
-        return (
-            db.query(self.model)
-            .filter(Case.status == status)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        self, db: Session, *, status: str, skip: int = 0, limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Case], Optional[str]]:
+        """
+        Returns:
+            tuple: (кейсы, курсор следующей страницы или None)
+        """
+        query = db.query(self.model).filter(Case.status == status)
+        return paginate_cases(query, cursor=cursor, skip=skip, limit=limit)
 
     def get_by_date_range(
         self,
@@ -100,16 +603,19 @@ class CRUDCase(CRUDBase[Case, CaseCreate, CaseUpdate]):
         start_date: datetime,
         end_date: datetime,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[Case]:
-        return (
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Case], Optional[str]]:
+        """
+        Returns:
+            tuple: (кейсы, курсор следующей страницы или None)
+        """
+        query = (
             db.query(self.model)
             .filter(Case.created_at >= start_date)
             .filter(Case.created_at <= end_date)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return paginate_cases(query, cursor=cursor, skip=skip, limit=limit)
 
     def update_status(
         self,
@@ -124,6 +630,7 @@ class CRUDCase(CRUDBase[Case, CaseCreate, CaseUpdate]):
             db_obj.notes = notes
         db_obj.updated_at = datetime.utcnow()
         db.add(db_obj)
+        crud_player.refresh_summaries(db, player_ids=[db_obj.player_id])
         db.commit()
         db.refresh(db_obj)
         return db_obj
@@ -140,6 +647,37 @@ class CRUDCase(CRUDBase[Case, CaseCreate, CaseUpdate]):
             .all()
         )
 
+    def create_evidence(
+        self, db: Session, *, case_id: UUID, obj_in: Dict[str, Any], uploaded_by_id: UUID
+    ) -> CaseEvidence:
+        """
+        Создает запись о доказательстве для уже сохраненного в хранилище файла.
+
+        Args:
+            db: сессия базы данных
+            case_id: ID кейса
+            obj_in: type, description и поля файла (file_path, file_name, sha256, size, mime_type)
+            uploaded_by_id: ID загрузившего пользователя
+
+        Returns:
+            CaseEvidence: созданная запись
+        """
+        db_obj = CaseEvidence(**obj_in, case_id=case_id, uploaded_by_id=uploaded_by_id)
+        db.add(db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+
+    def get_evidence(self, db: Session, *, case_id: UUID, evidence_id: UUID) -> Optional[CaseEvidence]:
+        """
+        Доказательство кейса по ID; None, если оно принадлежит другому кейсу.
+        """
+        return (
+            db.query(CaseEvidence)
+            .filter(CaseEvidence.id == evidence_id, CaseEvidence.case_id == case_id)
+            .first()
+        )
+
     def get_evidences(
         self, db: Session, *, case_id: UUID, skip: int = 0, limit: int = 100
     ) -> List[CaseEvidence]:
@@ -153,44 +691,27 @@ class CRUDCase(CRUDBase[Case, CaseCreate, CaseUpdate]):
         )
 
     def get_by_fund(
-        self, db: Session, *, fund_id: UUID, skip: int = 0, limit: int = 100
-    ) -> List[Case]:
-        return (
-            db.query(self.model)
-            .filter(Case.created_by_fund_id == fund_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
-
-    def get_filtered(
-        self, 
-        db: Session, 
-        *, 
-        filters: Dict[str, Any] = None,
-        search: Optional[str] = None,
-        skip: int = 0, 
-        limit: int = 100
-    ) -> tuple[int, List[Case]]:
+        self, db: Session, *, fund_id: UUID, skip: int = 0, limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Case], Optional[str]]:
         """
-        Получение кейсов с применением различных фильтров и поиска.
-        
-        Args:
-            db: сессия базы данных
-            filters: словарь фильтров в формате {имя_поля: значение}
-            search: строка для поиска в заголовке и описании
-            skip: смещение для пагинации
-            limit: максимальное количество результатов
-            
         Returns:
-            tuple: (общее количество записей, список кейсов)
+            tuple: (кейсы, курсор следующей страницы или None)
+        """
+        query = db.query(self.model).filter(Case.created_by_fund_id == fund_id)
+        return paginate_cases(query, cursor=cursor, skip=skip, limit=limit)
+
+    def apply_filters(
+        self, query, *, filters: Dict[str, Any] = None, search: Optional[str] = None
+    ):
+        """
+        Применяет к запросу по кейсам фильтры и поиск get_filtered.
+
+        Годится и для запросов по колонкам: условия ссылаются только на Case.
         """
         import logging
         logger = logging.getLogger("app")
         
-        # Создаём базовый запрос
-        query = db.query(self.model)
-        
         # Применяем фильтры
         if filters:
             logger.info(f"Applying filters: {filters}")
@@ -227,23 +748,106 @@ class CRUDCase(CRUDBase[Case, CaseCreate, CaseUpdate]):
             if "is_arbitrage" in filters:
                 query = query.filter(Case.is_arbitrage == filters["is_arbitrage"])
                 
-        # Применяем поиск по заголовку и описанию
+        # Применяем полнотекстовый поиск по заголовку, описанию и типу арбитража
         if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                (Case.title.ilike(search_term)) | 
-                (Case.description.ilike(search_term))
-            )
+            query = query.filter(Case.search_vector.bool_op("@@")(case_search_query(search)))
+        
+        return query
+
+    def get_filtered(
+        self, 
+        db: Session, 
+        *, 
+        filters: Dict[str, Any] = None,
+        search: Optional[str] = None,
+        skip: int = 0, 
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        with_total: bool = True
+    ) -> tuple[Optional[int], List[Case], Optional[str]]:
+        """
+        Получение кейсов с применением различных фильтров и поиска.
+        
+        Без search кейсы идут в порядке (created_at DESC, id DESC), и страницы
+        можно листать курсором - по составным индексам ix_cases_* это не зависит
+        от глубины страницы. При search порядок по релевантности, пагинация по skip.
+        
+        Args:
+            db: сессия базы данных
+            filters: словарь фильтров в формате {имя_поля: значение}
+            search: строка для поиска в заголовке и описании
+            skip: смещение для пагинации (игнорируется, если задан cursor)
+            limit: максимальное количество результатов
+            cursor: непрозрачный курсор из next_cursor предыдущей страницы
+            with_total: посчитать общее количество записей (полный COUNT)
+            
+        Returns:
+            tuple: (общее количество записей или None, список кейсов, курсор следующей страницы)
+            
+        Raises:
+            ValueError: если курсор имеет неверный формат
+        """
+        import logging
+        logger = logging.getLogger("app")
+        
+        # Создаём базовый запрос
+        query = db.query(self.model)
+        
+        query = self.apply_filters(query, filters=filters, search=search)
         
         # Получаем общее количество без учета пагинации
-        total_count = query.count()
+        total_count = query.count() if with_total else None
         
         # Применяем пагинацию и получаем результаты
-        results = query.order_by(Case.created_at.desc()).offset(skip).limit(limit).all()
+        results, next_cursor = paginate_cases(
+            query, cursor=cursor, skip=skip, limit=limit, search=search
+        )
         
         logger.info(f"Total count: {total_count}, returned results: {len(results)}")
         
-        return total_count, results
+        return total_count, results, next_cursor
+
+    def get_filtered_summary(
+        self,
+        db: Session,
+        *,
+        filters: Dict[str, Any] = None,
+        search: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        with_total: bool = True
+    ) -> tuple[Optional[int], List[Dict[str, Any]], Optional[str]]:
+        """
+        Компактная страница кейсов для списков (view=summary) одним запросом.
+
+        Вместо ORM-объектов и полного игрока с коллекциями читаются только
+        колонки CASE_LIST_FIELDS плюс имя игрока и название фонда через JOIN.
+        Фильтры, поиск и пагинация те же, что в get_filtered.
+
+        Returns:
+            tuple: (общее количество или None, список словарей CaseListItem, курсор следующей страницы)
+        """
+        total_count = None
+        if with_total:
+            total_count = self.apply_filters(
+                db.query(Case.id), filters=filters, search=search
+            ).count()
+
+        query = (
+            db.query(
+                *(getattr(Case, field) for field in CASE_LIST_FIELDS),
+                Player.full_name.label("player_name"),
+                Fund.name.label("fund_name"),
+            )
+            .outerjoin(Player, Player.id == Case.player_id)
+            .outerjoin(Fund, Fund.id == Case.created_by_fund_id)
+        )
+        query = self.apply_filters(query, filters=filters, search=search)
+        rows, next_cursor = paginate_cases(
+            query, cursor=cursor, skip=skip, limit=limit, search=search
+        )
+        return total_count, [row._asdict() for row in rows], next_cursor
 
 
 case = CRUDCase(Case) 
\ No newline at end of file
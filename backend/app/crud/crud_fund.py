@@ -1,9 +1,12 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.crud.base import CRUDBase
+from app.crud.cache import EntityCache
 from app.models.fund import Fund
+from app.models.player import PlayerSummary
 from app.schemas.fund import FundCreate, FundUpdate
 
 
@@ -14,5 +17,20 @@ class CRUDFund(CRUDBase[Fund, FundCreate, FundUpdate]):
     def get_multi_by_ids(self, db: Session, *, ids: List[int], skip: int = 0, limit: int = 100) -> List[Fund]:
         return db.query(Fund).filter(Fund.id.in_(ids)).offset(skip).limit(limit).all()
 
+    def update(
+        self, db: Session, *, db_obj: Fund, obj_in: Union[FundUpdate, Dict[str, Any]]
+    ) -> Fund:
+        fund = super().update(db, db_obj=db_obj, obj_in=obj_in)
+        # Название фонда денормализовано в player_summary
+        db.query(PlayerSummary).filter(
+            PlayerSummary.fund_id == fund.id,
+            PlayerSummary.fund_name.is_distinct_from(fund.name)
+        ).update({PlayerSummary.fund_name: fund.name}, synchronize_session=False)
+        db.commit()
+        return fund
 
-fund = CRUDFund(Fund) 
\ No newline at end of file
+
+fund = CRUDFund(
+    Fund,
+    cache=EntityCache("funds", settings.ENTITY_CACHE_MAX_SIZE, settings.ENTITY_CACHE_TTL_SECONDS),
+) 
\ No newline at end of file
@@ -1,14 +1,293 @@
-from typing import List, Optional, Dict, Any, Union
+import uuid
+from typing import List, Optional, Dict, Any, Tuple, Union
 from uuid import UUID
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Integer, String, and_, bindparam, column, func, literal, nullslast, or_, select, text, tuple_, union_all, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert
+from sqlalchemy.orm import Session, aliased, load_only, noload, selectinload
 
-from app.crud.base import CRUDBase
-from app.models.player import Player, PlayerContact, PlayerLocation, PlayerNickname, PlayerPaymentMethod, PlayerSocialMedia
+from app.core.config import settings
+from app.crud.base import CRUDBase, lock_aggregate_keys
+from app.crud.cache import EntityCache
+from app.models.case import Case
+from app.models.fund import Fund
+from app.models.player import Player, PlayerContact, PlayerLocation, PlayerNickname, PlayerPaymentMethod, PlayerSocialMedia, PlayerSummary, PlayerDuplicateCandidate
 from app.schemas.player import PlayerCreate, PlayerUpdate
+from app.utils.normalize import normalize_contact, normalize_payment_method, normalize_social_media, normalize_type
+from app.utils.pagination import decode_cursor, next_cursor_for
+
+
+# Дочерние коллекции игрока, которые отдаются в списках
+DETAIL_RELATIONSHIPS = (
+    Player.contacts,
+    Player.locations,
+    Player.nicknames,
+    Player.payment_methods,
+    Player.social_media,
+)
+
+def child_version_columns(player_id_column) -> list:
+    """
+    Коррелированные подзапросы max(updated_at) и count(*) по каждой дочерней коллекции.
+
+    count(*) нужен, чтобы удаление строки тоже меняло версию.
+    """
+    columns = []
+    for rel in DETAIL_RELATIONSHIPS:
+        child_model = rel.property.mapper.class_
+        columns.append(
+            select(func.max(child_model.updated_at))
+            .where(child_model.player_id == player_id_column)
+            .scalar_subquery()
+        )
+        columns.append(
+            select(func.count())
+            .select_from(child_model)
+            .where(child_model.player_id == player_id_column)
+            .scalar_subquery()
+        )
+    return columns
+
+
+# Колонки игрока, доступные для выборки через fields=
+PLAYER_FIELDS = (
+    "id", "first_name", "last_name", "middle_name", "full_name", "birth_date",
+    "contact_info", "additional_info", "health_notes",
+    "created_by_user_id", "created_by_fund_id", "cluster_id", "created_at", "updated_at",
+)
+
+# Показатели игрока по кейсам из player_summary (include=summary, сортировка и фильтры)
+PLAYER_SUMMARY_FIELDS = (
+    "cases_count", "open_cases_count", "latest_case_date", "total_arbitrage_amount", "fund_name",
+)
+
+# Колонки дочерних коллекций, доступные для выборки через include= и fields=
+PLAYER_CHILD_FIELDS = {
+    "contacts": ("id", "player_id", "type", "value", "description", "created_at", "updated_at"),
+    "locations": ("id", "player_id", "country", "city", "address", "created_at", "updated_at"),
+    "nicknames": ("id", "player_id", "nickname", "room", "discipline", "created_at", "updated_at"),
+    "payment_methods": ("id", "player_id", "type", "value", "description", "created_at", "updated_at"),
+    "social_media": ("id", "player_id", "type", "value", "description", "created_at", "updated_at"),
+    "summary": PLAYER_SUMMARY_FIELDS,
+}
+
+# Компактное представление дочерних коллекций без служебных полей
+PLAYER_CHILD_SUMMARY_FIELDS = {
+    "contacts": ("id", "type", "value", "description"),
+    "locations": ("id", "country", "city", "address"),
+    "nicknames": ("id", "nickname", "room"),
+    "payment_methods": ("id", "type", "value", "description"),
+    "social_media": ("id", "type", "value", "description"),
+    "summary": PLAYER_SUMMARY_FIELDS,
+}
+
+
+def parse_fieldset(
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    child_defaults: Dict[str, Tuple[str, ...]] = PLAYER_CHILD_FIELDS
+) -> Tuple[Tuple[str, ...], Dict[str, Tuple[str, ...]]]:
+    """
+    Разбирает параметры fields= и include= списков игроков.
+
+    Args:
+        fields: колонки через запятую; "коллекция.колонка" ограничивает колонки коллекции
+        include: дочерние коллекции через запятую (None - все, пустая строка - ни одной)
+        child_defaults: колонки коллекций, если они не перечислены в fields
+
+    Returns:
+        tuple: (колонки игрока, {коллекция: колонки})
+
+    Raises:
+        ValueError: если указана неизвестная колонка или коллекция
+    """
+    fields_list = [f.strip() for f in (fields or "").split(",") if f.strip()]
+    player_fields = [f for f in fields_list if "." not in f]
+    child_fields: Dict[str, List[str]] = {}
+    for item in fields_list:
+        if "." in item:
+            collection, column = item.split(".", 1)
+            child_fields.setdefault(collection, []).append(column)
+
+    if include is None:
+        collections = list(child_defaults) if fields is None else list(child_fields)
+    else:
+        collections = [c.strip() for c in include.split(",") if c.strip()]
+        collections += [c for c in child_fields if c not in collections]
+
+    unknown = [f for f in player_fields if f not in PLAYER_FIELDS]
+    unknown += [c for c in collections if c not in PLAYER_CHILD_FIELDS]
+    for collection, columns in child_fields.items():
+        unknown += [
+            f"{collection}.{c}" for c in columns
+            if c not in PLAYER_CHILD_FIELDS.get(collection, ())
+        ]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    if not player_fields:
+        player_fields = list(PLAYER_FIELDS)
+    elif "id" not in player_fields:
+        player_fields.insert(0, "id")
+
+    includes = {}
+    for collection in collections:
+        columns = child_fields.get(collection) or list(child_defaults[collection])
+        if "id" not in columns and "id" in PLAYER_CHILD_FIELDS[collection]:
+            columns.insert(0, "id")
+        includes[collection] = tuple(columns)
+    return tuple(player_fields), includes
+
+
+def serialize_player(
+    player: Player, fieldset: Tuple[Tuple[str, ...], Dict[str, Tuple[str, ...]]]
+) -> Dict[str, Any]:
+    """
+    Преобразует игрока в словарь только с колонками и коллекциями из fieldset.
+    """
+    player_fields, includes = fieldset
+    result = {field: getattr(player, field) for field in player_fields}
+    for collection, columns in includes.items():
+        related = getattr(player, collection)
+        if not getattr(Player, collection).property.uselist:
+            # Связь один-к-одному (summary) отдается объектом
+            result[collection] = (
+                {column: getattr(related, column) for column in columns}
+                if related is not None else None
+            )
+            continue
+        result[collection] = [
+            {column: getattr(child, column) for column in columns}
+            for child in related
+        ]
+    return result
+
+
+def parse_summary_sort(sort: Optional[str]) -> Optional[Tuple[str, bool]]:
+    """
+    Разбирает параметр sort= списка игроков: "cases_count" или "-cases_count".
+
+    Returns:
+        tuple: (колонка player_summary, по убыванию) или None, если сортировка не задана
+
+    Raises:
+        ValueError: если колонка не входит в PLAYER_SUMMARY_FIELDS
+    """
+    sort = (sort or "").strip()
+    if not sort:
+        return None
+    descending = sort.startswith("-")
+    field = sort.lstrip("-")
+    if field not in PLAYER_SUMMARY_FIELDS:
+        raise ValueError(f"Unknown sort field: {field}")
+    return field, descending
+
+
+# Коллекции, изменение которых может связать игрока с другими (кластеры)
+CLUSTER_COLLECTIONS = ("contacts", "payment_methods", "social_media", "nicknames")
+
+
+def _link_query(player_ids: List[UUID]):
+    """
+    Пары (игрок из player_ids, другой игрок, вид, тип, значение) с общим идентификатором.
+
+    Один UNION ALL из самосоединений по (type, normalized_value) для контактов,
+    платежных методов и соцсетей и по (room, lower(nickname)) для никнеймов -
+    каждое соединение идет по индексу соответствующей таблицы.
+    """
+    selects = []
+    for kind, (model, _) in IDENTIFIER_TABLES.items():
+        mine, other = aliased(model), aliased(model)
+        selects.append(
+            select(mine.player_id, other.player_id, literal(kind).label("kind"), mine.type, mine.value)
+            .select_from(mine)
+            .join(other, and_(
+                other.type == mine.type,
+                other.normalized_value == mine.normalized_value,
+                other.player_id != mine.player_id,
+            ))
+            .where(mine.player_id.in_(player_ids), mine.normalized_value != "")
+        )
+
+    mine, other = aliased(PlayerNickname), aliased(PlayerNickname)
+    selects.append(
+        select(mine.player_id, other.player_id, literal("nickname").label("kind"), mine.room, mine.nickname)
+        .select_from(mine)
+        .join(other, and_(
+            other.room == mine.room,
+            func.lower(other.nickname) == func.lower(mine.nickname),
+            other.player_id != mine.player_id,
+        ))
+        .where(mine.player_id.in_(player_ids))
+    )
+    return union_all(*selects)
+
+
+# Режимы списка игроков с порядком не по (created_at, id) листаются только через skip
+CURSOR_NOT_SUPPORTED = "cursor is not supported with search or sort, paginate with skip"
+
+
+# Колонки игроков, которые отдаются вместе с парами-кандидатами в дубли
+DUPLICATE_PLAYER_FIELDS = (
+    "id", "full_name", "first_name", "last_name", "birth_date", "created_by_fund_id", "created_at",
+)
+
+
+# Таблицы идентификаторов с нормализованным ключом: вид -> (модель, нормализатор)
+IDENTIFIER_TABLES = {
+    "contact": (PlayerContact, normalize_contact),
+    "payment_method": (PlayerPaymentMethod, normalize_payment_method),
+    "social_media": (PlayerSocialMedia, normalize_social_media),
+}
+
+
+def _identifier_key(values: Dict[str, Any]) -> tuple:
+    return normalize_type(values["type"]), values["normalized_value"] or values["value"]
+
+
+def _nickname_key(values: Dict[str, Any]) -> tuple:
+    return values["room"], (values["nickname"] or "").lower()
+
+
+def _location_key(values: Dict[str, Any]) -> tuple:
+    return values["country"], values["city"], values["address"]
+
+
+# Дочерние коллекции для обновления по разнице:
+# (модель, нормализатор значения, естественный ключ строки, сравниваемые поля)
+CHILD_COLLECTIONS = {
+    "contacts": (PlayerContact, normalize_contact, _identifier_key, ("type", "value", "normalized_value", "description")),
+    "locations": (PlayerLocation, None, _location_key, ("country", "city", "address")),
+    "nicknames": (PlayerNickname, None, _nickname_key, ("nickname", "room", "discipline")),
+    "payment_methods": (PlayerPaymentMethod, normalize_payment_method, _identifier_key, ("type", "value", "normalized_value", "description")),
+    "social_media": (PlayerSocialMedia, normalize_social_media, _identifier_key, ("type", "value", "normalized_value", "description")),
+}
 
 
 class CRUDPlayer(CRUDBase[Player, PlayerCreate, PlayerUpdate]):
+    def with_details(self, query, fieldset=None):
+        """
+        Загружает дочерние коллекции игроков одним запросом на таблицу (selectinload).
+
+        Количество запросов на страницу не зависит от ее размера: 1 + 5.
+        Если передан fieldset (см. parse_fieldset), из БД читаются только
+        перечисленные колонки и коллекции.
+        """
+        if fieldset is None:
+            return query.options(*(selectinload(rel) for rel in DETAIL_RELATIONSHIPS))
+
+        player_fields, includes = fieldset
+        # created_at нужен для курсора следующей страницы, даже если не запрошен
+        columns = set(player_fields) | {"created_at"}
+        options = [load_only(*(getattr(Player, f) for f in columns))]
+        for collection, columns in includes.items():
+            relationship = getattr(Player, collection)
+            child_model = relationship.property.mapper.class_
+            options.append(
+                selectinload(relationship).load_only(*(getattr(child_model, c) for c in columns))
+            )
+        return query.options(*options)
+
     def create_with_details(
         self, db: Session, *, obj_in: PlayerCreate
     ) -> Player:
@@ -18,7 +297,11 @@ class CRUDPlayer(CRUDBase[Player, PlayerCreate, PlayerUpdate]):
         middle_name = obj_in.middle_name
         full_name = obj_in.full_name or f"{first_name} {last_name or ''} {middle_name or ''}".strip()
         
+        # Новый игрок - отдельный кластер из одного игрока, как в create_bulk
+        player_id = uuid.uuid4()
         db_obj = Player(
+            id=player_id,
+            cluster_id=player_id,
             first_name=first_name,
             last_name=last_name, 
             middle_name=middle_name,
@@ -38,8 +321,9 @@ class CRUDPlayer(CRUDBase[Player, PlayerCreate, PlayerUpdate]):
             for contact in obj_in.contacts:
                 db_contact = PlayerContact(
                     player_id=db_obj.id,
-                    type=contact.type,
+                    type=normalize_type(contact.type),
                     value=contact.value,
+                    normalized_value=normalize_contact(contact.type, contact.value),
                     description=contact.description
                 )
                 db.add(db_contact)
@@ -71,8 +355,9 @@ class CRUDPlayer(CRUDBase[Player, PlayerCreate, PlayerUpdate]):
             for payment_method in obj_in.payment_methods:
                 db_payment_method = PlayerPaymentMethod(
                     player_id=db_obj.id,
-                    type=payment_method.type,
+                    type=normalize_type(payment_method.type),
                     value=payment_method.value,
+                    normalized_value=normalize_payment_method(payment_method.type, payment_method.value),
                     description=payment_method.description
                 )
                 db.add(db_payment_method)
@@ -82,16 +367,110 @@ class CRUDPlayer(CRUDBase[Player, PlayerCreate, PlayerUpdate]):
             for social_media in obj_in.social_media:
                 db_social_media = PlayerSocialMedia(
                     player_id=db_obj.id,
-                    type=social_media.type,
+                    type=normalize_type(social_media.type),
                     value=social_media.value,
+                    normalized_value=normalize_social_media(social_media.type, social_media.value),
                     description=social_media.description
                 )
                 db.add(db_social_media)
 
+        merged = self.update_clusters(db, player=db_obj)
+        self.refresh_summaries(db, player_ids=[db_obj.id])
         db.commit()
+        if merged:
+            self.invalidate()
         db.refresh(db_obj)
         return db_obj
 
+    def create_bulk(self, db: Session, *, objs_in: List[PlayerCreate]) -> List[UUID]:
+        """
+        Массовое создание игроков с дочерними коллекциями в одной транзакции.
+
+        ID генерируются на стороне приложения, поэтому игроки и все пять дочерних
+        таблиц вставляются многострочными INSERT (executemany драйвера psycopg2
+        собирает их в VALUES по страницам) без обращения к ORM-объектам.
+        В той же транзакции кластеры новых игроков сливаются с кластерами
+        связанных игроков (merge_clusters). Валидация входных данных - на
+        стороне вызывающего кода.
+
+        Returns:
+            list: ID созданных игроков в порядке objs_in
+        """
+        player_rows = []
+        child_rows: Dict[Any, List[Dict[str, Any]]] = {
+            PlayerContact: [], PlayerLocation: [], PlayerNickname: [],
+            PlayerPaymentMethod: [], PlayerSocialMedia: [],
+        }
+        for obj_in in objs_in:
+            player_id = uuid.uuid4()
+            full_name = obj_in.full_name or (
+                f"{obj_in.first_name} {obj_in.last_name or ''} {obj_in.middle_name or ''}".strip()
+            )
+            player_rows.append({
+                "id": player_id,
+                "first_name": obj_in.first_name,
+                "last_name": obj_in.last_name,
+                "middle_name": obj_in.middle_name,
+                "full_name": full_name,
+                "birth_date": obj_in.birth_date,
+                "contact_info": obj_in.contact_info,
+                "additional_info": obj_in.additional_info,
+                "health_notes": obj_in.health_notes,
+                "created_by_user_id": obj_in.created_by_user_id,
+                "created_by_fund_id": obj_in.created_by_fund_id,
+                "cluster_id": player_id,
+            })
+            for contact in obj_in.contacts or []:
+                child_rows[PlayerContact].append({
+                    "id": uuid.uuid4(), "player_id": player_id,
+                    "type": normalize_type(contact.type), "value": contact.value,
+                    "normalized_value": normalize_contact(contact.type, contact.value),
+                    "description": contact.description,
+                })
+            for location in obj_in.locations or []:
+                child_rows[PlayerLocation].append({
+                    "id": uuid.uuid4(), "player_id": player_id,
+                    "country": location.country, "city": location.city, "address": location.address,
+                })
+            for nickname in obj_in.nicknames or []:
+                child_rows[PlayerNickname].append({
+                    "id": uuid.uuid4(), "player_id": player_id,
+                    "nickname": nickname.nickname, "room": nickname.room, "discipline": nickname.discipline,
+                })
+            for payment_method in obj_in.payment_methods or []:
+                child_rows[PlayerPaymentMethod].append({
+                    "id": uuid.uuid4(), "player_id": player_id,
+                    "type": normalize_type(payment_method.type), "value": payment_method.value,
+                    "normalized_value": normalize_payment_method(payment_method.type, payment_method.value),
+                    "description": payment_method.description,
+                })
+            for social_media in obj_in.social_media or []:
+                child_rows[PlayerSocialMedia].append({
+                    "id": uuid.uuid4(), "player_id": player_id,
+                    "type": normalize_type(social_media.type), "value": social_media.value,
+                    "normalized_value": normalize_social_media(social_media.type, social_media.value),
+                    "description": social_media.description,
+                })
+
+        if not player_rows:
+            return []
+        try:
+            db.execute(insert(Player.__table__), player_rows)
+            for model, rows in child_rows.items():
+                if rows:
+                    db.execute(insert(model.__table__), rows)
+            player_ids = [row["id"] for row in player_rows]
+            self.refresh_summaries(db, player_ids=player_ids)
+            merged = self.merge_clusters(db, player_ids=player_ids)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        # Слияние меняет cluster_id и у уже существующих игроков
+        if merged:
+            self.invalidate()
+        return player_ids
+
     def update_with_details(
         self,
         db: Session,
@@ -116,96 +495,294 @@ class CRUDPlayer(CRUDBase[Player, PlayerCreate, PlayerUpdate]):
             middle_name = update_data.get("middle_name", db_obj.middle_name)
             db_obj.full_name = f"{first_name} {last_name or ''} {middle_name or ''}".strip()
 
-        # Update contacts
-        if "contacts" in update_data:
-            # Remove old contacts
-            db.query(PlayerContact).filter(
-                PlayerContact.player_id == db_obj.id
-            ).delete()
-            
-            # Add new contacts
-            for contact in update_data["contacts"]:
-                db_contact = PlayerContact(
-                    player_id=db_obj.id,
-                    type=contact["type"],
-                    value=contact["value"],
-                    description=contact.get("description")
-                )
-                db.add(db_contact)
-
-        # Update locations
-        if "locations" in update_data:
-            # Remove old locations
-            db.query(PlayerLocation).filter(
-                PlayerLocation.player_id == db_obj.id
-            ).delete()
-            
-            # Add new locations
-            for location in update_data["locations"]:
-                db_location = PlayerLocation(
-                    player_id=db_obj.id,
-                    country=location["country"],
-                    city=location.get("city"),
-                    address=location.get("address")
-                )
-                db.add(db_location)
-
-        # Update nicknames
-        if "nicknames" in update_data:
-            # Remove old nicknames
-            db.query(PlayerNickname).filter(
-                PlayerNickname.player_id == db_obj.id
-            ).delete()
-            
-            # Add new nicknames
-            for nickname in update_data["nicknames"]:
-                db_nickname = PlayerNickname(
-                    player_id=db_obj.id,
-                    nickname=nickname["nickname"],
-                    room=nickname.get("room"),
-                    discipline=nickname.get("discipline")
-                )
-                db.add(db_nickname)
-                
-        # Update payment methods
-        if "payment_methods" in update_data:
-            # Remove old payment methods
-            db.query(PlayerPaymentMethod).filter(
-                PlayerPaymentMethod.player_id == db_obj.id
-            ).delete()
-            
-            # Add new payment methods
-            for payment_method in update_data["payment_methods"]:
-                db_payment_method = PlayerPaymentMethod(
-                    player_id=db_obj.id,
-                    type=payment_method["type"],
-                    value=payment_method["value"],
-                    description=payment_method.get("description")
-                )
-                db.add(db_payment_method)
-                
-        # Update social media
-        if "social_media" in update_data:
-            # Remove old social media
-            db.query(PlayerSocialMedia).filter(
-                PlayerSocialMedia.player_id == db_obj.id
-            ).delete()
-            
-            # Add new social media
-            for social_media in update_data["social_media"]:
-                db_social_media = PlayerSocialMedia(
-                    player_id=db_obj.id,
-                    type=social_media["type"],
-                    value=social_media["value"],
-                    description=social_media.get("description")
-                )
-                db.add(db_social_media)
+        changed = self.sync_collections(db, player_id=db_obj.id, update_data=update_data)
 
         db.add(db_obj)
+        merged = 0
+        if any(collection in changed for collection in CLUSTER_COLLECTIONS):
+            merged = self.update_clusters(db, player=db_obj)
         db.commit()
+        # Слияние кластеров меняет cluster_id у других игроков
+        self.invalidate(None if merged else db_obj.id)
         db.refresh(db_obj)
         return db_obj
 
+    def sync_collections(
+        self, db: Session, *, player_id: UUID, update_data: Dict[str, Any]
+    ) -> List[str]:
+        """
+        Приводит дочерние коллекции игрока к переданным спискам по разнице.
+
+        Строки сопоставляются по естественному ключу (CHILD_COLLECTIONS), поэтому
+        неизменные строки сохраняют id и updated_at. Для каждой коллекции
+        выполняется не больше трех операторов: DELETE по списку id,
+        UPDATE executemany по id и многострочный INSERT. Коллекции, которых нет
+        в update_data или переданные как None, не трогаются. Не делает commit.
+
+        Returns:
+            list: названия коллекций, в которых что-то изменилось
+        """
+        changed = []
+        for collection, (model, normalizer, natural_key, value_fields) in CHILD_COLLECTIONS.items():
+            if update_data.get(collection) is None:
+                continue
+            table = model.__table__
+
+            # Текущие строки: естественный ключ -> [(id, значения)], ключи могут повторяться
+            existing: Dict[tuple, List[Tuple[UUID, Dict[str, Any]]]] = {}
+            columns = [table.c[field] for field in value_fields]
+            for row in db.execute(select(table.c.id, *columns).where(table.c.player_id == player_id)):
+                values = dict(zip(value_fields, row[1:]))
+                existing.setdefault(natural_key(values), []).append((row[0], values))
+
+            to_insert, to_update = [], []
+            for item in update_data[collection]:
+                values = {field: item.get(field) for field in value_fields if field != "normalized_value"}
+                if normalizer is not None:
+                    values["type"] = normalize_type(values["type"])
+                    values["normalized_value"] = normalizer(values["type"], values["value"])
+                matches = existing.get(natural_key(values))
+                if not matches:
+                    to_insert.append({"id": uuid.uuid4(), "player_id": player_id, **values})
+                    continue
+                row_id, current = matches.pop(0)
+                if current != values:
+                    to_update.append({"row_id": row_id, **values})
+            to_delete = [row_id for matches in existing.values() for row_id, _ in matches]
+
+            if to_delete:
+                db.execute(table.delete().where(table.c.id.in_(to_delete)))
+            if to_update:
+                db.execute(
+                    table.update().where(table.c.id == bindparam("row_id")),
+                    to_update,
+                )
+            if to_insert:
+                db.execute(insert(table), to_insert)
+            if to_delete or to_update or to_insert:
+                changed.append(collection)
+        return changed
+
+    def update_clusters(self, db: Session, *, player: Player) -> int:
+        """
+        Инкрементальное слияние кластера игрока с кластерами связанных игроков.
+
+        Returns:
+            int: сколько других игроков перешло в кластер (0 - слияния не было)
+        """
+        merged = self.merge_clusters(db, player_ids=[player.id])
+        db.refresh(player, ["cluster_id"])
+        return len([player_id for player_id in merged if player_id != player.id])
+
+    def merge_clusters(self, db: Session, *, player_ids: List[UUID]) -> List[UUID]:
+        """
+        Сливает кластеры игроков из player_ids с кластерами связанных с ними игроков.
+
+        Связи всей пачки находятся одним запросом (_link_query), компоненты
+        кластеров объединяются в памяти, а cluster_id переписывается одним
+        UPDATE ... FROM (VALUES (старый, новый)) по индексу cluster_id. ID
+        кластера - наименьший ID в компоненте, как в rebuild_clusters.
+        Кластеры здесь только сливаются; если после удаления идентификатора
+        кластер должен распасться, это сделает полная пересборка
+        (services.clustering.rebuild_clusters). Не делает commit.
+
+        Returns:
+            list: ID игроков, у которых изменился cluster_id
+        """
+        if not player_ids:
+            return []
+        # Сессия работает без autoflush, а поиск связей должен видеть новые идентификаторы
+        db.flush()
+        edges = {(row[0], row[1]) for row in db.execute(_link_query(player_ids))}
+        if not edges:
+            return []
+
+        involved = {player_id for edge in edges for player_id in edge}
+        clusters = dict(db.query(Player.id, Player.cluster_id).filter(Player.id.in_(involved)))
+        parent: Dict[UUID, UUID] = {}
+
+        def find(item: UUID) -> UUID:
+            while parent.get(item, item) != item:
+                item = parent[item]
+            return item
+
+        for a, b in edges:
+            root_a, root_b = find(clusters[a]), find(clusters[b])
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+        remap = [(old, find(old)) for old in set(clusters.values()) if find(old) != old]
+        if not remap:
+            return []
+
+        mapping = values(
+            column("old_cluster_id", PG_UUID(as_uuid=True)),
+            column("new_cluster_id", PG_UUID(as_uuid=True)),
+            name="cluster_remap",
+        ).data(remap)
+        players = Player.__table__
+        stmt = (
+            players.update()
+            .where(players.c.cluster_id == mapping.c.old_cluster_id)
+            .values(cluster_id=mapping.c.new_cluster_id)
+            .returning(players.c.id)
+        )
+        return [row[0] for row in db.execute(stmt)]
+
+    def refresh_summaries(self, db: Session, *, player_ids) -> None:
+        """
+        Пересчитывает player_summary для перечисленных игроков одним INSERT ... ON CONFLICT.
+
+        Агрегат считается только по кейсам этих игроков, поэтому стоимость
+        не зависит от размера таблицы cases. Сводка игрока пересчитывается под
+        advisory-блокировкой до конца транзакции, иначе параллельные изменения
+        кейсов одного игрока затирали бы результат друг друга. Не делает
+        commit: вызывается в транзакции изменения кейса или игрока.
+
+        Args:
+            db: сессия базы данных
+            player_ids: ID игроков, чьи показатели изменились
+        """
+        player_ids = {pid for pid in player_ids if pid is not None}
+        if not player_ids:
+            return
+        # Сессия работает без autoflush, а агрегат должен видеть несохраненные изменения
+        db.flush()
+        lock_aggregate_keys(db, PlayerSummary.__tablename__, player_ids)
+
+        aggregate = (
+            select(
+                Player.id,
+                Player.created_by_fund_id,
+                Fund.name,
+                func.count(Case.id),
+                func.count(Case.id).filter(Case.status == "open"),
+                func.max(Case.created_at),
+                func.coalesce(func.sum(Case.arbitrage_amount), 0),
+                func.now(),
+            )
+            .select_from(Player)
+            .outerjoin(Fund, Fund.id == Player.created_by_fund_id)
+            .outerjoin(Case, Case.player_id == Player.id)
+            .where(Player.id.in_(player_ids))
+            .group_by(Player.id, Fund.id)
+        )
+        columns = [
+            "player_id", "fund_id", "fund_name", "cases_count", "open_cases_count",
+            "latest_case_date", "total_arbitrage_amount", "updated_at",
+        ]
+        stmt = insert(PlayerSummary).from_select(columns, aggregate)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PlayerSummary.player_id],
+            set_={name: stmt.excluded[name] for name in columns[1:]},
+        )
+        db.execute(stmt)
+
+    def get_duplicate_candidates(
+        self,
+        db: Session,
+        *,
+        player_id: Optional[UUID] = None,
+        min_score: float = 0.0,
+        skip: int = 0,
+        limit: int = 100
+    ) -> Tuple[int, List[PlayerDuplicateCandidate]]:
+        """
+        Пары-кандидаты в дубли из последнего запуска задания (services.dedupe).
+
+        Args:
+            db: сессия базы данных
+            player_id: только пары с участием этого игрока
+            min_score: минимальная оценка пары
+            skip: смещение для пагинации
+            limit: максимальное количество результатов
+
+        Returns:
+            tuple: (общее количество пар, список пар по убыванию оценки)
+        """
+        query = db.query(PlayerDuplicateCandidate).filter(
+            PlayerDuplicateCandidate.score >= min_score
+        )
+        if player_id is not None:
+            query = query.filter(or_(
+                PlayerDuplicateCandidate.player_id == player_id,
+                PlayerDuplicateCandidate.duplicate_player_id == player_id,
+            ))
+        total_count = query.with_entities(func.count(PlayerDuplicateCandidate.id)).scalar()
+
+        player_columns = [getattr(Player, f) for f in DUPLICATE_PLAYER_FIELDS]
+        candidates = (
+            query.options(
+                selectinload(PlayerDuplicateCandidate.player).load_only(*player_columns),
+                selectinload(PlayerDuplicateCandidate.duplicate_player).load_only(*player_columns),
+            )
+            .order_by(PlayerDuplicateCandidate.score.desc(), PlayerDuplicateCandidate.id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        return total_count, candidates
+
+    def get_version(self, db: Session, *, id: UUID) -> Optional[Tuple[str, tuple]]:
+        """
+        Версия игрока и его коллекций одним запросом без загрузки объектов.
+
+        Вместе с версией возвращается полное имя игрока, чтобы проверить доступ
+        до ответа 304 Not Modified.
+
+        Returns:
+            tuple: (full_name, части версии для ETag) или None, если игрок не найден
+        """
+        row = (
+            db.query(Player.full_name, Player.updated_at, *child_version_columns(Player.id))
+            .filter(Player.id == id)
+            .first()
+        )
+        if row is None:
+            return None
+        full_name, *version = row
+        return full_name, tuple(version)
+
+    def get_cluster_members(self, db: Session, *, player_ids: List[UUID]) -> List[Player]:
+        """
+        Игроки из кластеров перечисленных игроков - все, чей cluster_id мог
+        измениться при слиянии, вместе с данными для документа в поисковом индексе.
+
+        Returns:
+            list: игроки с загруженными коллекциями, сводкой и фондом
+        """
+        if not player_ids:
+            return []
+        cluster_ids = select(Player.cluster_id).where(Player.id.in_(player_ids))
+        return (
+            db.query(Player)
+            .options(
+                selectinload(Player.contacts),
+                selectinload(Player.locations),
+                selectinload(Player.nicknames),
+                selectinload(Player.summary),
+                selectinload(Player.created_by_fund),
+                noload(Player.cases),
+            )
+            .filter(or_(Player.cluster_id.in_(cluster_ids), Player.id.in_(player_ids)))
+            .all()
+        )
+
+    def get_multi_by_ids(
+        self, db: Session, *, ids: List[UUID], fieldset=None
+    ) -> Dict[UUID, Player]:
+        """
+        Получение игроков по списку ID: один запрос на игроков и по одному на каждую коллекцию.
+
+        Returns:
+            dict: {id: игрок} только для найденных игроков
+        """
+        players = (
+            self.with_details(db.query(Player), fieldset)
+            .filter(Player.id.in_(set(ids)))
+            .all()
+        )
+        return {player.id: player for player in players}
+
     def get_by_nickname(
         self, db: Session, *, nickname: str
     ) -> Optional[Player]:
@@ -216,6 +793,48 @@ class CRUDPlayer(CRUDBase[Player, PlayerCreate, PlayerUpdate]):
             .first()
         )
 
+    def screen_nicknames(
+        self, db: Session, *, pairs: List[Tuple[str, str]]
+    ) -> Dict[int, List[UUID]]:
+        """
+        Массовый поиск игроков по парам (комната, никнейм) одним запросом.
+
+        Пары передаются как VALUES и соединяются с player_nicknames по индексу
+        ix_player_nicknames_room_lower_nickname; никнейм сравнивается без учета регистра.
+
+        Args:
+            db: сессия базы данных
+            pairs: список пар (комната, никнейм)
+
+        Returns:
+            dict: {индекс пары в pairs: [ID найденных игроков]}
+        """
+        if not pairs:
+            return {}
+        screened = values(
+            column("idx", Integer),
+            column("room", String),
+            column("nickname", String),
+            name="screened",
+        ).data([(idx, room, nickname.lower()) for idx, (room, nickname) in enumerate(pairs)])
+        rows = (
+            db.query(screened.c.idx, PlayerNickname.player_id)
+            .select_from(screened)
+            .join(
+                PlayerNickname,
+                and_(
+                    PlayerNickname.room == screened.c.room,
+                    func.lower(PlayerNickname.nickname) == screened.c.nickname,
+                ),
+            )
+            .distinct()
+            .all()
+        )
+        matches: Dict[int, List[UUID]] = {}
+        for idx, player_id in rows:
+            matches.setdefault(idx, []).append(player_id)
+        return matches
+
     def get_by_contact(
         self, db: Session, *, contact_type: str, contact_value: str
     ) -> Optional[Player]:
@@ -223,12 +842,87 @@ class CRUDPlayer(CRUDBase[Player, PlayerCreate, PlayerUpdate]):
             db.query(Player)
             .join(PlayerContact)
             .filter(
-                PlayerContact.type == contact_type,
-                PlayerContact.value == contact_value
+                PlayerContact.type == normalize_type(contact_type),
+                PlayerContact.normalized_value == normalize_contact(contact_type, contact_value)
             )
             .first()
         )
 
+    def get_by_payment_method(
+        self, db: Session, *, method_type: str, method_value: str
+    ) -> Optional[Player]:
+        return (
+            db.query(Player)
+            .join(PlayerPaymentMethod)
+            .filter(
+                PlayerPaymentMethod.type == normalize_type(method_type),
+                PlayerPaymentMethod.normalized_value == normalize_payment_method(method_type, method_value)
+            )
+            .first()
+        )
+
+    def find_by_identifiers(
+        self, db: Session, *, kind: str, items: List[Tuple[str, str]]
+    ) -> Dict[int, List[UUID]]:
+        """
+        Массовый поиск игроков по контактам или платежным методам одним запросом.
+
+        Тип и значение нормализуются так же, как при записи, и соединяются через VALUES
+        с индексом (type, normalized_value).
+
+        Args:
+            db: сессия базы данных
+            kind: "contact", "payment_method" или "social_media"
+            items: список пар (тип, значение)
+
+        Returns:
+            dict: {индекс пары в items: [ID найденных игроков]}
+        """
+        model, normalize = IDENTIFIER_TABLES[kind]
+        if not items:
+            return {}
+        lookup = values(
+            column("idx", Integer),
+            column("type", String),
+            column("normalized_value", String),
+            name="lookup",
+        ).data([
+            (idx, normalize_type(type_), normalize(type_, value))
+            for idx, (type_, value) in enumerate(items)
+        ])
+        rows = (
+            db.query(lookup.c.idx, model.player_id)
+            .select_from(lookup)
+            .join(
+                model,
+                and_(
+                    model.type == lookup.c.type,
+                    model.normalized_value == lookup.c.normalized_value,
+                ),
+            )
+            .distinct()
+            .all()
+        )
+        matches: Dict[int, List[UUID]] = {}
+        for idx, player_id in rows:
+            matches.setdefault(idx, []).append(player_id)
+        return matches
+
+    def get_linked(self, db: Session, *, player_id: UUID) -> Dict[UUID, List[Dict[str, Any]]]:
+        """
+        Другие игроки, у которых есть общий идентификатор с данным (см. _link_query).
+
+        Returns:
+            dict: {ID связанного игрока: [{"kind", "type", "value"} общих идентификаторов]}
+        """
+        linked: Dict[UUID, List[Dict[str, Any]]] = {}
+        for _, linked_id, kind, type_, value in db.execute(_link_query([player_id])):
+            link = {"kind": kind, "type": type_, "value": value}
+            links = linked.setdefault(linked_id, [])
+            if link not in links:
+                links.append(link)
+        return linked
+
     def get_by_location(
         self, db: Session, *, country: str, city: Optional[str] = None
     ) -> List[Player]:
@@ -239,19 +933,174 @@ class CRUDPlayer(CRUDBase[Player, PlayerCreate, PlayerUpdate]):
         )
         if city:
             query = query.filter(PlayerLocation.city == city)
-        return query.all()
+        return self.with_details(query).all()
 
     def get_by_fund(
-        self, db: Session, *, fund_id: UUID, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        *,
+        fund_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        fieldset=None,
+        sort: Optional[Tuple[str, bool]] = None,
+        summary_filters: Optional[Dict[str, Any]] = None
     ) -> List[Player]:
+        query = db.query(Player).filter(Player.created_by_fund_id == fund_id)
+        if sort is None:
+            query = query.order_by(Player.created_at.desc(), Player.id.desc())
+        query = self._apply_summary(query, sort, summary_filters)
         return (
-            db.query(Player)
-            .filter(Player.created_by_fund_id == fund_id)
+            self.with_details(query, fieldset)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def _apply_summary(
+        self,
+        query,
+        sort: Optional[Tuple[str, bool]] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Сортировка и фильтры по денормализованным показателям из player_summary.
+
+        Args:
+            query: запрос по Player
+            sort: результат parse_summary_sort; заменяет порядок запроса
+            filters: min_cases_count, has_open_cases, min_arbitrage_amount (None - не фильтровать)
+        """
+        filters = {k: v for k, v in (filters or {}).items() if v is not None}
+        if sort is None and not filters:
+            return query
+
+        query = query.outerjoin(PlayerSummary, PlayerSummary.player_id == Player.id)
+
+        if "min_cases_count" in filters:
+            query = query.filter(PlayerSummary.cases_count >= filters["min_cases_count"])
+        if "has_open_cases" in filters:
+            if filters["has_open_cases"]:
+                query = query.filter(PlayerSummary.open_cases_count > 0)
+            else:
+                query = query.filter(func.coalesce(PlayerSummary.open_cases_count, 0) == 0)
+        if "min_arbitrage_amount" in filters:
+            query = query.filter(PlayerSummary.total_arbitrage_amount >= filters["min_arbitrage_amount"])
+
+        if sort is not None:
+            field, descending = sort
+            sort_column = getattr(PlayerSummary, field)
+            order = sort_column.desc() if descending else sort_column.asc()
+            query = query.order_by(None).order_by(nullslast(order), Player.id.desc())
+        return query
+
+    def _apply_name_search(self, db: Session, query, search: str):
+        """
+        Фильтр и ранжирование по имени через триграммные GIN-индексы.
+
+        Оператор %> (word_similarity) использует индексы ix_players_*_trgm;
+        порог задается на время транзакции через pg_trgm.word_similarity_threshold.
+        """
+        db.execute(
+            text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+            {"threshold": str(settings.PLAYER_SEARCH_SIMILARITY_THRESHOLD)}
+        )
+        rank = func.greatest(
+            func.word_similarity(search, Player.full_name),
+            func.word_similarity(search, Player.first_name),
+            func.word_similarity(search, Player.last_name),
+        )
+        return (
+            query.filter(
+                Player.full_name.op("%>")(search) |
+                Player.first_name.op("%>")(search) |
+                Player.last_name.op("%>")(search)
+            )
+            .order_by(rank.desc(), Player.created_at.desc(), Player.id.desc())
+        )
+
+    def get_page(
+        self,
+        db: Session,
+        *,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        with_total: bool = False,
+        fieldset=None,
+        sort: Optional[Tuple[str, bool]] = None,
+        summary_filters: Optional[Dict[str, Any]] = None,
+        cluster_id: Optional[UUID] = None
+    ) -> Tuple[List[Player], Optional[str], Optional[int]]:
+        """
+        Получение страницы игроков в стабильном порядке (created_at DESC, id DESC).
+
+        Порядок совпадает с индексом ix_players_created_at_id, поэтому переход
+        по курсору не зависит от глубины страницы. Если cursor задан, skip
+        игнорируется.
+
+        При заданном search результаты упорядочены по качеству совпадения
+        (pg_trgm word_similarity), а пагинация идет только по skip: курсор в
+        этом режиме отклоняется. Так же работает сортировка sort по колонке
+        player_summary.
+
+        Args:
+            db: сессия базы данных
+            search: строка для поиска по имени
+            cursor: непрозрачный курсор из next_cursor предыдущей страницы
+            skip: смещение (только для режима без курсора)
+            limit: максимальное количество результатов
+            with_total: посчитать общее количество записей (полный COUNT)
+            fieldset: загружаемые колонки и коллекции (см. parse_fieldset)
+            sort: сортировка по player_summary (см. parse_summary_sort)
+            summary_filters: фильтры по player_summary (см. _apply_summary)
+            cluster_id: только игроки этого кластера связанных записей
+
+        Returns:
+            tuple: (список игроков, курсор следующей страницы, общее количество или None)
+
+        Raises:
+            ValueError: если курсор имеет неверный формат или передан вместе с search или sort
+        """
+        search = search.strip() if search else None
+        if cursor and (search or sort):
+            raise ValueError(CURSOR_NOT_SUPPORTED)
+        query = db.query(Player)
+
+        if search:
+            query = self._apply_name_search(db, query, search)
+        if cluster_id is not None:
+            query = query.filter(Player.cluster_id == cluster_id)
+        query = self._apply_summary(query, sort, summary_filters)
+
+        total_count = None
+        if with_total:
+            total_count = query.order_by(None).with_entities(func.count(Player.id)).scalar()
+
+        query = self.with_details(query, fieldset)
+
+        if search or sort:
+            players = query.offset(skip).limit(limit).all()
+            return players, None, total_count
+
+        if cursor:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+            query = query.filter(
+                tuple_(Player.created_at, Player.id) < tuple_(cursor_created_at, cursor_id)
+            )
+        elif skip:
+            query = query.offset(skip)
+
+        # Запрашиваем на одну строку больше, чтобы понять, есть ли следующая страница
+        players = (
+            query.order_by(Player.created_at.desc(), Player.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+        next_cursor = next_cursor_for(players, limit)
+        return players, next_cursor, total_count
+
     def get_by_user(
         self, db: Session, *, user_id: UUID, skip: int = 0, limit: int = 100
     ) -> List[Player]:
@@ -264,4 +1113,7 @@ class CRUDPlayer(CRUDBase[Player, PlayerCreate, PlayerUpdate]):
         )
 
 
-player = CRUDPlayer(Player) 
\ No newline at end of file
+player = CRUDPlayer(
+    Player,
+    cache=EntityCache("players", settings.ENTITY_CACHE_MAX_SIZE, settings.ENTITY_CACHE_TTL_SECONDS),
+) 
\ No newline at end of file
@@ -3,7 +3,9 @@ from typing import Any, Dict, Optional, Union
 from sqlalchemy.orm import Session
 
 from app.core.security import get_password_hash, verify_password
+from app.core.config import settings
 from app.crud.base import CRUDBase
+from app.crud.cache import EntityCache
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 
@@ -58,4 +60,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         return user.role == "admin"
 
 
-user = CRUDUser(User) 
\ No newline at end of file
+user = CRUDUser(
+    User,
+    cache=EntityCache("users", settings.ENTITY_CACHE_MAX_SIZE, settings.ENTITY_CACHE_TTL_SECONDS),
+) 
\ No newline at end of file
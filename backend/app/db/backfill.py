@@ -0,0 +1,34 @@
+"""
+Пересчет производных колонок существующих строк в миграциях.
+"""
+from typing import Any, Callable, Dict
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def backfill_identifiers(
+    conn: Connection,
+    table: str,
+    compute: Callable[[str, str], Dict[str, Any]],
+    batch_size: int = BACKFILL_BATCH_SIZE,
+) -> None:
+    """
+    Пересчитывает колонки строк таблицы идентификаторов игроков пачками UPDATE.
+
+    Args:
+        conn: соединение миграции (op.get_bind())
+        table: таблица с колонками id, type и value
+        compute: (type, value) -> {колонка: новое значение}, набор колонок у всех строк один
+        batch_size: строк в одном executemany
+    """
+    rows = conn.execute(sa.text(f"SELECT id, type, value FROM {table}")).fetchall()
+    updates = [{"id": row.id, **compute(row.type, row.value)} for row in rows]
+    if not updates:
+        return
+    assignments = ", ".join(f"{column} = :{column}" for column in updates[0] if column != "id")
+    stmt = sa.text(f"UPDATE {table} SET {assignments} WHERE id = :id")
+    for start in range(0, len(updates), batch_size):
+        conn.execute(stmt, updates[start:start + batch_size])
@@ -3,7 +3,7 @@
 from app.db.base_class import Base  # noqa
 from app.models.user import User  # noqa
 from app.models.fund import Fund  # noqa
-from app.models.player import Player, PlayerContact, PlayerLocation, PlayerNickname, PlayerPaymentMethod, PlayerSocialMedia  # noqa
-from app.models.case import Case, CaseEvidence, CaseComment  # noqa
+from app.models.player import Player, PlayerContact, PlayerLocation, PlayerNickname, PlayerPaymentMethod, PlayerSocialMedia, PlayerSummary, PlayerDuplicateCandidate  # noqa
+from app.models.case import Case, CaseArbitrageMonthly, CaseEvidence, CaseComment  # noqa
 from app.models.audit import AuditLog, NotificationSubscription  # noqa
 from app.models.room import Room  # noqa 
\ No newline at end of file
@@ -9,6 +9,7 @@ from app.core.config import settings
 from app.core.version import API_VERSION, LAST_UPDATE, RELEASE_NOTES
 from app.core.health import get_health_status
 from app.services.search import search_service
+from app.services.thumbnails import thumbnail_pool
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -67,5 +68,6 @@ async def shutdown_event():
     Закрытие соединений при остановке приложения
     """
     await search_service.close()
+    thumbnail_pool.shutdown()
 
 app.include_router(api_router, prefix=settings.API_V1_STR) 
\ No newline at end of file
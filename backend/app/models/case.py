@@ -1,16 +1,40 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Numeric, String, Text, Integer, Float
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import BigInteger, Column, Computed, Date, DateTime, ForeignKey, Index, Numeric, String, Text, Integer, Float
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 from app.db.base_class import Base
 
 
+# Полнотекстовый вектор кейса: русская морфология (заголовок важнее описания)
+# плюс simple-конфигурация для ников, сумм и слов, которых нет в русском словаре
+CASE_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('russian'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian'::regconfig, coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('russian'::regconfig, coalesce(arbitrage_type, '')), 'C') || "
+    "to_tsvector('simple'::regconfig, coalesce(title, '') || ' ' || coalesce(description, '') "
+    "|| ' ' || coalesce(arbitrage_type, ''))"
+)
+
+
 class Case(Base):
     __tablename__ = "cases"
+    __table_args__ = (
+        Index("ix_cases_search_vector", "search_vector", postgresql_using="gin"),
+        # Keyset-пагинация списков кейсов (created_at DESC, id DESC): общий список
+        # и варианты с фильтром по фонду, статусу, фонду и статусу, игроку
+        Index("ix_cases_created_at_id", "created_at", "id"),
+        Index("ix_cases_fund_created_at_id", "created_by_fund_id", "created_at", "id"),
+        Index("ix_cases_status_created_at_id", "status", "created_at", "id"),
+        Index(
+            "ix_cases_fund_status_created_at_id",
+            "created_by_fund_id", "status", "created_at", "id",
+        ),
+        Index("ix_cases_player_created_at_id", "player_id", "created_at", "id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     player_id = Column(UUID(as_uuid=True), ForeignKey("players.id"), nullable=False)
@@ -35,22 +59,55 @@ class Case(Base):
     closed_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
     closed_by_user = relationship("User", back_populates="closed_cases", foreign_keys=[closed_by_user_id])
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
+    # Генерируемая колонка для поиска; не загружается вместе с кейсом
+    search_vector = deferred(Column(TSVECTOR, Computed(CASE_SEARCH_VECTOR_SQL, persisted=True)))
+    
     # Связь с доказательствами
     evidences = relationship("CaseEvidence", back_populates="case", cascade="all, delete-orphan")
     # Связь с комментариями
     comments = relationship("CaseComment", back_populates="case", cascade="all, delete-orphan")
 
 
+class CaseArbitrageMonthly(Base):
+    """
+    Помесячные суммы арбитража по фонду, валюте и типу арбитража.
+
+    Месяц - начало месяца created_at кейса в UTC. Пустая валюта или тип
+    хранятся как "" (колонки входят в первичный ключ). Корзины (фонд, месяц)
+    пересчитываются при создании, изменении и удалении кейсов
+    (CRUDCase.refresh_arbitrage_rollup), поэтому /stats/arbitrage не
+    агрегирует таблицу cases.
+    """
+    __tablename__ = "case_arbitrage_monthly"
+
+    fund_id = Column(UUID(as_uuid=True), ForeignKey("funds.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True)
+    currency = Column(String(10), primary_key=True)
+    arbitrage_type = Column(String(255), primary_key=True)
+    cases_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Кейсов с указанной суммой - знаменатель среднего
+    amount_count = Column(Integer, nullable=False, default=0, server_default="0")
+    total_amount = Column(Float, nullable=False, default=0, server_default="0")
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
 class CaseEvidence(Base):
     __tablename__ = "case_evidences"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    case_id = Column(UUID(as_uuid=True), ForeignKey("cases.id"))
+    case_id = Column(UUID(as_uuid=True), ForeignKey("cases.id"), index=True)
     type = Column(String(50), nullable=False)  # screenshot, log, document
-    file_path = Column(String, nullable=False)
+    file_path = Column(String, nullable=False)  # путь в хранилище (services.evidence_storage)
+    file_name = Column(String(255), nullable=True)  # исходное имя загруженного файла
+    sha256 = Column(String(64), nullable=True, index=True)
+    size = Column(BigInteger, nullable=True)
+    mime_type = Column(String(255), nullable=True)
+    # Когда созданы миниатюра и превью (services.thumbnails); NULL - их нет
+    derivatives_generated_at = Column(DateTime(timezone=True), nullable=True)
     description = Column(Text, nullable=True)  # Описание доказательства
     uploaded_by_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
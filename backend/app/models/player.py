@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import Boolean, Column, String, ForeignKey, Date, DateTime, JSON, Float, Text
+from sqlalchemy import Boolean, Column, String, ForeignKey, Date, DateTime, JSON, Float, Text, Index, Integer, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import UUID
@@ -13,11 +13,15 @@ if TYPE_CHECKING:
 
 class PlayerContact(Base):
     __tablename__ = "player_contacts"
+    __table_args__ = (
+        Index("ix_player_contacts_type_normalized_value", "type", "normalized_value"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    player_id = Column(UUID(as_uuid=True), ForeignKey("players.id"))
+    player_id = Column(UUID(as_uuid=True), ForeignKey("players.id"), index=True)
     type = Column(String(50), nullable=False)  # phone, email, skype, vk, facebook, instagram, etc.
     value = Column(String(255), nullable=False)
+    normalized_value = Column(String(255), nullable=True)  # E.164 телефон, email в нижнем регистре и т.п.
     description = Column(String(255))
 
     player = relationship("Player", back_populates="contacts")
@@ -30,7 +34,7 @@ class PlayerLocation(Base):
     __tablename__ = "player_locations"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    player_id = Column(UUID(as_uuid=True), ForeignKey("players.id"))
+    player_id = Column(UUID(as_uuid=True), ForeignKey("players.id"), index=True)
     country = Column(String(255))
     city = Column(String(255))
     address = Column(String(255))
@@ -45,7 +49,7 @@ class PlayerNickname(Base):
     __tablename__ = "player_nicknames"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    player_id = Column(UUID(as_uuid=True), ForeignKey("players.id"))
+    player_id = Column(UUID(as_uuid=True), ForeignKey("players.id"), index=True)
     nickname = Column(String(255), nullable=False)
     room = Column(String(255))      # покерная комната (Red Star, Coin, WPN, Pokerdom, Pokerok, etc.)
     discipline = Column(String(255)) # дисциплина (MTT, Cash, etc.)
@@ -56,13 +60,25 @@ class PlayerNickname(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
 
+# Точный поиск никнейма в комнате без учета регистра (массовая проверка никнеймов)
+Index(
+    "ix_player_nicknames_room_lower_nickname",
+    PlayerNickname.room,
+    func.lower(PlayerNickname.nickname),
+)
+
+
 class PlayerPaymentMethod(Base):
     __tablename__ = "player_payment_methods"
+    __table_args__ = (
+        Index("ix_player_payment_methods_type_normalized_value", "type", "normalized_value"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    player_id = Column(UUID(as_uuid=True), ForeignKey("players.id"))
+    player_id = Column(UUID(as_uuid=True), ForeignKey("players.id"), index=True)
     type = Column(String(50), nullable=False)  # webmoney, skrill, neteller, ecopayz, etc.
     value = Column(String(255), nullable=False)
+    normalized_value = Column(String(255), nullable=True)  # канонический идентификатор кошелька
     description = Column(String(255))
 
     player = relationship("Player", back_populates="payment_methods")
@@ -73,11 +89,15 @@ class PlayerPaymentMethod(Base):
 
 class PlayerSocialMedia(Base):
     __tablename__ = "player_social_media"
+    __table_args__ = (
+        Index("ix_player_social_media_type_normalized_value", "type", "normalized_value"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    player_id = Column(UUID(as_uuid=True), ForeignKey("players.id"))
+    player_id = Column(UUID(as_uuid=True), ForeignKey("players.id"), index=True)
     type = Column(String(50), nullable=False)  # vk, facebook, instagram, blog, forum, gipsyteam, pokerstrategy
     value = Column(String(255), nullable=False)
+    normalized_value = Column(String(255), nullable=True)  # ссылка на профиль без схемы и регистра
     description = Column(String(255))
 
     player = relationship("Player", back_populates="social_media")
@@ -86,8 +106,76 @@ class PlayerSocialMedia(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
 
+class PlayerSummary(Base):
+    """
+    Денормализованные показатели игрока по кейсам.
+
+    Пересчитывается для затронутых игроков при создании, изменении, закрытии
+    и удалении кейсов (CRUDPlayer.refresh_summaries), поэтому сортировка и
+    фильтры списков не агрегируют таблицу cases.
+    """
+    __tablename__ = "player_summary"
+    __table_args__ = (
+        # Сортировки списков игроков (с player_id для стабильного порядка)
+        Index("ix_player_summary_cases_count", "cases_count", "player_id"),
+        Index("ix_player_summary_open_cases_count", "open_cases_count", "player_id"),
+        Index("ix_player_summary_latest_case_date", "latest_case_date", "player_id"),
+        Index("ix_player_summary_total_arbitrage_amount", "total_arbitrage_amount", "player_id"),
+        Index("ix_player_summary_fund_id", "fund_id"),
+    )
+
+    player_id = Column(UUID(as_uuid=True), ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    fund_id = Column(UUID(as_uuid=True), ForeignKey("funds.id"), nullable=True)
+    fund_name = Column(String(255), nullable=True)
+    cases_count = Column(Integer, nullable=False, default=0, server_default="0")
+    open_cases_count = Column(Integer, nullable=False, default=0, server_default="0")
+    latest_case_date = Column(DateTime(timezone=True), nullable=True)
+    total_arbitrage_amount = Column(Float, nullable=False, default=0, server_default="0")
+
+    player = relationship("Player", back_populates="summary")
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class PlayerDuplicateCandidate(Base):
+    """
+    Пара записей, похожих на одного и того же игрока (результат задания поиска дублей).
+
+    player_id < duplicate_player_id, поэтому каждая пара хранится один раз.
+    """
+    __tablename__ = "player_duplicate_candidates"
+    __table_args__ = (
+        UniqueConstraint("player_id", "duplicate_player_id", name="uq_player_duplicate_candidates_pair"),
+        Index("ix_player_duplicate_candidates_duplicate_player_id", "duplicate_player_id"),
+        Index("ix_player_duplicate_candidates_score", "score"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    player_id = Column(UUID(as_uuid=True), ForeignKey("players.id", ondelete="CASCADE"), nullable=False)
+    duplicate_player_id = Column(UUID(as_uuid=True), ForeignKey("players.id", ondelete="CASCADE"), nullable=False)
+    score = Column(Float, nullable=False)            # итоговая оценка 0..1
+    name_similarity = Column(Float, nullable=False)  # pg_trgm similarity(full_name)
+    reasons = Column(JSON, nullable=False)           # блоки, в которых совпали: surname_birth_year, nickname, phone
+
+    player = relationship("Player", foreign_keys=[player_id])
+    duplicate_player = relationship("Player", foreign_keys=[duplicate_player_id])
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 class Player(Base):
     __tablename__ = "players"
+    __table_args__ = (
+        # Порядок keyset-пагинации списка игроков (created_at DESC, id DESC)
+        Index("ix_players_created_at_id", "created_at", "id"),
+        # Триграммные индексы для поиска по имени (требуют расширения pg_trgm)
+        Index("ix_players_full_name_trgm", "full_name",
+              postgresql_using="gin", postgresql_ops={"full_name": "gin_trgm_ops"}),
+        Index("ix_players_first_name_trgm", "first_name",
+              postgresql_using="gin", postgresql_ops={"first_name": "gin_trgm_ops"}),
+        Index("ix_players_last_name_trgm", "last_name",
+              postgresql_using="gin", postgresql_ops={"last_name": "gin_trgm_ops"}),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     # Разделяем ФИО на отдельные поля
@@ -106,15 +194,19 @@ class Player(Base):
     
     created_by_fund_id = Column(UUID(as_uuid=True), ForeignKey("funds.id"), nullable=False)
     created_by_fund = relationship("Fund")
+
+    # Кластер записей, связанных общими идентификаторами (ID наименьшего игрока кластера)
+    cluster_id = Column(UUID(as_uuid=True), nullable=True, index=True)
     
     # Связи с другими таблицами
     cases = relationship("Case", back_populates="player", cascade="all, delete-orphan")
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     contacts = relationship("PlayerContact", back_populates="player", cascade="all, delete-orphan")
     locations = relationship("PlayerLocation", back_populates="player", cascade="all, delete-orphan")
     nicknames = relationship("PlayerNickname", back_populates="player", cascade="all, delete-orphan")
     payment_methods = relationship("PlayerPaymentMethod", back_populates="player", cascade="all, delete-orphan")
-    social_media = relationship("PlayerSocialMedia", back_populates="player", cascade="all, delete-orphan") 
\ No newline at end of file
+    social_media = relationship("PlayerSocialMedia", back_populates="player", cascade="all, delete-orphan")
+    summary = relationship("PlayerSummary", back_populates="player", uselist=False, cascade="all, delete-orphan") 
\ No newline at end of file
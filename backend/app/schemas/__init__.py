@@ -1,12 +1,13 @@
 from .user import User, UserCreate, UserUpdate, UserInDB
 from .fund import Fund, FundCreate, FundUpdate
-from .player import Player, PlayerCreate, PlayerUpdate, PlayerDetail, PlayerSearchResult
+from .player import Player, PlayerCreate, PlayerUpdate, PlayerDetail, PlayerSearchResult, PlayerBatchGet, PlayerBulkCreate
+from .player import NicknameScreenItem, NicknameScreenRequest, IdentifierLookupItem, IdentifierLookupRequest
 from .player import PlayerContact, PlayerContactCreate, PlayerContactUpdate
 from .player import PlayerLocation, PlayerLocationCreate, PlayerLocationUpdate
 from .player import PlayerNickname, PlayerNicknameCreate, PlayerNicknameUpdate
 from .player import PlayerPaymentMethod, PlayerPaymentMethodCreate, PlayerPaymentMethodUpdate
 from .player import PlayerSocialMedia, PlayerSocialMediaCreate, PlayerSocialMediaUpdate
-from .case import Case, CaseCreate, CaseUpdate, CaseExtended, CaseWithPlayer
+from .case import Case, CaseCreate, CaseUpdate, CaseExtended, CaseWithPlayer, CaseListItem, CaseSearchResult
 from .case import CaseEvidence, CaseEvidenceCreate, CaseEvidenceUpdate
 from .case import CaseComment, CaseCommentCreate, CaseCommentUpdate
 from .audit import AuditLog, AuditLogCreate, AuditLogUpdate
@@ -28,6 +29,12 @@ __all__ = [
     "PlayerCreate",
     "PlayerUpdate",
     "PlayerSearchResult",
+    "PlayerBatchGet",
+    "PlayerBulkCreate",
+    "NicknameScreenItem",
+    "NicknameScreenRequest",
+    "IdentifierLookupItem",
+    "IdentifierLookupRequest",
     "PlayerContact",
     "PlayerContactCreate",
     "PlayerContactUpdate",
@@ -49,6 +56,8 @@ __all__ = [
     "CaseUpdate",
     "CaseExtended",
     "CaseWithPlayer",
+    "CaseListItem",
+    "CaseSearchResult",
     "CaseEvidence",
     "CaseEvidenceCreate",
     "CaseEvidenceUpdate",
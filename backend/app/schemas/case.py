@@ -1,8 +1,10 @@
 from typing import Optional, List
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, root_validator
 from uuid import UUID
 
+from app.core.config import settings
+
 from app.schemas.player import Player
 from app.schemas.fund import Fund
 
@@ -47,16 +49,6 @@ class Case(CaseBase):
         orm_mode = True
 
 
-# Расширенная схема для чтения с дополнительными полями
-class CaseExtended(Case):
-    player: Optional[Player] = None
-    fund: Optional[Fund] = None
-    closed_by_user_name: Optional[str] = None
-    
-    class Config:
-        orm_mode = True
-
-
 # Базовые схемы для доказательств
 class CaseEvidenceBase(BaseModel):
     type: str
@@ -64,7 +56,8 @@ class CaseEvidenceBase(BaseModel):
 
 
 class CaseEvidenceCreate(CaseEvidenceBase):
-    pass
+    # Ограничения колонки case_evidences.type
+    type: str = Field(..., min_length=1, max_length=50)
 
 
 class CaseEvidenceUpdate(CaseEvidenceBase):
@@ -75,13 +68,77 @@ class CaseEvidence(CaseEvidenceBase):
     id: UUID
     case_id: UUID
     file_path: str
+    file_name: Optional[str] = None
+    sha256: Optional[str] = None
+    size: Optional[int] = None
+    mime_type: Optional[str] = None
+    derivatives_generated_at: Optional[datetime] = None
+    # Ссылки на файл и, когда они готовы, на миниатюру и превью
+    content_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    preview_url: Optional[str] = None
     uploaded_by_id: UUID
     created_at: datetime
 
+    @root_validator(skip_on_failure=True)
+    def set_content_urls(cls, values):
+        content_url = f"{settings.API_V1_STR}/cases/{values['case_id']}/evidences/{values['id']}/content"
+        values["content_url"] = content_url
+        if values.get("derivatives_generated_at"):
+            values["thumbnail_url"] = f"{content_url}?variant=thumb"
+            values["preview_url"] = f"{content_url}?variant=preview"
+        return values
+
+    class Config:
+        orm_mode = True
+
+
+# Расширенная схема для чтения с дополнительными полями
+class CaseExtended(Case):
+    player: Optional[Player] = None
+    fund: Optional[Fund] = None
+    closed_by_user_name: Optional[str] = None
+    # Доказательства со ссылками на миниатюры и превью; заполняются только в карточке кейса
+    evidences: Optional[List[CaseEvidence]] = None
+    
     class Config:
         orm_mode = True
 
 
+# Компактная строка списка кейсов: только то, что показывает список
+class CaseListItem(BaseModel):
+    id: UUID
+    title: str
+    status: str
+    arbitrage_type: Optional[str] = None
+    arbitrage_amount: Optional[float] = None
+    arbitrage_currency: Optional[str] = None
+    player_id: UUID
+    player_name: Optional[str] = None
+    created_by_fund_id: UUID
+    fund_name: Optional[str] = None
+    closed_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+# Кейс в результатах полнотекстового поиска (документ индекса cases)
+class CaseSearchResult(BaseModel):
+    id: UUID
+    title: str
+    description: Optional[str] = None
+    status: str
+    arbitrage_type: Optional[str] = None
+    arbitrage_amount: Optional[float] = None
+    arbitrage_currency: Optional[str] = None
+    player_id: Optional[UUID] = None
+    player_name: Optional[str] = None
+    fund_id: Optional[UUID] = None
+    fund_name: Optional[str] = None
+    closed_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+
 # Базовые схемы для комментариев
 class CaseCommentBase(BaseModel):
     comment: str
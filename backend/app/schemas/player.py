@@ -1,5 +1,5 @@
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel
+from typing import Optional, List, Dict, Any, Literal
+from pydantic import BaseModel, conlist
 from datetime import datetime, date
 from uuid import UUID
 
@@ -158,6 +158,13 @@ class PlayerUpdate(PlayerBase):
     last_name: Optional[str] = None
     middle_name: Optional[str] = None
     full_name: Optional[str] = None
+    # Переданная коллекция заменяет текущую целиком (по разнице), [] очищает ее;
+    # отсутствующая или null - не меняется
+    contacts: Optional[List[PlayerContactCreate]] = None
+    locations: Optional[List[PlayerLocationCreate]] = None
+    nicknames: Optional[List[PlayerNicknameCreate]] = None
+    payment_methods: Optional[List[PlayerPaymentMethodCreate]] = None
+    social_media: Optional[List[PlayerSocialMediaCreate]] = None
 
 
 # Свойства для чтения
@@ -165,6 +172,7 @@ class Player(PlayerBase):
     id: UUID
     created_by_user_id: UUID
     created_by_fund_id: UUID
+    cluster_id: Optional[UUID] = None
     created_at: datetime
     updated_at: datetime
     contacts: List[PlayerContact] = []
@@ -188,6 +196,7 @@ class PlayerDetail(Player):
 # Схема для результатов поиска игрока
 class PlayerSearchResult(BaseModel):
     id: UUID
+    cluster_id: Optional[UUID] = None
     full_name: str
     first_name: str
     last_name: Optional[str] = None
@@ -201,4 +210,54 @@ class PlayerSearchResult(BaseModel):
     nicknames: Optional[List[Dict[str, str]]] = []
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True
+
+
+# Максимальное количество игроков в одном запросе batch-get
+PLAYER_BATCH_GET_MAX_IDS = 500
+
+
+# Запрос пакетного получения игроков
+class PlayerBatchGet(BaseModel):
+    ids: conlist(UUID, min_items=1, max_items=PLAYER_BATCH_GET_MAX_IDS)
+
+
+# Максимальное количество игроков в одном запросе массового создания
+PLAYER_BULK_MAX_ITEMS = 5000
+
+
+# Запрос массового создания игроков: элементы валидируются как PlayerCreate
+# по одному, чтобы ошибка в одном элементе не отклоняла весь пакет
+class PlayerBulkCreate(BaseModel):
+    items: conlist(Dict[str, Any], min_items=1, max_items=PLAYER_BULK_MAX_ITEMS)
+
+
+# Максимальное количество пар (комната, никнейм) в одной массовой проверке
+NICKNAME_SCREEN_MAX_ITEMS = 5000
+
+
+# Пара (комната, никнейм) для массовой проверки
+class NicknameScreenItem(BaseModel):
+    room: str
+    nickname: str
+
+
+# Запрос массовой проверки никнеймов
+class NicknameScreenRequest(BaseModel):
+    items: conlist(NicknameScreenItem, min_items=1, max_items=NICKNAME_SCREEN_MAX_ITEMS)
+
+
+# Максимальное количество идентификаторов в одном пакетном поиске
+IDENTIFIER_LOOKUP_MAX_ITEMS = 5000
+
+
+# Идентификатор для пакетного поиска: контакт, платежный метод или профиль в соцсети
+class IdentifierLookupItem(BaseModel):
+    kind: Literal["contact", "payment_method", "social_media"] = "contact"
+    type: str
+    value: str
+
+
+# Запрос пакетного поиска игроков по контактам и платежным методам
+class IdentifierLookupRequest(BaseModel):
+    items: conlist(IdentifierLookupItem, min_items=1, max_items=IDENTIFIER_LOOKUP_MAX_ITEMS)
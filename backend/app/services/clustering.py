@@ -0,0 +1,132 @@
+"""
+Кластеры игроков, связанных общими идентификаторами (компоненты связности).
+
+Два игрока попадают в один кластер, если у них совпадает нормализованный
+контакт, платежный метод, профиль в соцсети или никнейм в комнате - напрямую
+или через цепочку других игроков. ID кластера - наименьший ID игрока в нем,
+поэтому полная пересборка и инкрементальное слияние дают одинаковый результат.
+
+Инкрементально (CRUDPlayer.update_clusters) кластеры только сливаются;
+разделение после удаления идентификатора выполняет полная пересборка.
+"""
+import logging
+from collections import Counter
+from typing import Dict, Iterable, Iterator, Tuple
+from uuid import UUID
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from app.crud.crud_player import IDENTIFIER_TABLES, player as crud_player
+from app.models.player import Player, PlayerNickname
+
+logger = logging.getLogger(__name__)
+
+# Размер пачки серверного курсора при чтении идентификаторов
+CLUSTER_READ_BATCH_SIZE = 10000
+# Размер пачки UPDATE при записи cluster_id
+CLUSTER_WRITE_BATCH_SIZE = 5000
+
+
+class UnionFind:
+    """
+    Система непересекающихся множеств со сжатием путей.
+
+    Корень множества - наименьший элемент, чтобы ID кластера не зависел от
+    порядка обхода ребер.
+    """
+
+    def __init__(self) -> None:
+        self.parent: Dict[UUID, UUID] = {}
+
+    def find(self, item: UUID) -> UUID:
+        parent = self.parent.setdefault(item, item)
+        if parent == item:
+            return item
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        # Сжатие пути
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a: UUID, b: UUID) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if root_b < root_a:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+
+
+def _identifier_groups(db: Session) -> Iterator[Iterable[Tuple[str, str, UUID]]]:
+    """
+    Потоки (тип, значение, player_id), отсортированные по ключу, по каждой таблице идентификаторов.
+    """
+    for model, _ in IDENTIFIER_TABLES.values():
+        yield db.execute(
+            select(model.type, model.normalized_value, model.player_id)
+            .where(model.normalized_value.isnot(None), model.normalized_value != "")
+            .order_by(model.type, model.normalized_value)
+            .execution_options(yield_per=CLUSTER_READ_BATCH_SIZE)
+        )
+    yield db.execute(
+        select(PlayerNickname.room, func.lower(PlayerNickname.nickname), PlayerNickname.player_id)
+        .where(PlayerNickname.room.isnot(None))
+        .order_by(PlayerNickname.room, func.lower(PlayerNickname.nickname))
+        .execution_options(yield_per=CLUSTER_READ_BATCH_SIZE)
+    )
+
+
+def rebuild_clusters(db: Session) -> Dict[str, int]:
+    """
+    Полная пересборка кластеров: union-find по всем идентификаторам.
+
+    Идентификаторы читаются отсортированными по ключу, так что для объединения
+    достаточно сравнить строку с предыдущей - в памяти держится только лес
+    union-find. Записываются только игроки, у которых cluster_id изменился.
+
+    Returns:
+        dict: {"players": всего игроков, "clusters": кластеров из 2+ игроков, "updated": обновлено}
+    """
+    forest = UnionFind()
+    for rows in _identifier_groups(db):
+        previous_key, previous_player = None, None
+        for type_, value, player_id in rows:
+            key = (type_, value)
+            if key == previous_key:
+                forest.union(previous_player, player_id)
+            previous_key, previous_player = key, player_id
+
+    stmt = (
+        update(Player.__table__)
+        .where(Player.__table__.c.id == bindparam("player_id"))
+        .values(cluster_id=bindparam("new_cluster_id"))
+    )
+    players = 0
+    updated = 0
+    pending = []
+    rows = db.execute(
+        select(Player.id, Player.cluster_id).execution_options(yield_per=CLUSTER_READ_BATCH_SIZE)
+    )
+    for player_id, cluster_id in rows:
+        players += 1
+        new_cluster_id = forest.find(player_id) if player_id in forest.parent else player_id
+        if new_cluster_id != cluster_id:
+            pending.append({"player_id": player_id, "new_cluster_id": new_cluster_id})
+        if len(pending) >= CLUSTER_WRITE_BATCH_SIZE:
+            db.execute(stmt, pending)
+            updated += len(pending)
+            pending = []
+    if pending:
+        db.execute(stmt, pending)
+        updated += len(pending)
+    db.commit()
+    if updated:
+        crud_player.invalidate()
+
+    sizes = Counter(forest.find(item) for item in list(forest.parent))
+    clusters = sum(1 for size in sizes.values() if size > 1)
+    logger.info(f"Кластеры пересобраны: игроков {players}, обновлено {updated}")
+    return {"players": players, "clusters": clusters, "updated": updated}
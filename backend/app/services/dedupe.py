@@ -0,0 +1,132 @@
+"""
+Пакетный поиск дублей игроков по блокирующим ключам.
+
+Каждому игроку строятся ключи: фамилия + год рождения, никнейм, телефон (E.164).
+Сравниваются только игроки внутри одного блока, а похожесть имен считается
+pg_trgm прямо в запросе, поэтому объем работы растет почти линейно с числом
+игроков, а не как сравнение всех пар. Блоки крупнее DEDUPE_MAX_BLOCK_SIZE
+(частые фамилии, общие ники вроде "poker") не дают полезных пар и пропускаются.
+"""
+import logging
+from typing import Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.utils.normalize import PHONE_TYPES
+
+logger = logging.getLogger(__name__)
+
+# Вес совпадения в блоке каждого вида; итог = 0.5 * похожесть имени + 0.5 * min(1, сумма весов)
+BLOCKING_WEIGHTS = {
+    "phone": 0.5,
+    "nickname": 0.3,
+    "surname_birth_year": 0.2,
+}
+
+# Никнеймы короче этого не считаются надежным ключом
+MIN_NICKNAME_LENGTH = 3
+
+_DEDUPE_SQL = text("""
+    WITH keys AS (
+        SELECT p.id AS player_id,
+               'surname_birth_year' AS kind,
+               translate(lower(coalesce(nullif(btrim(p.last_name), ''),
+                                        split_part(btrim(p.full_name), ' ', 1))), 'ё', 'е')
+                   || ':' || extract(year FROM p.birth_date)::int AS key
+        FROM players p
+        WHERE p.birth_date IS NOT NULL
+          AND coalesce(nullif(btrim(p.last_name), ''), btrim(p.full_name), '') <> ''
+        UNION ALL
+        SELECT n.player_id, 'nickname', lower(btrim(n.nickname))
+        FROM player_nicknames n
+        WHERE length(btrim(n.nickname)) >= :min_nickname_length
+        UNION ALL
+        SELECT c.player_id, 'phone', c.normalized_value
+        FROM player_contacts c
+        WHERE lower(c.type) = ANY(:phone_types) AND coalesce(c.normalized_value, '') <> ''
+    ),
+    blocks AS (
+        SELECT kind, key
+        FROM keys
+        GROUP BY kind, key
+        HAVING count(DISTINCT player_id) BETWEEN 2 AND :max_block_size
+    ),
+    block_members AS (
+        SELECT DISTINCT k.player_id, k.kind, k.key
+        FROM keys k
+        JOIN blocks b ON b.kind = k.kind AND b.key = k.key
+    ),
+    pairs AS (
+        SELECT a.player_id,
+               b.player_id AS duplicate_player_id,
+               array_agg(DISTINCT a.kind ORDER BY a.kind) AS reasons,
+               least(1.0,
+                     :w_phone * max((a.kind = 'phone')::int)
+                     + :w_nickname * max((a.kind = 'nickname')::int)
+                     + :w_surname * max((a.kind = 'surname_birth_year')::int)) AS key_weight
+        FROM block_members a
+        JOIN block_members b
+          ON b.kind = a.kind AND b.key = a.key AND a.player_id < b.player_id
+        GROUP BY a.player_id, b.player_id
+    ),
+    scored AS (
+        SELECT pairs.player_id,
+               pairs.duplicate_player_id,
+               pairs.reasons,
+               similarity(coalesce(pa.full_name, ''), coalesce(pb.full_name, '')) AS name_similarity,
+               pairs.key_weight
+        FROM pairs
+        JOIN players pa ON pa.id = pairs.player_id
+        JOIN players pb ON pb.id = pairs.duplicate_player_id
+    )
+    INSERT INTO player_duplicate_candidates
+        (id, player_id, duplicate_player_id, score, name_similarity, reasons, created_at)
+    SELECT gen_random_uuid(), player_id, duplicate_player_id,
+           0.5 * name_similarity + 0.5 * key_weight,
+           name_similarity, to_json(reasons), now()
+    FROM scored
+    WHERE 0.5 * name_similarity + 0.5 * key_weight >= :min_score
+""")
+
+
+def run_dedupe_job(
+    db: Session,
+    *,
+    max_block_size: Optional[int] = None,
+    min_score: Optional[float] = None,
+) -> Dict[str, int]:
+    """
+    Пересобирает таблицу player_duplicate_candidates.
+
+    Старые пары удаляются и новые записываются в одной транзакции, так что
+    читатели видят либо прошлый, либо новый результат целиком.
+
+    Args:
+        db: сессия базы данных
+        max_block_size: максимальный размер блока (по умолчанию DEDUPE_MAX_BLOCK_SIZE)
+        min_score: минимальная оценка пары (по умолчанию DEDUPE_MIN_SCORE)
+
+    Returns:
+        dict: {"candidates": количество найденных пар}
+    """
+    params = {
+        "max_block_size": max_block_size or settings.DEDUPE_MAX_BLOCK_SIZE,
+        "min_score": settings.DEDUPE_MIN_SCORE if min_score is None else min_score,
+        "min_nickname_length": MIN_NICKNAME_LENGTH,
+        "phone_types": sorted(PHONE_TYPES),
+        "w_phone": BLOCKING_WEIGHTS["phone"],
+        "w_nickname": BLOCKING_WEIGHTS["nickname"],
+        "w_surname": BLOCKING_WEIGHTS["surname_birth_year"],
+    }
+    try:
+        db.execute(text("DELETE FROM player_duplicate_candidates"))
+        result = db.execute(_DEDUPE_SQL, params)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    logger.info(f"Поиск дублей завершен: найдено {result.rowcount} пар")
+    return {"candidates": result.rowcount}
@@ -0,0 +1,253 @@
+"""
+Хранилище файлов доказательств, адресуемое по содержимому.
+
+Тело multipart-запроса разбирается потоково (python-multipart) прямо из
+request.stream(): байты файла сразу хэшируются SHA-256 и пишутся во
+временный файл внутри корня хранилища фрагментами по
+EVIDENCE_UPLOAD_CHUNK_SIZE, без промежуточной буферизации всего тела.
+Запрос с Content-Length больше лимита отклоняется до чтения тела, а
+превышение EVIDENCE_MAX_UPLOAD_SIZE при чтении обрывает копирование.
+Готовый файл переименовывается в <корень>/<aa>/<bb>/<sha256>, поэтому
+одинаковые скриншоты из разных фондов и кейсов хранятся одним файлом.
+
+Файлы неизменяемы и не удаляются вместе с записью CaseEvidence: на один
+файл могут ссылаться несколько доказательств.
+"""
+import hashlib
+import mimetypes
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+
+from app.core.config import settings
+
+DEFAULT_MIME_TYPE = "application/octet-stream"
+
+# Сигнатуры частых форматов доказательств: скриншоты, документы, видео, архивы
+MAGIC_NUMBERS = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+    (b"%PDF-", "application/pdf"),
+    (b"PK\x03\x04", "application/zip"),
+    (b"\x1a\x45\xdf\xa3", "video/webm"),
+)
+
+
+# Запас Content-Length на заголовки частей и текстовые поля формы
+FORM_OVERHEAD_SIZE = 64 * 1024
+# Имя части с файлом
+FILE_FIELD = "file"
+
+
+class EvidenceTooLarge(Exception):
+    """Загрузка превышает EVIDENCE_MAX_UPLOAD_SIZE."""
+
+    def __init__(self, max_size: int) -> None:
+        super().__init__(f"File is larger than {max_size} bytes")
+        self.max_size = max_size
+
+
+class InvalidUpload(ValueError):
+    """Тело запроса - не multipart/form-data или в нем нет файла."""
+
+
+@dataclass
+class StoredBlob:
+    sha256: str
+    size: int
+    mime_type: str
+    # Путь относительно корня хранилища - он и записывается в CaseEvidence.file_path
+    file_path: str
+    # Исходное имя файла и текстовые поля формы
+    file_name: Optional[str] = None
+    fields: Dict[str, str] = field(default_factory=dict)
+
+
+def sniff_mime_type(head: bytes, filename: Optional[str] = None, declared: Optional[str] = None) -> str:
+    """
+    MIME-тип по первым байтам файла, затем по расширению имени, затем заявленный клиентом.
+    """
+    for magic, mime_type in MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return mime_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[4:8] == b"ftyp":
+        return "video/mp4"
+    guessed, _ = mimetypes.guess_type(filename or "")
+    return guessed or declared or DEFAULT_MIME_TYPE
+
+
+class EvidenceStorage:
+    def __init__(
+        self,
+        root: str = settings.EVIDENCE_STORAGE_ROOT,
+        max_size: int = settings.EVIDENCE_MAX_UPLOAD_SIZE,
+        chunk_size: int = settings.EVIDENCE_UPLOAD_CHUNK_SIZE,
+    ) -> None:
+        self.root = Path(root)
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def relative_path(sha256: str) -> str:
+        # Два уровня каталогов, чтобы в одном каталоге не копились сотни тысяч файлов
+        return f"{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+    def path(self, file_path: str) -> Path:
+        """
+        Абсолютный путь файла по значению CaseEvidence.file_path.
+        """
+        return self.root / file_path
+
+    async def receive_upload(
+        self, request: Request, validate_fields: Optional[Callable[[Dict[str, str]], None]] = None
+    ) -> StoredBlob:
+        """
+        Потоково сохраняет файл из multipart-тела запроса.
+
+        Args:
+            request: запрос с multipart/form-data телом
+            validate_fields: проверка текстовых полей формы; вызывается до переноса
+                файла в хранилище, чтобы при ошибке в нем не оставался файл без записи
+
+        Raises:
+            EvidenceTooLarge: если файл больше max_size; временный файл удаляется
+            InvalidUpload: если тело не multipart/form-data, в нем нет части "file"
+                или validate_fields отклонил поля; временный файл удаляется
+        """
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        boundary = params.get(b"boundary")
+        if content_type != b"multipart/form-data" or not boundary:
+            raise InvalidUpload("Expected multipart/form-data body")
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_size + FORM_OVERHEAD_SIZE:
+            raise EvidenceTooLarge(self.max_size)
+
+        tmp_dir = self.root / "tmp"
+        await run_in_threadpool(tmp_dir.mkdir, parents=True, exist_ok=True)
+        # Временный файл в том же разделе, что и хранилище: rename атомарен
+        fd, tmp_name = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                blob = await self._copy_multipart(request, boundary, tmp)
+            if validate_fields is not None:
+                validate_fields(blob.fields)
+            blob.file_path = self.relative_path(blob.sha256)
+            await run_in_threadpool(self._commit, tmp_name, self.path(blob.file_path))
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+        return blob
+
+    async def _copy_multipart(self, request: Request, boundary: bytes, tmp) -> StoredBlob:
+        # Колбэки парсера синхронные: они только копят события, а запись
+        # на диск идет после каждого parser.write, как в starlette
+        events: List[Tuple[str, Any]] = []
+        header: Dict[str, bytes] = {}
+
+        def on_header_field(data: bytes, start: int, end: int) -> None:
+            header["field"] = header.get("field", b"") + data[start:end]
+
+        def on_header_value(data: bytes, start: int, end: int) -> None:
+            header["value"] = header.get("value", b"") + data[start:end]
+
+        def on_header_end() -> None:
+            events.append(("header", (header.pop("field", b"").lower(), header.pop("value", b""))))
+
+        parser = MultipartParser(boundary, callbacks={
+            "on_part_begin": lambda: events.append(("begin", b"")),
+            "on_header_field": on_header_field,
+            "on_header_value": on_header_value,
+            "on_header_end": on_header_end,
+            "on_part_data": lambda data, start, end: events.append(("data", data[start:end])),
+            "on_part_end": lambda: events.append(("end", b"")),
+        })
+
+        digest = hashlib.sha256()
+        size = 0
+        head = b""
+        pending: List[bytes] = []
+        pending_size = 0
+        blob = StoredBlob(sha256="", size=0, mime_type=DEFAULT_MIME_TYPE, file_path="")
+        declared_type: Optional[str] = None
+        file_seen = False
+        part_name: Optional[str] = None
+        in_file = False
+        field_value = b""
+
+        async def flush() -> None:
+            nonlocal pending, pending_size
+            if pending:
+                await run_in_threadpool(tmp.write, b"".join(pending))
+                pending, pending_size = [], 0
+
+        async def process() -> None:
+            nonlocal size, head, pending_size, declared_type, file_seen, part_name, in_file, field_value
+            for kind, data in events:
+                if kind == "begin":
+                    part_name, in_file, field_value, declared_type = None, False, b"", None
+                elif kind == "header":
+                    name, value = data
+                    if name == b"content-disposition":
+                        _, options = parse_options_header(value)
+                        part_name = options.get(b"name", b"").decode("utf-8", "replace")
+                        if part_name == FILE_FIELD and b"filename" in options and not file_seen:
+                            in_file = file_seen = True
+                            blob.file_name = options[b"filename"].decode("utf-8", "replace")
+                    elif name == b"content-type":
+                        declared_type = value.decode("latin-1").split(";")[0].strip() or None
+                elif kind == "data" and in_file:
+                    size += len(data)
+                    if size > self.max_size:
+                        raise EvidenceTooLarge(self.max_size)
+                    if len(head) < 16:
+                        head += data[:16 - len(head)]
+                    digest.update(data)
+                    pending.append(data)
+                    pending_size += len(data)
+                    if pending_size >= self.chunk_size:
+                        await flush()
+                elif kind == "data" and part_name:
+                    field_value += data
+                    if len(field_value) > FORM_OVERHEAD_SIZE:
+                        raise InvalidUpload(f"Form field {part_name} is too long")
+                elif kind == "end" and part_name and not in_file:
+                    blob.fields[part_name] = field_value.decode("utf-8", "replace")
+                elif kind == "end" and in_file:
+                    blob.mime_type = sniff_mime_type(head, blob.file_name, declared_type)
+            events.clear()
+
+        async for chunk in request.stream():
+            parser.write(chunk)
+            await process()
+        parser.finalize()
+        await process()
+        await flush()
+
+        if not file_seen:
+            raise InvalidUpload("File part is required")
+        blob.sha256 = digest.hexdigest()
+        blob.size = size
+        return blob
+
+    @staticmethod
+    def _commit(tmp_name: str, target: Path) -> None:
+        # Такой файл уже есть - дубль, временный файл удалит receive_upload
+        if target.exists():
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, target)
+
+
+evidence_storage = EvidenceStorage()
@@ -0,0 +1,169 @@
+"""
+Потоковая выгрузка игроков и кейсов в NDJSON/CSV.
+
+Строки читаются серверным курсором (yield_per) и сразу сериализуются,
+поэтому потребление памяти не зависит от объема выгрузки.
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.crud.crud_player import (
+    PLAYER_CHILD_SUMMARY_FIELDS, PLAYER_FIELDS, PLAYER_SUMMARY_FIELDS, serialize_player
+)
+from app.models.case import Case
+from app.models.player import Player
+
+# Размер пачки серверного курсора
+EXPORT_BATCH_SIZE = 1000
+# Сколько байт копить перед отправкой очередного фрагмента клиенту
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+CASE_EXPORT_FIELDS = (
+    "id", "title", "description", "status",
+    "arbitrage_type", "arbitrage_amount", "arbitrage_currency",
+    "player_id", "player_full_name",
+    "created_by_fund_id", "fund_name",
+    "created_by_user_id", "closed_by_user_id", "closed_at",
+    "created_at", "updated_at",
+)
+
+# В CSV дочерние коллекции игрока сворачиваются в одну ячейку
+PLAYER_CSV_COLLECTIONS = {
+    "nicknames": ("room", "nickname"),
+    "contacts": ("type", "value"),
+    "payment_methods": ("type", "value"),
+    "social_media": ("type", "value"),
+    "locations": ("country", "city"),
+}
+PLAYER_CSV_FIELDS = PLAYER_FIELDS + PLAYER_SUMMARY_FIELDS + tuple(PLAYER_CSV_COLLECTIONS)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=_json_default)
+    return value
+
+
+def iter_players(db: Session) -> Iterator[Dict[str, Any]]:
+    """
+    Игроки с дочерними коллекциями в порядке (created_at, id).
+
+    selectinload дочерних таблиц выполняется для каждой пачки yield_per отдельно.
+    """
+    fieldset = (PLAYER_FIELDS, PLAYER_CHILD_SUMMARY_FIELDS)
+    query = (
+        crud.player.with_details(db.query(Player), fieldset)
+        .order_by(Player.created_at, Player.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    for player in query:
+        yield serialize_player(player, fieldset)
+
+
+def iter_cases(db: Session) -> Iterator[Dict[str, Any]]:
+    """
+    Кейсы вместе с именем игрока и названием фонда, без загрузки ORM-объектов.
+    """
+    query = (
+        crud.case.denormalized_query(db)
+        .order_by(Case.created_at, Case.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    for row in query:
+        yield row._asdict()
+
+
+def flatten_player(player: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Сворачивает коллекции игрока в строки вида "room:nickname; room:nickname" для CSV.
+    """
+    row = {field: player.get(field) for field in PLAYER_FIELDS}
+    summary = player.get("summary") or {}
+    row.update({field: summary.get(field) for field in PLAYER_SUMMARY_FIELDS})
+    for collection, columns in PLAYER_CSV_COLLECTIONS.items():
+        row[collection] = "; ".join(
+            ":".join(str(item.get(column) or "") for column in columns)
+            for item in player.get(collection, [])
+        )
+    return row
+
+
+def ndjson_lines(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False, default=_json_default) + "\n"
+
+
+def csv_lines(rows: Iterable[Dict[str, Any]], columns: Sequence[str]) -> Iterator[str]:
+    """
+    CSV построчно: каждая строка пишется во временный буфер и сразу отдается.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def take() -> str:
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return value
+
+    writer.writerow(columns)
+    yield take()
+    for row in rows:
+        writer.writerow([_csv_value(row.get(column)) for column in columns])
+        yield take()
+
+
+def encode_chunks(lines: Iterable[str], compress: bool = False) -> Iterator[bytes]:
+    """
+    Склеивает строки во фрагменты по EXPORT_CHUNK_SIZE байт и при необходимости
+    сжимает их потоково в gzip.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+    pending: List[bytes] = []
+    size = 0
+    for line in lines:
+        data = line.encode("utf-8")
+        pending.append(data)
+        size += len(data)
+        if size < EXPORT_CHUNK_SIZE:
+            continue
+        chunk = b"".join(pending)
+        pending, size = [], 0
+        if compressor is not None:
+            chunk = compressor.compress(chunk)
+        if chunk:
+            yield chunk
+
+    chunk = b"".join(pending)
+    if compressor is not None:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
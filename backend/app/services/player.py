@@ -3,11 +3,9 @@ from uuid import UUID
 from datetime import datetime
 import asyncio
 
-from sqlalchemy import func
 from sqlalchemy.orm import Session, joinedload
 
-from app.models.player import Player, PlayerContact, PlayerLocation, PlayerNickname
-from app.models.case import Case
+from app.models.player import Player, PlayerContact, PlayerLocation, PlayerNickname, PlayerSummary
 from app.schemas.player import PlayerCreate, PlayerUpdate
 from app.services import audit
 from app.services.search import search_service
@@ -159,12 +157,18 @@ def update(
 
 
 def get_cases_count(db: Session, player_id: UUID) -> int:
-    return db.query(func.count(Case.id)).filter(Case.player_id == player_id).scalar()
+    # Показатели по кейсам поддерживаются в player_summary
+    cases_count = (
+        db.query(PlayerSummary.cases_count)
+        .filter(PlayerSummary.player_id == player_id)
+        .scalar()
+    )
+    return cases_count or 0
 
 
 def get_latest_case_date(db: Session, player_id: UUID) -> Optional[datetime]:
     return (
-        db.query(func.max(Case.created_at))
-        .filter(Case.player_id == player_id)
+        db.query(PlayerSummary.latest_case_date)
+        .filter(PlayerSummary.player_id == player_id)
         .scalar()
-    ) 
\ No newline at end of file
+    )
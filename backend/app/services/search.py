@@ -1,18 +1,26 @@
-from typing import List, Optional, Dict
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from uuid import UUID
 
 from elasticsearch import AsyncElasticsearch
 from sqlalchemy.orm import Session
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
 
 from app.core.config import settings
+from app.crud.crud_case import case as crud_case
+from app.db.session import SessionLocal
 from app.models.player import Player
+from app.schemas.case import CaseSearchResult
 from app.schemas.player import PlayerSearchResult
 
+logger = logging.getLogger(__name__)
+
 
 class SearchService:
     def __init__(self):
         self.es = AsyncElasticsearch([settings.ELASTICSEARCH_URL])
         self.index_name = "players"
+        self.cases_index_name = "cases"
         
         # Словарь для соответствия между формальными именами и их уменьшительными формами
         self.name_variants: Dict[str, List[str]] = {
@@ -46,56 +54,60 @@ class SearchService:
             for variant in variants:
                 self.reversed_name_variants[variant] = formal
     
+    def _index_settings(self) -> dict:
+        """Analyzers shared by the players and cases indexes."""
+        return {
+            "analysis": {
+                "analyzer": {
+                    "russian_analyzer": {
+                        "type": "custom",
+                        "tokenizer": "standard",
+                        "filter": [
+                            "lowercase",
+                            "russian_stop",
+                            "russian_stemmer",
+                            "edge_ngram_filter",
+                            "russian_name_synonyms"
+                        ]
+                    },
+                    "ngram_analyzer": {
+                        "type": "custom",
+                        "tokenizer": "standard",
+                        "filter": [
+                            "lowercase",
+                            "edge_ngram_filter"
+                        ]
+                    }
+                },
+                "filter": {
+                    "russian_stop": {
+                        "type": "stop",
+                        "stopwords": "_russian_"
+                    },
+                    "russian_stemmer": {
+                        "type": "stemmer",
+                        "language": "russian"
+                    },
+                    "edge_ngram_filter": {
+                        "type": "edge_ngram",
+                        "min_gram": 2,
+                        "max_gram": 20
+                    },
+                    "russian_name_synonyms": {
+                        "type": "synonym",
+                        "synonyms": self._generate_name_synonyms()
+                    }
+                }
+            }
+        }
+
     async def create_index(self) -> None:
-        """Create the Elasticsearch index if it doesn't exist."""
+        """Create the Elasticsearch indexes if they don't exist."""
         if not await self.es.indices.exists(index="players"):
             await self.es.indices.create(
                 index="players",
                 body={
-                    "settings": {
-                        "analysis": {
-                            "analyzer": {
-                                "russian_analyzer": {
-                                    "type": "custom",
-                                    "tokenizer": "standard",
-                                    "filter": [
-                                        "lowercase",
-                                        "russian_stop",
-                                        "russian_stemmer",
-                                        "edge_ngram_filter",
-                                        "russian_name_synonyms"
-                                    ]
-                                },
-                                "ngram_analyzer": {
-                                    "type": "custom",
-                                    "tokenizer": "standard",
-                                    "filter": [
-                                        "lowercase",
-                                        "edge_ngram_filter"
-                                    ]
-                                }
-                            },
-                            "filter": {
-                                "russian_stop": {
-                                    "type": "stop",
-                                    "stopwords": "_russian_"
-                                },
-                                "russian_stemmer": {
-                                    "type": "stemmer",
-                                    "language": "russian"
-                                },
-                                "edge_ngram_filter": {
-                                    "type": "edge_ngram",
-                                    "min_gram": 2,
-                                    "max_gram": 20
-                                },
-                                "russian_name_synonyms": {
-                                    "type": "synonym",
-                                    "synonyms": self._generate_name_synonyms()
-                                }
-                            }
-                        }
-                    },
+                    "settings": self._index_settings(),
                     "mappings": {
                         "properties": {
                             "full_name": {
@@ -149,6 +161,7 @@ class SearchService:
                                 "country": {"type": "keyword"},
                                 "city": {"type": "text", "fields": {"raw": {"type": "keyword"}}}
                             }},
+                            "cluster_id": {"type": "keyword"},
                             "cases_count": {"type": "integer"},
                             "open_cases_count": {"type": "integer"},
                             "latest_case_date": {"type": "date"},
@@ -159,6 +172,45 @@ class SearchService:
                     }
                 }
             )
+        if not await self.es.indices.exists(index=self.cases_index_name):
+            await self.es.indices.create(
+                index=self.cases_index_name,
+                body={
+                    "settings": self._index_settings(),
+                    "mappings": {
+                        "properties": {
+                            "id": {"type": "keyword"},
+                            "title": {
+                                "type": "text",
+                                "analyzer": "russian_analyzer",
+                                "fields": {
+                                    "raw": {"type": "keyword"},
+                                    "ngram": {"type": "text", "analyzer": "ngram_analyzer"}
+                                }
+                            },
+                            "description": {"type": "text", "analyzer": "russian_analyzer"},
+                            "status": {"type": "keyword"},
+                            "arbitrage_type": {"type": "text", "analyzer": "russian_analyzer"},
+                            "arbitrage_amount": {"type": "double"},
+                            "arbitrage_currency": {"type": "keyword"},
+                            "player_id": {"type": "keyword"},
+                            "player_name": {
+                                "type": "text",
+                                "analyzer": "russian_analyzer",
+                                "fields": {
+                                    "raw": {"type": "keyword"},
+                                    "ngram": {"type": "text", "analyzer": "ngram_analyzer"}
+                                }
+                            },
+                            "fund_id": {"type": "keyword"},
+                            "fund_name": {"type": "text", "fields": {"raw": {"type": "keyword"}}},
+                            "closed_at": {"type": "date"},
+                            "created_at": {"type": "date"},
+                            "updated_at": {"type": "date"}
+                        }
+                    }
+                }
+            )
     
     def _generate_name_synonyms(self) -> List[str]:
         """Generates synonym strings for Russian names in Elasticsearch format."""
@@ -188,10 +240,14 @@ class SearchService:
             last_name = name_parts[1] if len(name_parts) > 1 else ""
             middle_name = name_parts[2] if len(name_parts) > 2 else ""
             
-            # Безопасное получение количества кейсов
+            # Показатели по кейсам берем из player_summary, без обхода player.cases
             cases_count = 0
             latest_case_date = None
-            if hasattr(player, 'cases') and player.cases:
+            summary = getattr(player, 'summary', None)
+            if summary is not None:
+                cases_count = summary.cases_count
+                latest_case_date = summary.latest_case_date
+            elif hasattr(player, 'cases') and player.cases:
                 cases_count = len(player.cases)
                 # Безопасное получение максимальной даты кейса
                 if cases_count > 0:
@@ -201,13 +257,16 @@ class SearchService:
             
             # Безопасное получение имени фонда
             fund_name = ""
-            if hasattr(player, 'created_by_fund') and player.created_by_fund:
+            if summary is not None and summary.fund_name:
+                fund_name = summary.fund_name
+            elif hasattr(player, 'created_by_fund') and player.created_by_fund:
                 if hasattr(player.created_by_fund, 'name'):
                     fund_name = player.created_by_fund.name
             
             # Подготовка документа для индексации
             document = {
                 "id": str(player.id),
+                "cluster_id": str(player.cluster_id) if player.cluster_id else None,
                 "full_name": player.full_name or "",
                 "first_name": first_name,
                 "last_name": last_name,
@@ -256,7 +315,7 @@ class SearchService:
             )
         except Exception as e:
             # Логируем ошибку и перебрасываем исключение для обработки на уровне выше
-            print(f"Ошибка при индексации игрока {player.id}: {str(e)}")
+            logger.error("Ошибка при индексации игрока %s: %s", player.id, e)
             raise
     
     def _normalize_query(self, query: str) -> str:
@@ -288,211 +347,395 @@ class SearchService:
         # Если ничего не найдено, возвращаем исходный запрос
         return query
 
-    async def search_players(
+    def _players_query_body(
         self,
         query: str,
         room: Optional[str] = None,
         discipline: Optional[str] = None,
         skip: int = 0,
-        limit: int = 10
-    ) -> List[PlayerSearchResult]:
-        """Search for players in Elasticsearch."""
-        try:
-            must_conditions = []
-            
-            # Нормализуем запрос
-            normalized_query = self._normalize_query(query)
-            
-            # Проверяем, не является ли запрос именем или его вариантом
-            is_name_query = False
-            original_query = query
-            query_lower = query.lower()
+        limit: int = 10,
+        cluster_id: Optional[UUID] = None
+    ) -> dict:
+        """Query body for the players index."""
+        must_conditions = []
+        
+        # Нормализуем запрос
+        normalized_query = self._normalize_query(query)
+        
+        # Проверяем, не является ли запрос именем или его вариантом
+        is_name_query = False
+        original_query = query
+        query_lower = query.lower()
+        
+        # Ищем, является ли запрос именем или его вариантом
+        for formal_name, variants in self.name_variants.items():
+            if query_lower == formal_name or query_lower in variants:
+                is_name_query = True
+                # Используем формальное имя для более точного поиска
+                if query_lower in variants:
+                    query = formal_name
+                break
+        
+        # Добавляем основной поисковый запрос с поддержкой неточного поиска
+        if query:
+            search_fields = [
+                "full_name^4", "full_name.ngram^3",
+                "first_name^3", "first_name.ngram^2.5",
+                "last_name^3", "last_name.ngram^2.5",
+                "nicknames.nickname^2", "nicknames.nickname.ngram^1.5",
+                "description", "contacts.value", "locations.city"
+            ]
             
-            # Ищем, является ли запрос именем или его вариантом
-            for formal_name, variants in self.name_variants.items():
-                if query_lower == formal_name or query_lower in variants:
-                    is_name_query = True
-                    # Используем формальное имя для более точного поиска
-                    if query_lower in variants:
-                        query = formal_name
-                    break
+            # Добавляем основное условие поиска
+            must_conditions.append({
+                "multi_match": {
+                    "query": query,
+                    "fields": search_fields,
+                    "type": "best_fields",
+                    "fuzziness": "AUTO",
+                    "prefix_length": 1,
+                    "boost": 2.0
+                }
+            })
             
-            # Добавляем основной поисковый запрос с поддержкой неточного поиска
-            if query:
-                search_fields = [
-                    "full_name^4", "full_name.ngram^3",
-                    "first_name^3", "first_name.ngram^2.5",
-                    "last_name^3", "last_name.ngram^2.5",
-                    "nicknames.nickname^2", "nicknames.nickname.ngram^1.5",
-                    "description", "contacts.value", "locations.city"
-                ]
-                
-                # Добавляем основное условие поиска
+            # Если это поиск по имени, добавляем более специфичные условия
+            if is_name_query:
                 must_conditions.append({
-                    "multi_match": {
-                        "query": query,
-                        "fields": search_fields,
-                        "type": "best_fields",
-                        "fuzziness": "AUTO",
-                        "prefix_length": 1,
+                    "bool": {
+                        "should": [
+                            {"match": {"first_name": {"query": query, "boost": 3.0}}},
+                            {"match_phrase": {"full_name": {"query": query, "boost": 2.5}}}
+                        ],
                         "boost": 2.0
                     }
                 })
-                
-                # Если это поиск по имени, добавляем более специфичные условия
-                if is_name_query:
-                    must_conditions.append({
-                        "bool": {
-                            "should": [
-                                {"match": {"first_name": {"query": query, "boost": 3.0}}},
-                                {"match_phrase": {"full_name": {"query": query, "boost": 2.5}}}
-                            ],
-                            "boost": 2.0
-                        }
-                    })
-                
-                # Добавляем поиск по префиксу (для случаев, когда вводят начало имени)
-                must_conditions.append({
-                    "bool": {
-                        "should": [
-                            {
-                                "prefix": {
-                                    "full_name": {
-                                        "value": query_lower,
-                                        "boost": 1.5
-                                    }
+            
+            # Добавляем поиск по префиксу (для случаев, когда вводят начало имени)
+            must_conditions.append({
+                "bool": {
+                    "should": [
+                        {
+                            "prefix": {
+                                "full_name": {
+                                    "value": query_lower,
+                                    "boost": 1.5
                                 }
-                            },
-                            {
-                                "prefix": {
-                                    "first_name": {
-                                        "value": query_lower,
-                                        "boost": 1.5
-                                    }
+                            }
+                        },
+                        {
+                            "prefix": {
+                                "first_name": {
+                                    "value": query_lower,
+                                    "boost": 1.5
                                 }
-                            },
-                            {
-                                "match_phrase_prefix": {
-                                    "full_name.ngram": {
-                                        "query": query_lower,
-                                        "boost": 1.3
-                                    }
+                            }
+                        },
+                        {
+                            "match_phrase_prefix": {
+                                "full_name.ngram": {
+                                    "query": query_lower,
+                                    "boost": 1.3
                                 }
-                            },
-                            {
-                                "match_phrase_prefix": {
-                                    "first_name.ngram": {
-                                        "query": query_lower,
-                                        "boost": 1.3
-                                    }
+                            }
+                        },
+                        {
+                            "match_phrase_prefix": {
+                                "first_name.ngram": {
+                                    "query": query_lower,
+                                    "boost": 1.3
                                 }
-                            },
-                            {
-                                "nested": {
-                                    "path": "nicknames",
-                                    "query": {
-                                        "match_phrase_prefix": {
-                                            "nicknames.nickname.ngram": {
-                                                "query": query_lower,
-                                                "boost": 1.0
-                                            }
+                            }
+                        },
+                        {
+                            "nested": {
+                                "path": "nicknames",
+                                "query": {
+                                    "match_phrase_prefix": {
+                                        "nicknames.nickname.ngram": {
+                                            "query": query_lower,
+                                            "boost": 1.0
                                         }
                                     }
                                 }
                             }
-                        ],
-                        "minimum_should_match": 1,
-                        "boost": 1.5
-                    }
-                })
-                
-                # Если была найдена нормализованная форма запроса, добавляем её как отдельное условие
-                if normalized_query != query:
-                    must_conditions.append({
-                        "multi_match": {
-                            "query": normalized_query,
-                            "fields": search_fields,
-                            "type": "best_fields",
-                            "fuzziness": "AUTO",
-                            "prefix_length": 1,
-                            "boost": 1.5
                         }
-                    })
+                    ],
+                    "minimum_should_match": 1,
+                    "boost": 1.5
+                }
+            })
             
-            if room:
+            # Если была найдена нормализованная форма запроса, добавляем её как отдельное условие
+            if normalized_query != query:
                 must_conditions.append({
-                    "nested": {
-                        "path": "nicknames",
-                        "query": {
-                            "term": {"nicknames.room": room}
-                        }
+                    "multi_match": {
+                        "query": normalized_query,
+                        "fields": search_fields,
+                        "type": "best_fields",
+                        "fuzziness": "AUTO",
+                        "prefix_length": 1,
+                        "boost": 1.5
                     }
                 })
-            
-            if discipline:
-                must_conditions.append({
-                    "nested": {
-                        "path": "nicknames",
-                        "query": {
-                            "term": {"nicknames.discipline": discipline}
-                        }
+        
+        if room:
+            must_conditions.append({
+                "nested": {
+                    "path": "nicknames",
+                    "query": {
+                        "term": {"nicknames.room": room}
                     }
-                })
-            
-            # Строим запрос с условием "или" для всех условий
-            query_body = {
-                "query": {
-                    "bool": {
-                        "should": must_conditions,
-                        "minimum_should_match": 1
+                }
+            })
+        
+        if discipline:
+            must_conditions.append({
+                "nested": {
+                    "path": "nicknames",
+                    "query": {
+                        "term": {"nicknames.discipline": discipline}
                     }
-                },
-                "sort": [
-                    {"_score": {"order": "desc"}}
-                ],
-                "from": skip,
-                "size": limit
-            }
-            
-            print(f"Elasticsearch query: {query_body}")
+                }
+            })
+        
+        # Строим запрос с условием "или" для всех условий
+        query_body = {
+            "query": {
+                "bool": {
+                    "should": must_conditions,
+                    "minimum_should_match": 1
+                }
+            },
+            "sort": [
+                {"_score": {"order": "desc"}}
+            ],
+            "from": skip,
+            "size": limit,
+            "track_total_hits": True
+        }
+        
+        # Кластер связанных записей - жесткий фильтр, не влияющий на релевантность
+        if cluster_id:
+            query_body["query"]["bool"]["filter"] = [
+                {"term": {"cluster_id": str(cluster_id)}}
+            ]
+        return query_body
+
+    def _player_results(self, hits: List[dict]) -> List[PlayerSearchResult]:
+        """Convert players index hits to schema objects."""
+        # Convert results to schema objects
+        results = []
+        for hit in hits:
+            source = hit["_source"]
+            results.append(
+                PlayerSearchResult(
+                    id=UUID(source["id"]),
+                    cluster_id=UUID(source["cluster_id"]) if source.get("cluster_id") else None,
+                    full_name=source["full_name"],
+                    first_name=source.get("first_name", ""),
+                    last_name=source.get("last_name", None),
+                    middle_name=source.get("middle_name", None),
+                    description=source.get("description", None),
+                    nicknames=source.get("nicknames", []),
+                    cases_count=source.get("cases_count", 0),
+                    latest_case_date=source.get("latest_case_date"),
+                    fund_name=source.get("fund_name", ""),
+                    contacts=source.get("contacts_display", []),
+                    locations=source.get("locations_display", [])
+                )
+            )
+        
+        return results
+
+    async def search_players(
+        self,
+        query: str,
+        room: Optional[str] = None,
+        discipline: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 10,
+        cluster_id: Optional[UUID] = None
+    ) -> List[PlayerSearchResult]:
+        """Search for players in Elasticsearch."""
+        try:
+            query_body = self._players_query_body(query, room, discipline, skip, limit, cluster_id)
+            logger.debug("Elasticsearch query: %s", query_body)
             
             # Execute the search
             response = await self.es.search(
                 index=self.index_name,
                 body=query_body
             )
-            
-            # Convert results to schema objects
-            results = []
-            for hit in response["hits"]["hits"]:
-                source = hit["_source"]
-                results.append(
-                    PlayerSearchResult(
-                        id=UUID(source["id"]),
-                        full_name=source["full_name"],
-                        first_name=source.get("first_name", ""),
-                        last_name=source.get("last_name", None),
-                        middle_name=source.get("middle_name", None),
-                        description=source.get("description", None),
-                        nicknames=source.get("nicknames", []),
-                        cases_count=source.get("cases_count", 0),
-                        latest_case_date=source.get("latest_case_date"),
-                        fund_name=source.get("fund_name", ""),
-                        contacts=source.get("contacts_display", []),
-                        locations=source.get("locations_display", [])
-                    )
-                )
-            
-            return results
+            return self._player_results(response["hits"]["hits"])
         except Exception as e:
             # Логируем ошибку и перебрасываем исключение для обработки на уровне выше
-            print(f"Ошибка при поиске игроков: {str(e)}")
+            logger.error("Ошибка при поиске игроков: %s", e)
             raise
     
+    def case_document(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Документ индекса cases из строки CRUDCase.denormalized_query.
+        """
+        def iso(value):
+            return value.isoformat() if value else None
+
+        return {
+            "id": str(row["id"]),
+            "title": row["title"],
+            "description": row["description"] or "",
+            "status": row["status"],
+            "arbitrage_type": row["arbitrage_type"] or "",
+            "arbitrage_amount": row["arbitrage_amount"],
+            "arbitrage_currency": row["arbitrage_currency"],
+            "player_id": str(row["player_id"]) if row["player_id"] else None,
+            "player_name": row["player_full_name"] or "",
+            "fund_id": str(row["created_by_fund_id"]) if row["created_by_fund_id"] else None,
+            "fund_name": row["fund_name"] or "",
+            "closed_at": iso(row["closed_at"]),
+            "created_at": iso(row["created_at"]),
+            "updated_at": iso(row["updated_at"]),
+        }
+
+    async def index_case(self, row: Dict[str, Any]) -> None:
+        """Index (or reindex) one case in Elasticsearch."""
+        await self.es.index(
+            index=self.cases_index_name,
+            id=str(row["id"]),
+            document=self.case_document(row)
+        )
+
+    async def delete_case(self, case_id: UUID) -> None:
+        """Remove a case from the index; a missing document is not an error."""
+        await self.es.options(ignore_status=404).delete(
+            index=self.cases_index_name, id=str(case_id)
+        )
+
+    async def bulk_index_cases(self, rows: Iterable[Dict[str, Any]]) -> Tuple[int, int]:
+        """
+        Index cases with one _bulk request.
+
+        Returns:
+            tuple: (indexed, failed)
+        """
+        operations = []
+        for row in rows:
+            operations.append({"index": {"_index": self.cases_index_name, "_id": str(row["id"])}})
+            operations.append(self.case_document(row))
+        if not operations:
+            return 0, 0
+        response = await self.es.bulk(operations=operations)
+        failed = sum(1 for item in response["items"] if item["index"].get("error"))
+        return len(operations) // 2 - failed, failed
+
+    def _cases_query_body(self, query: str, skip: int = 0, limit: int = 10) -> dict:
+        """Query body for the cases index."""
+        return {
+            "query": {
+                "bool": {
+                    "should": [
+                        {
+                            "multi_match": {
+                                "query": query,
+                                "fields": [
+                                    "title^3", "title.ngram^2",
+                                    "player_name^2.5", "player_name.ngram^2",
+                                    "description", "arbitrage_type", "fund_name"
+                                ],
+                                "type": "best_fields",
+                                "fuzziness": "AUTO",
+                                "prefix_length": 1
+                            }
+                        },
+                        {"match_phrase": {"title": {"query": query, "boost": 2.0}}}
+                    ],
+                    "minimum_should_match": 1
+                }
+            },
+            "sort": [
+                {"_score": {"order": "desc"}},
+                {"created_at": {"order": "desc"}}
+            ],
+            "from": skip,
+            "size": limit,
+            "track_total_hits": True
+        }
+
+    def _case_results(self, hits: List[dict]) -> List[CaseSearchResult]:
+        """Convert cases index hits to schema objects."""
+        return [CaseSearchResult(**hit["_source"]) for hit in hits]
+
+    async def search_all(
+        self,
+        query: str,
+        room: Optional[str] = None,
+        discipline: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 10,
+        cluster_id: Optional[UUID] = None
+    ) -> Dict[str, Any]:
+        """
+        Search players and cases in one msearch round trip.
+
+        Totals come from hits.total of each index. A missing cases index
+        (not created or not populated yet) yields an empty cases part instead
+        of failing the players part.
+        """
+        response = await self.es.msearch(
+            searches=[
+                {"index": self.index_name},
+                self._players_query_body(query, room, discipline, skip, limit, cluster_id),
+                {"index": self.cases_index_name, "ignore_unavailable": True},
+                self._cases_query_body(query, skip, limit),
+            ]
+        )
+        players_response, cases_response = response["responses"]
+        if "error" in players_response:
+            raise RuntimeError(str(players_response["error"]))
+
+        cases, total_cases = [], 0
+        if "error" in cases_response:
+            logger.warning("Ошибка при поиске кейсов: %s", cases_response["error"])
+        else:
+            cases = self._case_results(cases_response["hits"]["hits"])
+            total_cases = cases_response["hits"]["total"]["value"]
+
+        return {
+            "players": self._player_results(players_response["hits"]["hits"]),
+            "total_players": players_response["hits"]["total"]["value"],
+            "cases": cases,
+            "total_cases": total_cases,
+        }
+
     async def close(self) -> None:
         """Close the Elasticsearch connection."""
         await self.es.close()
 
 
 # Global instance
-search_service = SearchService() 
\ No newline at end of file
+search_service = SearchService()
+
+# Документов в одном запросе _bulk при переиндексации кейсов игрока или фонда
+CASE_REINDEX_BATCH_SIZE = 500
+
+
+async def reindex_cases_in_background(
+    *, player_id: Optional[UUID] = None, fund_id: Optional[UUID] = None
+) -> None:
+    """
+    Переиндексирует кейсы игрока или фонда после смены его имени.
+
+    В документах индекса cases имя игрока и название фонда денормализованы,
+    поэтому без переиндексации поиск находил бы кейсы по старому имени.
+    Ошибки ES логируются и не влияют на запрос.
+    """
+    db = SessionLocal()
+    try:
+        batches = crud_case.iter_denormalized_batches(
+            db, batch_size=CASE_REINDEX_BATCH_SIZE, player_id=player_id, fund_id=fund_id
+        )
+        async for batch in iterate_in_threadpool(batches):
+            await search_service.bulk_index_cases(batch)
+    except Exception as e:
+        logger.error("Ошибка переиндексации кейсов (player_id=%s, fund_id=%s): %s", player_id, fund_id, e)
+    finally:
+        await run_in_threadpool(db.close)
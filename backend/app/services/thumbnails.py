@@ -0,0 +1,219 @@
+"""
+Уменьшенные копии изображений-доказательств: миниатюра и превью.
+
+Pillow декодирует и масштабирует изображение с заметной нагрузкой на CPU,
+поэтому работа идет в отдельных процессах (ProcessPoolExecutor на
+THUMBNAIL_WORKERS процессов) и после ответа клиенту. Очередь ограничена
+THUMBNAIL_MAX_PENDING заданиями: при переполнении задание пропускается и
+будет выполнено скриптом scripts/generate_evidence_thumbnails.py.
+
+Производные лежат рядом с оригиналом: <aa>/<bb>/<sha256>.<вариант>.webp.
+Оригинал адресуется по содержимому, поэтому одна пара производных служит
+всем доказательствам с тем же sha256.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.case import CaseEvidence
+from app.services.evidence_storage import evidence_storage
+
+logger = logging.getLogger(__name__)
+
+# Вариант -> наибольшая сторона в пикселях
+THUMBNAIL_VARIANTS: Dict[str, int] = {
+    "thumb": 256,
+    "preview": 1280,
+}
+DERIVATIVE_MIME_TYPE = "image/webp"
+
+# Форматы, которые Pillow читает и которые стоит уменьшать
+IMAGE_MIME_TYPES = ("image/png", "image/jpeg", "image/gif", "image/webp", "image/bmp")
+
+# Защита от "бомб распаковки": больше пикселей воркер не декодирует
+MAX_IMAGE_PIXELS = 100_000_000
+
+
+def derivative_path(file_path: str, variant: str) -> str:
+    """
+    Путь производной относительно корня хранилища по CaseEvidence.file_path оригинала.
+    """
+    return f"{file_path}.{variant}.webp"
+
+
+def render_derivatives(source: str) -> List[str]:
+    """
+    Создает все варианты THUMBNAIL_VARIANTS рядом с файлом source.
+
+    Выполняется в процессе пула, поэтому принимает и возвращает только строки.
+    Уже существующие производные не пересоздаются.
+
+    Returns:
+        list: созданные или уже существовавшие варианты
+    """
+    from PIL import Image, ImageOps
+
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    targets = {
+        variant: Path(f"{source}.{variant}.webp")
+        for variant in THUMBNAIL_VARIANTS
+    }
+    missing = {variant: path for variant, path in targets.items() if not path.exists()}
+    if missing:
+        with Image.open(source) as image:
+            # JPEG сразу декодируется в уменьшенном масштабе
+            image.draft("RGB", (max(THUMBNAIL_VARIANTS.values()),) * 2)
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ("RGB", "RGBA"):
+                has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+                image = image.convert("RGBA" if has_alpha else "RGB")
+            for variant, path in missing.items():
+                size = THUMBNAIL_VARIANTS[variant]
+                derivative = image.copy()
+                derivative.thumbnail((size, size), Image.LANCZOS)
+                tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                derivative.save(tmp, "WEBP", quality=80, method=4)
+                os.replace(tmp, path)
+    return list(targets)
+
+
+class ThumbnailPool:
+    """
+    Ограниченный пул процессов для render_derivatives.
+
+    Пул создается при первом задании; процессы запускаются через spawn,
+    чтобы не копировать потоки и соединения воркера uvicorn.
+    """
+
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def submit(self, source: str) -> Optional[Future]:
+        """
+        Ставит файл в очередь; None, если очередь заполнена.
+        """
+        if not self._slots.acquire(blocking=False):
+            return None
+        try:
+            future = self._get_executor().submit(render_derivatives, source)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+thumbnail_pool = ThumbnailPool(settings.THUMBNAIL_WORKERS, settings.THUMBNAIL_MAX_PENDING)
+
+
+def needs_derivatives(mime_type: Optional[str]) -> bool:
+    return mime_type in IMAGE_MIME_TYPES
+
+
+def mark_derivatives_ready(db: Session, *, sha256: str) -> int:
+    """
+    Отмечает производные готовыми у всех доказательств с этим файлом.
+
+    Returns:
+        int: количество обновленных записей
+    """
+    updated = (
+        db.query(CaseEvidence)
+        .filter(CaseEvidence.sha256 == sha256, CaseEvidence.derivatives_generated_at.is_(None))
+        .update({CaseEvidence.derivatives_generated_at: datetime.now(timezone.utc)}, synchronize_session=False)
+    )
+    db.commit()
+    return updated
+
+
+async def generate_derivatives(source: Path) -> bool:
+    """
+    Создает производные в пуле процессов, не блокируя цикл событий.
+
+    Returns:
+        bool: True, если производные готовы; False, если очередь заполнена
+    """
+    future = thumbnail_pool.submit(str(source))
+    if future is None:
+        logger.warning(f"Очередь миниатюр заполнена, {source} будет обработан при бэкфилле")
+        return False
+    await asyncio.wrap_future(future)
+    return True
+
+
+def backfill_derivatives(db: Session, *, workers: Optional[int] = None) -> Dict[str, int]:
+    """
+    Создает производные для изображений, загруженных до появления конвейера
+    или пропущенных из-за переполненной очереди.
+
+    Каждый файл обрабатывается один раз, сколько бы доказательств на него ни
+    ссылалось; в пуле одновременно не больше 4 заданий на процесс.
+
+    Returns:
+        dict: {"files": обработано файлов, "evidences": отмечено записей, "failed": ошибок}
+    """
+    workers = workers or settings.THUMBNAIL_WORKERS
+    rows = (
+        db.query(CaseEvidence.sha256, CaseEvidence.file_path)
+        .filter(
+            CaseEvidence.sha256.isnot(None),
+            CaseEvidence.mime_type.in_(IMAGE_MIME_TYPES),
+            CaseEvidence.derivatives_generated_at.is_(None),
+        )
+        .distinct(CaseEvidence.sha256)
+        .order_by(CaseEvidence.sha256)
+        .all()
+    )
+    stats = {"files": 0, "evidences": 0, "failed": 0}
+    pending: Dict[Future, str] = {}
+
+    def collect(done) -> None:
+        for future in done:
+            sha256 = pending.pop(future)
+            try:
+                future.result()
+            except Exception as e:
+                stats["failed"] += 1
+                logger.error(f"Не удалось создать производные для {sha256}: {str(e)}")
+                continue
+            stats["files"] += 1
+            stats["evidences"] += mark_derivatives_ready(db, sha256=sha256)
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        for sha256, file_path in rows:
+            if len(pending) >= workers * 4:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending[pool.submit(render_derivatives, str(evidence_storage.path(file_path)))] = sha256
+        collect(wait(pending).done)
+
+    logger.info(
+        f"Производные созданы: файлов {stats['files']}, записей {stats['evidences']}, ошибок {stats['failed']}"
+    )
+    return stats
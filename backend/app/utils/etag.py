@@ -0,0 +1,30 @@
+import hashlib
+from typing import Iterable, Optional
+
+from fastapi import Response
+
+# Клиент может хранить ответ, но обязан перепроверять его через If-None-Match
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(version_parts: Iterable) -> str:
+    """
+    Строгий ETag из частей версии сущности (updated_at, количество дочерних строк и т.п.).
+    """
+    version = "|".join("" if part is None else str(part) for part in version_parts)
+    return '"' + hashlib.sha1(version.encode("utf-8")).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Проверяет заголовок If-None-Match (список ETag через запятую или *).
+    """
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    """Ответ 304 Not Modified с текущим ETag."""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
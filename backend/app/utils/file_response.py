@@ -0,0 +1,112 @@
+"""
+Отдача неизменяемых файлов: диапазоны (Range), долгий кэш и X-Accel-Redirect.
+"""
+import re
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from fastapi.responses import FileResponse
+from starlette.types import Receive, Scope, Send
+
+# Содержимое по адресу не меняется, поэтому клиент может не перепроверять его
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+# Растровые изображения, которые браузер показывает сам; остальное (включая
+# image/svg+xml со скриптами и HTML) отдается только как вложение
+INLINE_MIME_TYPES = frozenset({"image/png", "image/jpeg", "image/gif", "image/webp"})
+
+# Загруженные файлы не должны исполняться в контексте API, даже если браузер
+# откроет их как документ
+EVIDENCE_SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "Content-Security-Policy": "default-src 'none'; sandbox",
+}
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    """Диапазон целиком за пределами файла (ответ 416)."""
+
+
+def parse_byte_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Разбирает заголовок Range с одним диапазоном байт.
+
+    Returns:
+        tuple: (первый байт, последний байт включительно) или None, если отдавать
+        нужно весь файл (заголовка нет, он некорректен или диапазонов несколько)
+
+    Raises:
+        RangeNotSatisfiable: если диапазон начинается за концом файла
+    """
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    if size == 0:
+        raise RangeNotSatisfiable()
+    first, last = match.groups()
+    if first == "":
+        # bytes=-N: последние N байт
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable()
+        return max(size - length, 0), size - 1
+    start = int(first)
+    if last != "" and int(last) < start:
+        # Синтаксически неверный диапазон игнорируется (RFC 9110, 14.1.1)
+        return None
+    end = size - 1 if last == "" else min(int(last), size - 1)
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+def content_disposition(filename: Optional[str], mime_type: Optional[str]) -> str:
+    """
+    Content-Disposition так же, как у FileResponse, с inline только для растровых изображений.
+    """
+    base_type = (mime_type or "").split(";", 1)[0].strip().lower()
+    disposition = "inline" if base_type in INLINE_MIME_TYPES else "attachment"
+    if not filename:
+        return disposition
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"{disposition}; filename*=utf-8''{quoted}"
+    return f'{disposition}; filename="{filename}"'
+
+
+class FileRangeResponse(FileResponse):
+    """
+    FileResponse с частью файла: 206 Partial Content и Content-Range.
+    """
+
+    def __init__(self, path, *, start: int, end: int, size: int, **kwargs) -> None:
+        super().__init__(path, status_code=206, **kwargs)
+        self.start = start
+        self.end = end
+        self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+        self.headers["content-length"] = str(end - start + 1)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if self.send_header_only:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        else:
+            remaining = self.end - self.start + 1
+            async with await anyio.open_file(self.path, mode="rb") as file:
+                await file.seek(self.start)
+                while remaining > 0:
+                    chunk = await file.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                # Файл оказался короче stat: закрываем тело, чтобы клиент не ждал
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,94 @@
+"""
+Нормализация идентификаторов игроков (телефоны, email, кошельки) для поиска совпадений.
+
+Нормализованное значение хранится рядом с исходным в normalized_value и
+индексируется вместе с типом, поэтому поиск идет по точному совпадению ключа.
+"""
+import re
+from typing import Optional
+
+PHONE_TYPES = {"phone", "mobile", "whatsapp", "viber"}
+EMAIL_TYPES = {"email", "e-mail", "mail"}
+HANDLE_TYPES = {"telegram", "skype", "discord"}
+
+# Российские номера часто записывают через 8 или без кода страны
+_RU_TRUNK_PREFIX = "8"
+_RU_COUNTRY_CODE = "7"
+
+_WEBMONEY_RE = re.compile(r"^([ZRUEBGXKCDH])\s*(\d{12})$", re.IGNORECASE)
+
+
+def normalize_type(type_: Optional[str]) -> str:
+    """Тип идентификатора в том виде, в котором он хранится и ищется (Phone -> phone)."""
+    return (type_ or "").strip().lower()
+
+
+def normalize_phone(value: str) -> str:
+    """
+    Приводит телефон к виду E.164 (+79120001122).
+
+    Без библиотеки разметки номеров: оставляем цифры, 8XXXXXXXXXX и
+    10-значные номера считаем российскими.
+    """
+    digits = re.sub(r"\D", "", value)
+    if len(digits) == 11 and digits.startswith(_RU_TRUNK_PREFIX):
+        digits = _RU_COUNTRY_CODE + digits[1:]
+    elif len(digits) == 10 and digits.startswith("9"):
+        digits = _RU_COUNTRY_CODE + digits
+    return f"+{digits}" if digits else ""
+
+
+def normalize_email(value: str) -> str:
+    return value.strip().lower()
+
+
+def normalize_handle(value: str) -> str:
+    """Ник в мессенджере: без @, ссылки t.me и регистра."""
+    handle = value.strip().lower()
+    handle = re.sub(r"^(https?://)?(www\.)?(t\.me|telegram\.me)/", "", handle)
+    return handle.lstrip("@")
+
+
+def normalize_contact(type_: str, value: str) -> str:
+    """Нормализованный ключ контакта игрока."""
+    type_ = normalize_type(type_)
+    if type_ in PHONE_TYPES:
+        return normalize_phone(value)
+    if type_ in EMAIL_TYPES:
+        return normalize_email(value)
+    if type_ in HANDLE_TYPES:
+        return normalize_handle(value)
+    return value.strip().lower()
+
+
+def normalize_payment_method(type_: str, value: str) -> str:
+    """
+    Канонический идентификатор кошелька.
+
+    WebMoney - буква кошелька в верхнем регистре и 12 цифр (Z123456789012),
+    кошельки по email (skrill, neteller, paypal) - email в нижнем регистре,
+    номера карт и счетов - только цифры.
+    """
+    type_ = normalize_type(type_)
+    stripped = value.strip()
+    if type_ == "webmoney":
+        match = _WEBMONEY_RE.match(re.sub(r"[\s-]", "", stripped))
+        if match:
+            return f"{match.group(1).upper()}{match.group(2)}"
+    if "@" in stripped:
+        return normalize_email(stripped)
+    compact = re.sub(r"[\s-]", "", stripped)
+    if compact.isdigit():
+        return compact
+    return compact.lower()
+
+
+def normalize_social_media(type_: str, value: str) -> str:
+    """
+    Ключ профиля в соцсети: ссылка без схемы, www./m., хвостового слеша и
+    регистра (https://VK.com/durov/ -> vk.com/durov), ник без @.
+    """
+    profile = value.strip().lower()
+    profile = re.sub(r"^(https?://)?((www|m)\.)?", "", profile)
+    profile = profile.split("?", 1)[0].split("#", 1)[0].rstrip("/")
+    return profile.lstrip("@")
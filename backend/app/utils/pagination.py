@@ -0,0 +1,43 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """
+    Кодирует позицию keyset-пагинации (created_at, id) в непрозрачную строку.
+    """
+    payload = json.dumps({"c": created_at.isoformat(), "i": str(id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Декодирует курсор, полученный от encode_cursor.
+
+    Raises:
+        ValueError: если курсор поврежден или имеет неверный формат
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["c"]), UUID(payload["i"])
+    except (TypeError, KeyError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def next_cursor_for(rows: list, limit: int) -> Optional[str]:
+    """
+    Возвращает курсор следующей страницы, если выборка содержит limit + 1 строк.
+
+    Лишняя строка отбрасывается из rows на месте.
+    """
+    if len(rows) <= limit:
+        return None
+    del rows[limit:]
+    if not rows:
+        return None
+    last = rows[-1]
+    return encode_cursor(last.created_at, last.id)
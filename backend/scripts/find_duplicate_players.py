@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+"""
+Пакетный поиск дублей игроков.
+
+Пересобирает таблицу player_duplicate_candidates; результаты доступны через
+GET /api/v1/players/duplicates. Рассчитан на запуск по расписанию (cron).
+
+Пример:
+    python scripts/find_duplicate_players.py --max-block-size 200 --min-score 0.5
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+# Добавляем корневую директорию в путь, чтобы импортировать модули приложения
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.services.dedupe import run_dedupe_job
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Поиск дублей игроков по блокирующим ключам")
+    parser.add_argument("--max-block-size", type=int, default=None,
+                        help="пропускать блоки, в которых больше игроков")
+    parser.add_argument("--min-score", type=float, default=None,
+                        help="минимальная оценка пары (0..1)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.monotonic()
+        stats = run_dedupe_job(db, max_block_size=args.max_block_size, min_score=args.min_score)
+        logger.info(f"Найдено пар: {stats['candidates']} за {time.monotonic() - started:.1f} с")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+"""
+Бэкфилл миниатюр и превью для изображений-доказательств.
+
+Обрабатывает изображения без derivatives_generated_at: загруженные до
+появления конвейера миниатюр или пропущенные при заполненной очереди.
+Повторный запуск безопасен.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+# Добавляем корневую директорию в путь, чтобы импортировать модули приложения
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.services.thumbnails import backfill_derivatives
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=None, help="процессов в пуле (по умолчанию THUMBNAIL_WORKERS)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.monotonic()
+        stats = backfill_derivatives(db, workers=args.workers)
+        logger.info(
+            f"Файлов: {stats['files']}, записей: {stats['evidences']}, "
+            f"ошибок: {stats['failed']} за {time.monotonic() - started:.1f} с"
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -110,15 +110,15 @@ def get_player_id_mapping(base_url: str, headers: Dict[str, str], output_file_pa
     2. никнеймам
     3. ФИО
     """
-    players_url = f"{base_url}/players/?limit=1000"
+    players_url = f"{base_url}/export/players?format=ndjson"
     
     try:
-        response = requests.get(players_url, headers=headers)
-        if response.status_code != 200:
-            raise Exception(f"Ошибка получения игроков: {response.status_code}, {response.text}")
-        
-        # Получаем игроков из системы
-        players = response.json()
+        # Полная выгрузка игроков потоком, по одному игроку на строку
+        with requests.get(players_url, headers=headers, stream=True) as response:
+            if response.status_code != 200:
+                raise Exception(f"Ошибка получения игроков: {response.status_code}, {response.text}")
+            
+            players = [json.loads(line) for line in response.iter_lines() if line]
         logger.info(f"Получено {len(players)} игроков из системы")
         
         # Читаем исходные данные игроков из output.json
@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+"""
+Полная пересборка кластеров игроков, связанных общими идентификаторами.
+
+Между запусками кластеры сливаются инкрементально при записи игроков;
+пересборка дополнительно разделяет кластеры после удаления идентификаторов.
+Рассчитан на запуск по расписанию (cron).
+"""
+import logging
+import os
+import sys
+import time
+
+# Добавляем корневую директорию в путь, чтобы импортировать модули приложения
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.services.clustering import rebuild_clusters
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    db = SessionLocal()
+    try:
+        started = time.monotonic()
+        stats = rebuild_clusters(db)
+        logger.info(
+            f"Игроков: {stats['players']}, кластеров из 2+ записей: {stats['clusters']}, "
+            f"обновлено: {stats['updated']} за {time.monotonic() - started:.1f} с"
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
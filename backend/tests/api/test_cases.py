@@ -1,10 +1,18 @@
+import hashlib
+import io
+
 import pytest
 from httpx import AsyncClient
+from PIL import Image
 from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 
+from app.core.config import settings
+from app.services.evidence_storage import evidence_storage
+
 pytestmark = pytest.mark.asyncio
 
+
 async def test_create_case(
     async_client: AsyncClient, admin_token_headers: dict
 ):
@@ -38,6 +46,7 @@ async def test_create_case(
     assert data["status"] == "open"
     assert "id" in data
 
+
 async def test_create_case_invalid_data(
     async_client: AsyncClient, admin_token_headers: dict
 ):
@@ -72,6 +81,7 @@ async def test_create_case_invalid_data(
         )
         assert response.status_code in [404, 422]
 
+
 async def test_get_case(
     async_client: AsyncClient, admin_token_headers: dict
 ):
@@ -110,6 +120,7 @@ async def test_get_case(
     assert data["title"] == "Test Case"
     assert data["player_id"] == player_id
 
+
 async def test_get_nonexistent_case(async_client: AsyncClient, admin_token_headers: dict):
     """Тест получения информации о несуществующем кейсе"""
     response = await async_client.get(
@@ -118,6 +129,7 @@ async def test_get_nonexistent_case(async_client: AsyncClient, admin_token_heade
     )
     assert response.status_code == 404
 
+
 async def test_update_case(
     async_client: AsyncClient, admin_token_headers: dict
 ):
@@ -167,6 +179,7 @@ async def test_update_case(
     assert updated_case["description"] == "Updated description"
     assert updated_case["player_id"] == player_id
 
+
 async def test_close_case(
     async_client: AsyncClient, admin_token_headers: dict
 ):
@@ -205,6 +218,7 @@ async def test_close_case(
     assert data["closed_at"] is not None
     assert data["closed_by_user_id"] is not None
 
+
 async def test_update_closed_case(
     async_client: AsyncClient, admin_token_headers: dict
 ):
@@ -258,6 +272,7 @@ async def test_update_closed_case(
     assert update_response.status_code == 400
     assert "closed" in update_response.json()["detail"].lower()
 
+
 async def test_list_cases(async_client: AsyncClient, admin_token_headers: dict):
     """Тест получения списка кейсов"""
     response = await async_client.get(
@@ -268,6 +283,7 @@ async def test_list_cases(async_client: AsyncClient, admin_token_headers: dict):
     data = response.json()
     assert isinstance(data, list)
 
+
 async def test_list_cases_pagination(async_client: AsyncClient, admin_token_headers: dict):
     """Тест пагинации списка кейсов"""
     response = await async_client.get(
@@ -279,6 +295,7 @@ async def test_list_cases_pagination(async_client: AsyncClient, admin_token_head
     assert isinstance(data, list)
     assert len(data) <= 1
 
+
 async def test_list_cases_by_player(
     async_client: AsyncClient, admin_token_headers: dict
 ):
@@ -319,6 +336,7 @@ async def test_list_cases_by_player(
     for case in data:
         assert case["player_id"] == player_id
 
+
 async def test_case_fund_isolation(
     async_client: AsyncClient, test_manager: dict, admin_token_headers: dict
 ):
@@ -362,4 +380,513 @@ async def test_case_fund_isolation(
         headers=manager_token_headers
     )
     assert get_response.status_code == 404
-    assert "not found" in get_response.json()["detail"].lower() 
\ No newline at end of file
+    assert "not found" in get_response.json()["detail"].lower() 
+
+
+async def test_get_case_conditional_checks_access_first(
+    async_client: AsyncClient, test_manager: dict, admin_token_headers: dict
+):
+    """Тест: совпадение ETag не раскрывает закрытый кейс"""
+    manager_token_headers = {"Authorization": f"Bearer {test_manager['token']}"}
+    player_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={"first_name": "Etag", "full_name": "Etag Case Player"}
+    )
+    case_response = await async_client.post(
+        "/api/v1/cases/",
+        headers=admin_token_headers,
+        json={"title": "Admin Case", "player_id": player_response.json()["id"], "status": "open"}
+    )
+    case_id = case_response.json()["id"]
+
+    response = await async_client.get(f"/api/v1/cases/{case_id}", headers=admin_token_headers)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    for if_none_match in (etag, "*"):
+        response = await async_client.get(
+            f"/api/v1/cases/{case_id}",
+            headers={**manager_token_headers, "If-None-Match": if_none_match}
+        )
+        assert response.status_code == 404
+        assert "etag" not in response.headers
+
+
+async def test_list_cases_by_player_hydrated(
+    async_client: AsyncClient, admin_token_headers: dict, test_admin: dict
+):
+    """Тест пакетной подгрузки игрока и фонда в списке кейсов игрока"""
+    player_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={
+            "first_name": "Hydrated",
+            "full_name": "Hydrated Player",
+            "contacts": [{"type": "email", "value": "hydrated@example.com"}]
+        }
+    )
+    player_id = player_response.json()["id"]
+
+    for i in range(2):
+        await async_client.post(
+            "/api/v1/cases/",
+            headers=admin_token_headers,
+            json={
+                "player_id": player_id,
+                "created_by_fund_id": str(test_admin["fund_id"]),
+                "title": f"Hydrated Case {i}",
+                "status": "open"
+            }
+        )
+
+    response = await async_client.get(
+        f"/api/v1/cases/by-player/{player_id}",
+        headers=admin_token_headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 2
+    for case in data:
+        assert case["player"]["full_name"] == "Hydrated Player"
+        assert case["player"]["contacts"][0]["value"] == "hydrated@example.com"
+        assert case["fund"]["id"] == str(test_admin["fund_id"])
+
+
+async def test_list_cases_summary_view(
+    async_client: AsyncClient, admin_token_headers: dict, test_admin: dict
+):
+    """Тест компактного списка кейсов (view=summary)"""
+    player_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={
+            "first_name": "Summary",
+            "full_name": "Summary View Player",
+            "nicknames": [{"nickname": "summary_view", "room": "GGPoker"}]
+        }
+    )
+    player_id = player_response.json()["id"]
+    await async_client.post(
+        "/api/v1/cases/",
+        headers=admin_token_headers,
+        json={
+            "player_id": player_id,
+            "created_by_fund_id": str(test_admin["fund_id"]),
+            "title": "Summary View Case",
+            "status": "open"
+        }
+    )
+
+    response = await async_client.get(
+        "/api/v1/cases/",
+        headers=admin_token_headers,
+        params={"player_id": player_id, "view": "summary"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 1
+    item = data["results"][0]
+    assert item["title"] == "Summary View Case"
+    assert item["player_name"] == "Summary View Player"
+    assert item["fund_name"]
+    assert "player" not in item
+
+
+async def test_list_cases_full_text_search(
+    async_client: AsyncClient, admin_token_headers: dict, test_admin: dict
+):
+    """Тест полнотекстового поиска кейсов с учетом морфологии"""
+    player_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={"first_name": "Search", "full_name": "Case Search Player"}
+    )
+    player_id = player_response.json()["id"]
+    await async_client.post(
+        "/api/v1/cases/",
+        headers=admin_token_headers,
+        json={
+            "player_id": player_id,
+            "created_by_fund_id": str(test_admin["fund_id"]),
+            "title": "Невозврат займов",
+            "description": "Игрок не вернул деньги фонду",
+            "status": "open"
+        }
+    )
+
+    # Другая словоформа находит кейс, исключенное слово - нет
+    response = await async_client.get(
+        "/api/v1/cases/",
+        headers=admin_token_headers,
+        params={"player_id": player_id, "search": "займ"}
+    )
+    assert response.json()["count"] == 1
+
+    response = await async_client.get(
+        "/api/v1/cases/",
+        headers=admin_token_headers,
+        params={"player_id": player_id, "search": "займ -деньги"}
+    )
+    assert response.json()["count"] == 0
+
+
+async def test_list_cases_keyset_pagination(
+    async_client: AsyncClient, admin_token_headers: dict, test_admin: dict
+):
+    """Тест постраничного обхода кейсов по курсору"""
+    player_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={"first_name": "Cursor", "full_name": "Cursor Pages Player"}
+    )
+    player_id = player_response.json()["id"]
+    created_ids = []
+    for index in range(3):
+        case_response = await async_client.post(
+            "/api/v1/cases/",
+            headers=admin_token_headers,
+            json={
+                "player_id": player_id,
+                "created_by_fund_id": str(test_admin["fund_id"]),
+                "title": f"Cursor Case {index}",
+                "status": "open"
+            }
+        )
+        created_ids.append(case_response.json()["id"])
+
+    seen_ids = []
+    params = {"player_id": player_id, "limit": 1, "with_total": "false"}
+    while True:
+        response = await async_client.get(
+            "/api/v1/cases/", headers=admin_token_headers, params=params
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] is None
+        seen_ids.extend(case["id"] for case in data["results"])
+        if not data["next_cursor"]:
+            break
+        params["cursor"] = data["next_cursor"]
+    assert sorted(seen_ids) == sorted(created_ids)
+    assert len(set(seen_ids)) == 3
+
+    response = await async_client.get(
+        "/api/v1/cases/",
+        headers=admin_token_headers,
+        params={"cursor": "not-a-cursor"}
+    )
+    assert response.status_code == 422
+
+
+async def test_arbitrage_stats(
+    async_client: AsyncClient, admin_token_headers: dict, test_admin: dict
+):
+    """Тест сумм арбитража по фонду, типу и периоду с итогами ROLLUP"""
+    player_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={"first_name": "Arbitrage", "full_name": "Arbitrage Stats Player"}
+    )
+    player_id = player_response.json()["id"]
+    for amount in (100.0, 300.0):
+        await async_client.post(
+            "/api/v1/cases/",
+            headers=admin_token_headers,
+            json={
+                "player_id": player_id,
+                "created_by_fund_id": str(test_admin["fund_id"]),
+                "title": "Arbitrage Stats Case",
+                "status": "open",
+                "arbitrage_type": "stats_test_type",
+                "arbitrage_amount": amount,
+                "arbitrage_currency": "EUR"
+            }
+        )
+
+    response = await async_client.get(
+        "/api/v1/stats/arbitrage",
+        headers=admin_token_headers,
+        params={"arbitrage_type": "stats_test_type", "group_by": "fund,period"}
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    detail = next(row for row in results if not row["rolled_up"])
+    assert detail["currency"] == "EUR"
+    assert detail["fund_id"] == str(test_admin["fund_id"])
+    assert detail["cases_count"] == 2
+    assert detail["total_amount"] == 400.0
+    assert detail["average_amount"] == 200.0
+    total = next(row for row in results if row["rolled_up"] == ["fund", "period"])
+    assert total["total_amount"] == 400.0
+
+    response = await async_client.get(
+        "/api/v1/stats/arbitrage",
+        headers=admin_token_headers,
+        params={"group_by": "fund,unknown"}
+    )
+    assert response.status_code == 422
+
+
+async def test_upload_case_evidence_content_addressed(
+    async_client: AsyncClient, admin_token_headers: dict, test_admin: dict,
+    tmp_path, monkeypatch
+):
+    """Тест потоковой загрузки доказательств с дедупликацией по SHA-256"""
+    monkeypatch.setattr(evidence_storage, "root", tmp_path)
+    monkeypatch.setattr(evidence_storage, "chunk_size", 4)
+    player_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={"first_name": "Evidence", "full_name": "Evidence Upload Player"}
+    )
+    player_id = player_response.json()["id"]
+    case_ids = []
+    for index in range(2):
+        case_response = await async_client.post(
+            "/api/v1/cases/",
+            headers=admin_token_headers,
+            json={
+                "player_id": player_id,
+                "created_by_fund_id": str(test_admin["fund_id"]),
+                "title": f"Evidence Case {index}",
+                "status": "open"
+            }
+        )
+        case_ids.append(case_response.json()["id"])
+
+    content = b"\x89PNG\r\n\x1a\n" + b"screenshot" * 10
+    evidences = []
+    for case_id in case_ids:
+        response = await async_client.post(
+            f"/api/v1/cases/{case_id}/evidences/",
+            headers=admin_token_headers,
+            data={"type": "screenshot"},
+            files={"file": ("shot.png", content, "application/octet-stream")}
+        )
+        assert response.status_code == 201
+        evidences.append(response.json())
+
+    sha256 = hashlib.sha256(content).hexdigest()
+    assert {evidence["sha256"] for evidence in evidences} == {sha256}
+    assert evidences[0]["file_path"] == evidences[1]["file_path"]
+    assert evidences[0]["size"] == len(content)
+    assert evidences[0]["mime_type"] == "image/png"
+    assert evidences[0]["file_name"] == "shot.png"
+    assert (tmp_path / evidences[0]["file_path"]).read_bytes() == content
+
+    monkeypatch.setattr(evidence_storage, "max_size", len(content) - 1)
+    response = await async_client.post(
+        f"/api/v1/cases/{case_ids[0]}/evidences/",
+        headers=admin_token_headers,
+        data={"type": "screenshot"},
+        files={"file": ("big.png", content, "image/png")}
+    )
+    assert response.status_code == 413
+    assert list((tmp_path / "tmp").iterdir()) == []
+
+    # Ошибка в полях формы не оставляет файл в хранилище
+    response = await async_client.post(
+        f"/api/v1/cases/{case_ids[0]}/evidences/",
+        headers=admin_token_headers,
+        data={"description": "no type"},
+        files={"file": ("orphan.txt", b"orphan evidence", "text/plain")}
+    )
+    assert response.status_code == 422
+    orphan_path = tmp_path / evidence_storage.relative_path(hashlib.sha256(b"orphan evidence").hexdigest())
+    assert not orphan_path.exists()
+    assert list((tmp_path / "tmp").iterdir()) == []
+
+
+async def test_download_case_evidence_content(
+    async_client: AsyncClient, admin_token_headers: dict, test_admin: dict,
+    tmp_path, monkeypatch
+):
+    """Тест выдачи файла доказательства целиком и по диапазону"""
+    monkeypatch.setattr(evidence_storage, "root", tmp_path)
+    player_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={"first_name": "Download", "full_name": "Evidence Download Player"}
+    )
+    case_response = await async_client.post(
+        "/api/v1/cases/",
+        headers=admin_token_headers,
+        json={
+            "player_id": player_response.json()["id"],
+            "created_by_fund_id": str(test_admin["fund_id"]),
+            "title": "Evidence Download Case",
+            "status": "open"
+        }
+    )
+    case_id = case_response.json()["id"]
+    content = b"0123456789" * 100
+    evidence_response = await async_client.post(
+        f"/api/v1/cases/{case_id}/evidences/",
+        headers=admin_token_headers,
+        data={"type": "log"},
+        files={"file": ("session.txt", content, "text/plain")}
+    )
+    evidence = evidence_response.json()
+    url = f"/api/v1/cases/{case_id}/evidences/{evidence['id']}/content"
+
+    response = await async_client.get(url, headers=admin_token_headers)
+    assert response.status_code == 200
+    assert response.content == content
+    assert response.headers["etag"] == f'"{evidence["sha256"]}"'
+    assert "immutable" in response.headers["cache-control"]
+
+    response = await async_client.get(url, headers={**admin_token_headers, "Range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.content == content[10:20]
+    assert response.headers["content-range"] == f"bytes 10-19/{len(content)}"
+
+    response = await async_client.get(url, headers={**admin_token_headers, "Range": "bytes=5000-"})
+    assert response.status_code == 416
+
+    response = await async_client.get(
+        url, headers={**admin_token_headers, "If-None-Match": f'"{evidence["sha256"]}"'}
+    )
+    assert response.status_code == 304
+
+    monkeypatch.setattr(settings, "EVIDENCE_ACCEL_REDIRECT_PREFIX", "/protected-evidences/")
+    response = await async_client.get(url, headers=admin_token_headers)
+    assert response.headers["x-accel-redirect"] == f"/protected-evidences/{evidence['file_path']}"
+    assert response.content == b""
+
+
+async def test_case_evidence_thumbnails(
+    async_client: AsyncClient, admin_token_headers: dict, test_admin: dict,
+    tmp_path, monkeypatch
+):
+    """Тест создания миниатюры и превью скриншота после загрузки"""
+    monkeypatch.setattr(evidence_storage, "root", tmp_path)
+    player_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={"first_name": "Thumbnail", "full_name": "Evidence Thumbnail Player"}
+    )
+    case_response = await async_client.post(
+        "/api/v1/cases/",
+        headers=admin_token_headers,
+        json={
+            "player_id": player_response.json()["id"],
+            "created_by_fund_id": str(test_admin["fund_id"]),
+            "title": "Evidence Thumbnail Case",
+            "status": "open"
+        }
+    )
+    case_id = case_response.json()["id"]
+    image = io.BytesIO()
+    Image.new("RGB", (2000, 1000), "blue").save(image, "PNG")
+    await async_client.post(
+        f"/api/v1/cases/{case_id}/evidences/",
+        headers=admin_token_headers,
+        data={"type": "screenshot"},
+        files={"file": ("table.png", image.getvalue(), "image/png")}
+    )
+
+    # Фоновые задачи выполняются до завершения ответа в тестовом клиенте
+    response = await async_client.get(f"/api/v1/cases/{case_id}/evidences/", headers=admin_token_headers)
+    evidence = response.json()[0]
+    assert evidence["thumbnail_url"].endswith("/content?variant=thumb")
+
+    response = await async_client.get(evidence["thumbnail_url"], headers=admin_token_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/webp"
+    assert Image.open(io.BytesIO(response.content)).size == (256, 128)
+
+
+async def test_read_case_includes_evidence_urls(
+    async_client: AsyncClient, admin_token_headers: dict, test_admin: dict,
+    tmp_path, monkeypatch
+):
+    """Тест карточки кейса: доказательства со ссылками на миниатюру и превью"""
+    monkeypatch.setattr(evidence_storage, "root", tmp_path)
+    player_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={"first_name": "Card", "full_name": "Evidence Card Player"}
+    )
+    case_response = await async_client.post(
+        "/api/v1/cases/",
+        headers=admin_token_headers,
+        json={
+            "player_id": player_response.json()["id"],
+            "created_by_fund_id": str(test_admin["fund_id"]),
+            "title": "Evidence Card Case",
+            "status": "open"
+        }
+    )
+    case_id = case_response.json()["id"]
+
+    response = await async_client.get(f"/api/v1/cases/{case_id}", headers=admin_token_headers)
+    assert response.json()["evidences"] == []
+    etag = response.headers["etag"]
+
+    image = io.BytesIO()
+    Image.new("RGB", (800, 600), "green").save(image, "PNG")
+    await async_client.post(
+        f"/api/v1/cases/{case_id}/evidences/",
+        headers=admin_token_headers,
+        data={"type": "screenshot"},
+        files={"file": ("card.png", image.getvalue(), "image/png")}
+    )
+
+    # Новое доказательство меняет ETag карточки
+    response = await async_client.get(
+        f"/api/v1/cases/{case_id}",
+        headers={**admin_token_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    evidence = response.json()["evidences"][0]
+    content_url = f"{settings.API_V1_STR}/cases/{case_id}/evidences/{evidence['id']}/content"
+    assert evidence["content_url"] == content_url
+    assert evidence["thumbnail_url"] == f"{content_url}?variant=thumb"
+    assert evidence["preview_url"] == f"{content_url}?variant=preview"
+
+    # В списках кейсов доказательства не подгружаются
+    response = await async_client.get(
+        f"/api/v1/cases/by-player/{player_response.json()['id']}", headers=admin_token_headers
+    )
+    assert response.json()[0]["evidences"] is None
+
+
+async def test_download_case_evidence_svg_as_attachment(
+    async_client: AsyncClient, admin_token_headers: dict, test_admin: dict,
+    tmp_path, monkeypatch
+):
+    """Тест: SVG-доказательство отдается вложением, а не показывается в браузере"""
+    monkeypatch.setattr(evidence_storage, "root", tmp_path)
+    player_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={"first_name": "Svg", "full_name": "Evidence Svg Player"}
+    )
+    case_response = await async_client.post(
+        "/api/v1/cases/",
+        headers=admin_token_headers,
+        json={
+            "player_id": player_response.json()["id"],
+            "created_by_fund_id": str(test_admin["fund_id"]),
+            "title": "Evidence Svg Case",
+            "status": "open"
+        }
+    )
+    case_id = case_response.json()["id"]
+    content = b'<svg xmlns="http://www.w3.org/2000/svg"><script>alert(1)</script></svg>'
+    evidence_response = await async_client.post(
+        f"/api/v1/cases/{case_id}/evidences/",
+        headers=admin_token_headers,
+        data={"type": "screenshot"},
+        files={"file": ("chart.svg", content, "image/svg+xml")}
+    )
+    evidence = evidence_response.json()
+
+    response = await async_client.get(
+        f"/api/v1/cases/{case_id}/evidences/{evidence['id']}/content", headers=admin_token_headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-disposition"].startswith("attachment")
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert "sandbox" in response.headers["content-security-policy"]
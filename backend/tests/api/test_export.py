@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+
+import pytest
+from httpx import AsyncClient
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_export_players_ndjson(async_client: AsyncClient, admin_token_headers: dict):
+    """Тест потоковой выгрузки игроков в NDJSON"""
+    create_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={
+            "first_name": "Export",
+            "full_name": "Export Player",
+            "nicknames": [{"nickname": "export_nick", "room": "PokerStars"}]
+        }
+    )
+    player_id = create_response.json()["id"]
+
+    response = await async_client.get("/api/v1/export/players", headers=admin_token_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    players = [json.loads(line) for line in response.text.splitlines() if line]
+    exported = next(player for player in players if player["id"] == player_id)
+    assert exported["full_name"] == "Export Player"
+    assert exported["nicknames"][0]["nickname"] == "export_nick"
+
+
+async def test_export_players_csv_gzip(async_client: AsyncClient, admin_token_headers: dict):
+    """Тест выгрузки игроков в CSV со сжатием"""
+    create_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={
+            "first_name": "Gzip",
+            "full_name": "Gzip Export Player",
+            "nicknames": [{"nickname": "gzip_export_nick", "room": "PokerStars"}]
+        }
+    )
+    player_id = create_response.json()["id"]
+
+    response = await async_client.get(
+        "/api/v1/export/players",
+        headers=admin_token_headers,
+        params={"format": "csv", "gzip": "true"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    # httpx распаковывает gzip сам, поэтому проверяем уже текст
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    exported = next(row for row in rows if row["id"] == player_id)
+    assert exported["full_name"] == "Gzip Export Player"
+    assert exported["nicknames"] == "PokerStars:gzip_export_nick"
+
+
+async def test_export_cases(async_client: AsyncClient, admin_token_headers: dict):
+    """Тест выгрузки кейсов"""
+    response = await async_client.get(
+        "/api/v1/export/cases",
+        headers=admin_token_headers,
+        params={"format": "csv"}
+    )
+    assert response.status_code == 200
+    header = response.text.splitlines()[0]
+    assert header.startswith("id,title,description,status")
+
+    response = await async_client.get(
+        "/api/v1/export/cases",
+        headers=admin_token_headers,
+        params={"format": "xml"}
+    )
+    assert response.status_code == 422
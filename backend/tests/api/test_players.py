@@ -257,4 +257,602 @@ async def test_player_contact_info_validation(async_client: AsyncClient, admin_t
             headers=admin_token_headers,
             json=invalid_data
         )
-        assert response.status_code == 422 
\ No newline at end of file
+        assert response.status_code == 422 
+
+
+async def test_list_players_cursor_pagination(async_client: AsyncClient, admin_token_headers: dict):
+    """Тест keyset-пагинации списка игроков"""
+    for i in range(3):
+        await async_client.post(
+            "/api/v1/players/",
+            headers=admin_token_headers,
+            json={"first_name": f"Cursor Player {i}", "full_name": f"Cursor Player {i}"}
+        )
+
+    first_page = await async_client.get(
+        "/api/v1/players/?limit=2",
+        headers=admin_token_headers
+    )
+    assert first_page.status_code == 200
+    data = first_page.json()
+    assert len(data["results"]) == 2
+    assert data["count"] is None
+    assert data["next_cursor"]
+
+    second_page = await async_client.get(
+        f"/api/v1/players/?limit=2&cursor={data['next_cursor']}&with_total=true",
+        headers=admin_token_headers
+    )
+    assert second_page.status_code == 200
+    second = second_page.json()
+    first_ids = {player["id"] for player in data["results"]}
+    assert not first_ids & {player["id"] for player in second["results"]}
+    assert second["count"] >= 3
+
+async def test_list_players_invalid_cursor(async_client: AsyncClient, admin_token_headers: dict):
+    """Тест обработки поврежденного курсора"""
+    response = await async_client.get(
+        "/api/v1/players/?cursor=not-a-cursor",
+        headers=admin_token_headers
+    )
+    assert response.status_code == 422
+
+async def test_list_players_cursor_rejected_with_search_or_sort(
+    async_client: AsyncClient, admin_token_headers: dict
+):
+    """Тест: курсор вместе с search или sort отклоняется, а не игнорируется"""
+    for i in range(2):
+        await async_client.post(
+            "/api/v1/players/",
+            headers=admin_token_headers,
+            json={"first_name": "Cursor Mode", "full_name": f"Cursor Mode Player {i}"}
+        )
+    page = await async_client.get("/api/v1/players/?limit=1", headers=admin_token_headers)
+    cursor = page.json()["next_cursor"]
+
+    for params in ({"search": "Cursor Mode"}, {"sort": "-cases_count"}):
+        response = await async_client.get(
+            "/api/v1/players/",
+            headers=admin_token_headers,
+            params={"cursor": cursor, **params}
+        )
+        assert response.status_code == 422
+        assert "skip" in response.json()["detail"]
+
+async def test_search_players_ranked_by_similarity(async_client: AsyncClient, admin_token_headers: dict):
+    """Тест нечеткого поиска игроков с ранжированием по качеству совпадения"""
+    for name in ("Trigram Searchable", "Trigram Searchables Extra"):
+        await async_client.post(
+            "/api/v1/players/",
+            headers=admin_token_headers,
+            json={"first_name": name, "full_name": name}
+        )
+
+    # Опечатка в запросе не должна мешать найти игрока
+    response = await async_client.get(
+        "/api/v1/players/?search=Trigram Serchable",
+        headers=admin_token_headers
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results
+    assert results[0]["full_name"] == "Trigram Searchable"
+
+async def test_list_players_sparse_fieldset(async_client: AsyncClient, admin_token_headers: dict):
+    """Тест выборки только запрошенных колонок и коллекций"""
+    await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={
+            "first_name": "Sparse",
+            "full_name": "Sparse Player",
+            "nicknames": [{"nickname": "sparse_nick", "room": "WPN"}],
+            "contacts": [{"type": "email", "value": "sparse@example.com"}]
+        }
+    )
+
+    response = await async_client.get(
+        "/api/v1/players/?fields=full_name,nicknames.nickname",
+        headers=admin_token_headers
+    )
+    assert response.status_code == 200
+    player = response.json()["results"][0]
+    assert set(player) == {"id", "full_name", "nicknames"}
+    assert all(set(n) == {"id", "nickname"} for n in player["nicknames"])
+
+    response = await async_client.get(
+        "/api/v1/players/?fields=unknown_column",
+        headers=admin_token_headers
+    )
+    assert response.status_code == 422
+
+async def test_batch_get_players(async_client: AsyncClient, admin_token_headers: dict):
+    """Тест пакетного получения игроков с сохранением порядка"""
+    ids = []
+    for i in range(2):
+        create_response = await async_client.post(
+            "/api/v1/players/",
+            headers=admin_token_headers,
+            json={"first_name": f"Batch {i}", "full_name": f"Batch Player {i}"}
+        )
+        ids.append(create_response.json()["id"])
+    missing_id = str(uuid.uuid4())
+
+    response = await async_client.post(
+        "/api/v1/players/batch-get",
+        headers=admin_token_headers,
+        json={"ids": [ids[1], missing_id, ids[0], ids[1]]}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [player["id"] for player in data["results"]] == [ids[1], ids[0]]
+    assert data["missing"] == [missing_id]
+
+async def test_screen_nicknames(async_client: AsyncClient, admin_token_headers: dict):
+    """Тест массовой проверки пар (комната, никнейм)"""
+    create_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={
+            "first_name": "Screened",
+            "full_name": "Screened Player",
+            "nicknames": [{"nickname": "ScreenMe", "room": "Pokerdom"}]
+        }
+    )
+    player_id = create_response.json()["id"]
+
+    response = await async_client.post(
+        "/api/v1/players/screen-nicknames",
+        headers=admin_token_headers,
+        json={"items": [
+            {"room": "Pokerdom", "nickname": "screenme"},
+            {"room": "WPN", "nickname": "screenme"}
+        ]}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["matched"] == 1
+    assert [p["id"] for p in data["results"][0]["players"]] == [player_id]
+    assert data["results"][1]["players"] == []
+
+async def test_find_player_by_normalized_contact(async_client: AsyncClient, admin_token_headers: dict):
+    """Тест поиска игрока по телефону в другом формате записи и пакетного поиска"""
+    create_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={
+            "first_name": "Normalized",
+            "full_name": "Normalized Contact Player",
+            "contacts": [{"type": "phone", "value": "+7 (912) 000-11-22"}],
+            "payment_methods": [{"type": "skrill", "value": "Wallet@Example.com"}]
+        }
+    )
+    player_id = create_response.json()["id"]
+
+    response = await async_client.get(
+        "/api/v1/players/by-contact/phone/79120001122",
+        headers=admin_token_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["id"] == player_id
+
+    response = await async_client.post(
+        "/api/v1/players/by-contact/batch",
+        headers=admin_token_headers,
+        json={"items": [
+            {"kind": "payment_method", "type": "skrill", "value": "wallet@example.com"},
+            {"type": "phone", "value": "89120001122"}
+        ]}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["matched"] == 2
+    assert all(result["players"][0]["id"] == player_id for result in data["results"])
+
+
+async def test_identifier_type_is_case_insensitive(async_client: AsyncClient, admin_token_headers: dict):
+    """Тест: тип контакта и платежного метода не зависит от регистра при поиске и связывании"""
+    create_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={
+            "first_name": "Typed",
+            "full_name": "Typed Identifier Player",
+            "contacts": [{"type": "Phone", "value": "+7 912 000-33-44"}],
+            "payment_methods": [{"type": "Skrill", "value": "typed@example.com"}]
+        }
+    )
+    player_id = create_response.json()["id"]
+    assert create_response.json()["contacts"][0]["type"] == "phone"
+
+    response = await async_client.get(
+        "/api/v1/players/by-contact/PHONE/89120003344",
+        headers=admin_token_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["id"] == player_id
+
+    response = await async_client.post(
+        "/api/v1/players/by-contact/batch",
+        headers=admin_token_headers,
+        json={"items": [{"kind": "payment_method", "type": "skrill", "value": "typed@example.com"}]}
+    )
+    assert response.json()["results"][0]["players"][0]["id"] == player_id
+
+    response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={
+            "first_name": "Typed",
+            "full_name": "Typed Identifier Other",
+            "contacts": [{"type": "phone", "value": "89120003344"}]
+        }
+    )
+    other_id = response.json()["id"]
+    response = await async_client.get(f"/api/v1/players/{player_id}/linked", headers=admin_token_headers)
+    assert [result["player"]["id"] for result in response.json()["results"]] == [other_id]
+
+
+async def test_get_player_conditional(async_client: AsyncClient, admin_token_headers: dict):
+    """Тест условного GET игрока по ETag"""
+    create_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={"first_name": "Etag", "full_name": "Etag Player"}
+    )
+    player_id = create_response.json()["id"]
+
+    response = await async_client.get(f"/api/v1/players/{player_id}", headers=admin_token_headers)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    response = await async_client.get(
+        f"/api/v1/players/{player_id}",
+        headers={**admin_token_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    await async_client.put(
+        f"/api/v1/players/{player_id}",
+        headers=admin_token_headers,
+        json={"nicknames": [{"nickname": "etag_nick"}]}
+    )
+    response = await async_client.get(
+        f"/api/v1/players/{player_id}",
+        headers={**admin_token_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+async def test_get_player_conditional_checks_access_first(
+    async_client: AsyncClient, test_manager: dict, admin_token_headers: dict
+):
+    """Тест: совпадение ETag не обходит запрет доступа к игроку"""
+    manager_token_headers = {"Authorization": f"Bearer {test_manager['token']}"}
+    create_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={"first_name": "Admin", "full_name": "Admin's Player"}
+    )
+    player_id = create_response.json()["id"]
+
+    response = await async_client.get(f"/api/v1/players/{player_id}", headers=admin_token_headers)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    response = await async_client.get(
+        f"/api/v1/players/{player_id}",
+        headers={**manager_token_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 403
+    assert "etag" not in response.headers
+
+
+async def test_player_summary_sort_and_filter(async_client: AsyncClient, admin_token_headers: dict):
+    """Тест сводки игрока по кейсам: пересчет при изменении кейсов, сортировка и фильтры"""
+    create_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={"first_name": "Summary", "full_name": "Summary Player"}
+    )
+    player_id = create_response.json()["id"]
+
+    case_ids = []
+    for amount in (100, 250):
+        response = await async_client.post(
+            "/api/v1/cases/",
+            headers=admin_token_headers,
+            json={"player_id": player_id, "title": "Summary Case", "status": "open", "arbitrage_amount": amount}
+        )
+        case_ids.append(response.json()["id"])
+    await async_client.put(f"/api/v1/cases/{case_ids[0]}/close", headers=admin_token_headers)
+
+    response = await async_client.get(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        params={"sort": "-cases_count", "min_cases_count": 2, "include": "summary"}
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    summary = next(p for p in results if p["id"] == player_id)["summary"]
+    assert summary["cases_count"] == 2
+    assert summary["open_cases_count"] == 1
+    assert summary["total_arbitrage_amount"] == 350
+    assert [p["summary"]["cases_count"] for p in results] == sorted(
+        (p["summary"]["cases_count"] for p in results), reverse=True
+    )
+
+    await async_client.delete(f"/api/v1/cases/{case_ids[1]}", headers=admin_token_headers)
+    response = await async_client.get(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        params={"has_open_cases": "false", "include": "summary"}
+    )
+    summary = next(p for p in response.json()["results"] if p["id"] == player_id)["summary"]
+    assert summary["cases_count"] == 1
+    assert summary["open_cases_count"] == 0
+
+    response = await async_client.get(
+        "/api/v1/players/", headers=admin_token_headers, params={"sort": "unknown"}
+    )
+    assert response.status_code == 422
+
+async def test_duplicate_detection(async_client: AsyncClient, admin_token_headers: dict):
+    """Тест поиска дублей игроков по блокирующим ключам"""
+    player_ids = []
+    for full_name, phone in (("Дубликатов Иван", "+7 912 555-01-01"), ("Дубликатов Иван Петрович", "89125550101")):
+        response = await async_client.post(
+            "/api/v1/players/",
+            headers=admin_token_headers,
+            json={
+                "first_name": "Иван",
+                "last_name": "Дубликатов",
+                "full_name": full_name,
+                "birth_date": "1991-05-05",
+                "contacts": [{"type": "phone", "value": phone}]
+            }
+        )
+        player_ids.append(response.json()["id"])
+
+    response = await async_client.post("/api/v1/players/duplicates/run", headers=admin_token_headers)
+    assert response.status_code == 202
+
+    response = await async_client.get(
+        "/api/v1/players/duplicates",
+        headers=admin_token_headers,
+        params={"player_id": player_ids[0]}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] >= 1
+    pair = data["results"][0]
+    assert {pair["player"]["id"], pair["duplicate_player"]["id"]} == set(player_ids)
+    assert set(pair["reasons"]) == {"phone", "surname_birth_year"}
+    assert 0 < pair["score"] <= 1
+
+async def test_linked_players(async_client: AsyncClient, admin_token_headers: dict):
+    """Тест поиска связанных игроков по общим идентификаторам"""
+    response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={
+            "first_name": "Linked",
+            "full_name": "Linked Source",
+            "contacts": [{"type": "email", "value": "Linked@Example.com"}],
+            "social_media": [{"type": "vk", "value": "https://vk.com/linked_profile/"}],
+            "nicknames": [{"nickname": "LinkedNick", "room": "GGPoker"}]
+        }
+    )
+    source_id = response.json()["id"]
+    response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={
+            "first_name": "Other",
+            "full_name": "Linked Other",
+            "contacts": [{"type": "email", "value": "linked@example.com "}],
+            "social_media": [{"type": "vk", "value": "vk.com/Linked_Profile"}],
+            "nicknames": [{"nickname": "linkednick", "room": "GGPoker"}]
+        }
+    )
+    other_id = response.json()["id"]
+
+    response = await async_client.get(f"/api/v1/players/{source_id}/linked", headers=admin_token_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 1
+    result = data["results"][0]
+    assert result["player"]["id"] == other_id
+    assert {link["kind"] for link in result["links"]} == {"contact", "social_media", "nickname"}
+
+    response = await async_client.get(f"/api/v1/players/{uuid.uuid4()}/linked", headers=admin_token_headers)
+    assert response.status_code == 404
+
+async def test_player_clusters_merge_incrementally(async_client: AsyncClient, admin_token_headers: dict):
+    """Тест инкрементального слияния кластеров связанных игроков"""
+    player_ids = []
+    for name, contacts in (
+        ("Cluster A", [{"type": "phone", "value": "+7 900 111-22-33"}]),
+        ("Cluster B", [{"type": "email", "value": "cluster@example.com"}]),
+    ):
+        response = await async_client.post(
+            "/api/v1/players/",
+            headers=admin_token_headers,
+            json={"first_name": name, "full_name": name, "contacts": contacts}
+        )
+        player_ids.append(response.json()["id"])
+
+    clusters = set()
+    for player_id in player_ids:
+        response = await async_client.get(f"/api/v1/players/{player_id}", headers=admin_token_headers)
+        clusters.add(response.json()["cluster_id"])
+    # Несвязанный игрок - кластер из одного игрока с его ID
+    assert clusters == set(player_ids)
+
+    # Третий игрок связывает первых двух
+    response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={
+            "first_name": "Cluster C",
+            "full_name": "Cluster C",
+            "contacts": [
+                {"type": "phone", "value": "89001112233"},
+                {"type": "email", "value": "Cluster@Example.com"}
+            ]
+        }
+    )
+    player_ids.append(response.json()["id"])
+
+    response = await async_client.get(f"/api/v1/players/{player_ids[0]}", headers=admin_token_headers)
+    cluster_id = response.json()["cluster_id"]
+    assert cluster_id == min(player_ids, key=uuid.UUID)
+
+    response = await async_client.get(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        params={"cluster_id": cluster_id, "include": ""}
+    )
+    assert {p["id"] for p in response.json()["results"]} == set(player_ids)
+
+async def test_create_players_bulk(async_client: AsyncClient, admin_token_headers: dict):
+    """Тест массового создания игроков с ошибкой в одном из элементов"""
+    response = await async_client.post(
+        "/api/v1/players/bulk",
+        headers=admin_token_headers,
+        json={
+            "items": [
+                {
+                    "first_name": "Bulk",
+                    "full_name": "Bulk One",
+                    "contacts": [{"type": "phone", "value": "+7 900 555 00 11"}],
+                    "nicknames": [{"nickname": "bulk_one", "room": "PokerStars"}]
+                },
+                {"last_name": "NoFirstName"},
+                {"first_name": "Bulk", "full_name": "Bulk Two"}
+            ]
+        }
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created_count"] == 2
+    assert [item["index"] for item in data["created"]] == [0, 2]
+    assert [item["index"] for item in data["errors"]] == [1]
+
+    response = await async_client.get(
+        f"/api/v1/players/{data['created'][0]['id']}", headers=admin_token_headers
+    )
+    assert response.status_code == 200
+    player = response.json()
+    assert player["full_name"] == "Bulk One"
+    assert player["contacts"][0]["value"] == "+7 900 555 00 11"
+    assert player["nicknames"][0]["nickname"] == "bulk_one"
+
+
+async def test_create_players_bulk_merges_clusters(async_client: AsyncClient, admin_token_headers: dict):
+    """Тест слияния кластеров при массовом создании игроков"""
+    existing_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={
+            "first_name": "Existing",
+            "full_name": "Bulk Cluster Existing",
+            "contacts": [{"type": "phone", "value": "+7 900 555 77 01"}]
+        }
+    )
+    existing = existing_response.json()
+
+    response = await async_client.post(
+        "/api/v1/players/bulk",
+        headers=admin_token_headers,
+        json={
+            "items": [
+                {
+                    "first_name": "Bulk",
+                    "full_name": "Bulk Cluster A",
+                    "contacts": [{"type": "phone", "value": "89005557701"}],
+                    "nicknames": [{"nickname": "bulk_cluster_link", "room": "GGPoker"}]
+                },
+                {
+                    "first_name": "Bulk",
+                    "full_name": "Bulk Cluster B",
+                    "nicknames": [{"nickname": "Bulk_Cluster_Link", "room": "GGPoker"}]
+                }
+            ]
+        }
+    )
+    created_ids = [item["id"] for item in response.json()["created"]]
+
+    cluster_ids = set()
+    for player_id in [existing["id"], *created_ids]:
+        player_response = await async_client.get(f"/api/v1/players/{player_id}", headers=admin_token_headers)
+        cluster_ids.add(player_response.json()["cluster_id"])
+    assert cluster_ids == {min([existing["id"], *created_ids])}
+
+async def test_update_player_collections_diff(async_client: AsyncClient, admin_token_headers: dict):
+    """Тест обновления коллекций по разнице: неизменные строки сохраняют id"""
+    create_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={
+            "first_name": "Diff",
+            "full_name": "Diff Player",
+            "contacts": [
+                {"type": "phone", "value": "+7 900 777 00 11"},
+                {"type": "email", "value": "diff@example.com"}
+            ],
+            "nicknames": [{"nickname": "diff_nick", "room": "GGPoker"}]
+        }
+    )
+    player = create_response.json()
+    contact_ids = {c["type"]: c["id"] for c in player["contacts"]}
+    nickname_id = player["nicknames"][0]["id"]
+
+    response = await async_client.put(
+        f"/api/v1/players/{player['id']}",
+        headers=admin_token_headers,
+        json={
+            "contacts": [
+                {"type": "phone", "value": "89007770011", "description": "основной"},
+                {"type": "skype", "value": "diff.skype"}
+            ],
+            "nicknames": [{"nickname": "diff_nick", "room": "GGPoker"}]
+        }
+    )
+    assert response.status_code == 200
+    updated = response.json()
+    contacts = {c["type"]: c for c in updated["contacts"]}
+    assert set(contacts) == {"phone", "skype"}
+    # Тот же телефон в другом формате - обновление строки, а не замена
+    assert contacts["phone"]["id"] == contact_ids["phone"]
+    assert contacts["phone"]["description"] == "основной"
+    assert updated["nicknames"][0]["id"] == nickname_id
+
+async def test_player_read_cache(async_client: AsyncClient, admin_token_headers: dict):
+    """Тест кэша чтения игроков: попадание и сброс при обновлении"""
+    create_response = await async_client.post(
+        "/api/v1/players/",
+        headers=admin_token_headers,
+        json={"first_name": "Cached", "full_name": "Cached Player"}
+    )
+    player_id = create_response.json()["id"]
+
+    response = await async_client.get("/api/v1/stats/cache", headers=admin_token_headers)
+    hits_before = response.json()["players"]["hits"]
+
+    for _ in range(2):
+        response = await async_client.get(f"/api/v1/players/{player_id}", headers=admin_token_headers)
+        assert response.json()["full_name"] == "Cached Player"
+
+    response = await async_client.get("/api/v1/stats/cache", headers=admin_token_headers)
+    assert response.json()["players"]["hits"] > hits_before
+
+    # Обновление сбрасывает кэш, следующее чтение видит новое имя
+    await async_client.put(
+        f"/api/v1/players/{player_id}",
+        headers=admin_token_headers,
+        json={"full_name": "Cached Player Renamed"}
+    )
+    response = await async_client.get(f"/api/v1/players/{player_id}", headers=admin_token_headers)
+    assert response.json()["full_name"] == "Cached Player Renamed"
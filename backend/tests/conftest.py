@@ -41,6 +41,8 @@ async def db() -> AsyncGenerator:
     async with engine.begin() as conn:
         # Сначала удаляем все таблицы, если они существуют
         await conn.run_sync(Base.metadata.drop_all)
+        # Расширение pg_trgm нужно для триграммных индексов поиска игроков
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         # Затем создаем таблицы заново, обеспечивая правильный порядок создания
         # Сначала создаем таблицу funds
         await conn.execute(text("""
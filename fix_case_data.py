@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import json
 import requests
 import logging
 import sys
@@ -35,6 +36,25 @@ def get_headers(token: str) -> dict:
         "Content-Type": "application/json"
     }
 
+def iter_export(entity: str, headers: dict):
+    """
+    Потоково читает полную выгрузку /export/{entity} в формате NDJSON.
+    Возвращает None, если выгрузка недоступна.
+    """
+    response = requests.get(f"{BASE_URL}/export/{entity}?format=ndjson", headers=headers, stream=True)
+    if response.status_code != 200:
+        logging.error(f"Не удалось выгрузить {entity}: {response.status_code}, {response.text}")
+        response.close()
+        return None
+
+    def rows():
+        with response:
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+
+    return rows()
+
 def update_fund_name(token: str) -> None:
     """
     Обновляет фонд с именем 'default' на 'Непривязанные кейсы'
@@ -89,12 +109,10 @@ def fix_case_fields(token: str) -> None:
     
     try:
         # Получаем все кейсы
-        response = requests.get(f"{BASE_URL}/cases/", headers=headers)
-        if response.status_code != 200:
-            logging.error(f"Не удалось получить список кейсов: {response.status_code}, {response.text}")
+        cases = iter_export("cases", headers)
+        if cases is None:
             return
         
-        cases = response.json()
         cases_updated = 0
         
         for case in cases:
@@ -148,12 +166,10 @@ def fix_player_fields(token: str) -> None:
     
     try:
         # Получаем всех игроков
-        response = requests.get(f"{BASE_URL}/players/", headers=headers)
-        if response.status_code != 200:
-            logging.error(f"Не удалось получить список игроков: {response.status_code}, {response.text}")
+        players = iter_export("players", headers)
+        if players is None:
             return
         
-        players = response.json()
         players_updated = 0
         
         for player in players:
@@ -203,12 +219,10 @@ def get_data_stats(token: str) -> None:
     
     try:
         # Получаем статистику по кейсам
-        response = requests.get(f"{BASE_URL}/cases/", headers=headers)
-        if response.status_code != 200:
-            logging.error(f"Не удалось получить список кейсов: {response.status_code}, {response.text}")
+        cases = iter_export("cases", headers)
+        if cases is None:
             return
-        
-        cases = response.json()
+        cases = list(cases)
         total_cases = len(cases)
         
         # Считаем кейсы без связанных игроков
@@ -221,12 +235,10 @@ def get_data_stats(token: str) -> None:
         cases_without_currency = sum(1 for case in cases if not case.get("arbitrage_currency"))
         
         # Получаем статистику по игрокам
-        response = requests.get(f"{BASE_URL}/players/", headers=headers)
-        if response.status_code != 200:
-            logging.error(f"Не удалось получить список игроков: {response.status_code}, {response.text}")
+        players = iter_export("players", headers)
+        if players is None:
             return
-        
-        players = response.json()
+        players = list(players)
         total_players = len(players)
         
         # Считаем игроков без full_name
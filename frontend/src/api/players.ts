@@ -79,6 +79,11 @@ export function usePlayersApi() {
           requestParams.limit = 12; // Значение по умолчанию для игроков
         }
         
+        // Постраничная навигация по skip требует общего количества записей
+        if (requestParams.with_total === undefined && !requestParams.cursor) {
+          requestParams.with_total = true;
+        }
+        
         // Убеждаемся, что параметр skip является числом
         if (requestParams.skip !== undefined) {
           requestParams.skip = Number(requestParams.skip);
@@ -164,6 +169,19 @@ export function usePlayersApi() {
       }
     },
 
+    /**
+     * Получить нескольких игроков одним запросом
+     * @param ids Список ID игроков (не более 500)
+     * @returns Найденные игроки в порядке ids и список ненайденных ID
+     */
+    async getPlayersByIds(ids: string[]): Promise<{ results: Player[], missing: string[] }> {
+      const response = await api.post<{ results: Player[], missing: string[] }>(
+        `${baseUrl}/batch-get`,
+        { ids }
+      );
+      return response.data;
+    },
+
     /**
      * Получить игрока по ID
      */